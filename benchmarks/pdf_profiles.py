@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# benchmarks/pdf_profiles.py
+# Description:
+#   File size, render time and determinism of create_cv_pdf per pdf_profile
+#   (core/render.py), on the synthetic CVs of benchmarks/synthetic.py and
+#   career.json.example. Determinism is checked by rendering the example CV
+#   twice, more than a second apart (the standard profile embeds the time).
+#
+#   python benchmarks/pdf_profiles.py -n 20
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.render import DEFAULT_THEME, PDF_PROFILES, RenderContext  # noqa: E402
+from core.section_cache import SectionCache  # noqa: E402
+from synthetic import CV_SIZES, make_cv  # noqa: E402
+from utils.generate import create_cv_pdf  # noqa: E402
+
+
+def render_profile(data: dict, ctx: RenderContext, n: int, out_dir: Path) -> dict:
+    """Render data n times (warm section cache); return the file size and median ms."""
+    cache = SectionCache()
+    out = out_dir / f"cv_{ctx.pdf_profile}.pdf"
+    timings = []
+    for i in range(n + 1):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_cv_pdf(data, str(out), ctx, cache)
+        if i:  # the first render fills the section cache
+            timings.append(time.perf_counter() - started)
+    return {"size": out.stat().st_size, "ms": statistics.median(timings) * 1000}
+
+
+def is_deterministic(data: dict, ctx: RenderContext, out_dir: Path) -> bool:
+    digests = set()
+    for i in range(2):
+        if i:
+            time.sleep(1.1)
+        out = out_dir / f"det_{ctx.pdf_profile}_{i}.pdf"
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_cv_pdf(data, str(out), ctx, SectionCache())
+        digests.add(hashlib.sha256(out.read_bytes()).hexdigest())
+    return len(digests) == 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF size and render time of the pdf_profiles.")
+    parser.add_argument("-n", type=int, default=20, help="Renders per CV and profile")
+    args = parser.parse_args()
+
+    with open(ROOT / "src" / "data" / "career.json.example", "r", encoding="utf-8") as f:
+        cvs = {"example": json.load(f)}
+    cvs.update({size: make_cv(size) for size in CV_SIZES})
+    contexts = {name: RenderContext({**DEFAULT_THEME, "pdf_profile": name}) for name in PDF_PROFILES}
+
+    print(f"{'cv':<9}" + "".join(f"{name + ' bytes':>16}{'ms':>8}" for name in PDF_PROFILES) + f"{'size':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, data in cvs.items():
+            results = {name: render_profile(data, ctx, args.n, Path(tmp)) for name, ctx in contexts.items()}
+            line = f"{label:<9}" + "".join(f"{results[name]['size']:>16}{results[name]['ms']:>8.2f}"
+                                           for name in PDF_PROFILES)
+            print(line + f"{results['compact']['size'] / results['standard']['size'] - 1:>+8.0%}")
+        for name, ctx in contexts.items():
+            same = is_deterministic(cvs["example"], ctx, Path(tmp))
+            print(f"{name}: identical bytes across runs: {'yes' if same else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
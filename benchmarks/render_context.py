@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# benchmarks/render_context.py
+# Description:
+#   Micro-benchmark of create_cv_pdf with a fresh render context per PDF
+#   (what every call used to rebuild) versus the shared, cached context.
+#
+#   python benchmarks/render_context.py -n 50
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from core.render import RenderContext, get_render_context, load_theme  # noqa: E402
+from utils.generate import create_cv_pdf  # noqa: E402
+
+
+def time_renders(data: dict, n: int, out_dir: Path, shared: bool) -> list:
+    timings = []
+    for i in range(n):
+        started = time.perf_counter()
+        ctx = get_render_context() if shared else RenderContext(load_theme())
+        create_cv_pdf(data, str(out_dir / f"cv_{i}.pdf"), ctx)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-PDF render time with and without a shared render context.")
+    parser.add_argument("-n", type=int, default=50, help="Number of PDFs per run")
+    parser.add_argument("--cv", default=str(ROOT / "src" / "data" / "career.json.example"),
+                        help="CV JSON to render")
+    args = parser.parse_args()
+
+    with open(args.cv, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        # Warm up imports and fonts so neither run pays for them.
+        create_cv_pdf(data, str(out_dir / "warmup.pdf"), RenderContext(load_theme()))
+        get_render_context.cache_clear()
+        fresh = time_renders(data, args.n, out_dir, shared=False)
+        shared = time_renders(data, args.n, out_dir, shared=True)
+
+    started = time.perf_counter()
+    for _ in range(args.n):
+        RenderContext(load_theme())
+    build = (time.perf_counter() - started) / args.n
+
+    for label, timings in (("fresh context", fresh), ("shared context", shared)):
+        rest = timings[1:] or timings
+        print(f"{label:<15} first {timings[0] * 1000:7.2f} ms   "
+              f"mean of next {len(rest)}: {sum(rest) / len(rest) * 1000:7.2f} ms")
+    print(f"{'context build':<15} {build * 1000:7.2f} ms saved per PDF once shared")
+
+
+if __name__ == "__main__":
+    main()
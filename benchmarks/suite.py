@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# benchmarks/suite.py
+# Description:
+#   Benchmark suite for check, stats and generate on synthetic data
+#   (benchmarks/synthetic.py): CV JSONs of several sizes and store workbooks
+#   of 1k/10k/100k rows. Times search_in_excel, statistics.main,
+#   create_cv_pdf, journaling an apply directory, compact_store, the width
+#   measurement of `compact --reformat`, the sidecar rebuild and cold CLI starts, writes the results as JSON and compares them
+#   with benchmarks/baseline.json. With --check, exits with status 1 on a
+#   regression. Baselines come from one machine, so a fixed calibration
+#   workload is timed before and after the cases and baseline timings are
+#   scaled by its ratio before the thresholds apply; budgets_ms stay absolute.
+#   Timings of a shared or throttled machine still drift, so regenerate the
+#   baseline (--update-baseline) on the machine that runs --check.
+#
+#   python benchmarks/suite.py                       # 1k + 10k rows
+#   python benchmarks/suite.py --sizes 1000,10000,100000
+#   python benchmarks/suite.py --filter cli --repeat 10
+#   python benchmarks/suite.py --update-baseline     # on this machine, after an intended change
+#   python benchmarks/suite.py --check               # fail on a regression (CI)
+
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import platform
+import shutil
+import statistics as stats_mod
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import CV_SIZES, make_cv, make_store  # noqa: E402
+
+BASELINE_FILE = ROOT / "benchmarks" / "baseline.json"
+RESULTS_FILE = ROOT / "benchmarks" / "results" / "latest.json"
+DEFAULT_SIZES = "1000,10000"
+DEFAULT_THRESHOLD = 1.3
+# Differences below this are noise, whatever the ratio.
+NOISE_FLOOR_MS = 5.0
+# Apply directory whose rows are journaled and compacted.
+APPLY_DIR_JSONS = 20
+CALIBRATION_RUNS = 7
+
+
+# =========================
+# TIMING
+# =========================
+def measure(fn, repeat: int, setup=None) -> dict:
+    """Run fn `repeat` times (setup untimed before each run); return min/median in ms."""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(stats_mod.median(runs), 3), "min_ms": round(min(runs), 3), "runs": len(runs)}
+
+
+def calibrate() -> float:
+    """Best-of-N ms of a fixed mix of dict, string, JSON and sorting work (this machine's speed)."""
+    def work():
+        rows = [{"company": f"Company {i % 97}", "role": f"Role {i % 13}", "n": i} for i in range(20000)]
+        json.loads(json.dumps(rows))
+        sorted(rows, key=lambda r: (r["company"], -r["n"]))
+        "".join(r["company"].lower() for r in rows)
+    return measure(work, CALIBRATION_RUNS)["min_ms"]
+
+
+def machine_scale(baseline: dict, calibration_ms: float) -> float:
+    """How much slower (>1) or faster (<1) this machine is than the one that wrote the baseline."""
+    base = baseline.get("meta", {}).get("calibration_ms")
+    return calibration_ms / base if base else 1.0
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow stdout/stderr of the code under test."""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+# =========================
+# CASES
+# =========================
+def store_cases(work: Path, sizes: list, repeat: int):
+    """Yield (name, fn, repeat, setup) for the store-backed commands at every size."""
+    from openpyxl import load_workbook
+    from core import journal, store
+    from utils import check, compact, statistics
+    from utils.generate import collect_applydetail_rows
+
+    apply_dir = work / "2025_10_15" / "apl_Bench"
+    apply_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(APPLY_DIR_JSONS):
+        with open(apply_dir / f"cv_{i}.json", "w", encoding="utf-8") as f:
+            json.dump(make_cv("small", seed=i), f)
+
+    for n in sizes:
+        path = make_store(work / f"store_{n}.xlsx", n)
+        config = work / f"config_{n}.yaml"
+        config.write_text(f"applies_dir: {work}\nstore_file: {path}\ncurrent_apply_dir: {apply_dir}\n")
+        # Few runs for the big stores: each one takes seconds.
+        slow = max(1, repeat // 3) if n >= 100_000 else repeat
+
+        def drop_sidecar(path=path):
+            store.sidecar_path(path).unlink(missing_ok=True)
+
+        yield f"store.rebuild[{n}]", lambda path=path: store.open_cache(path).close(), slow, drop_sidecar
+        yield f"search_in_excel[{n}]", lambda path=path: check.search_in_excel(path, "Berlin"), repeat, None
+        yield f"search_in_excel.typo[{n}]", lambda path=path: check.search_in_excel(path, "tehcnova"), repeat, None
+
+        def run_stats(config=config):
+            os.environ["JOBUINE_CONFIG"] = str(config)
+            try:
+                with quiet():
+                    statistics.main(by="week", group="location")
+            finally:
+                os.environ.pop("JOBUINE_CONFIG", None)
+        yield f"statistics.main[{n}]", run_stats, repeat, None
+
+        # What generate does per apply directory: collect its rows and journal them.
+        scratch = work / f"scratch_{n}.xlsx"
+
+        def reset_scratch(path=path, scratch=scratch):
+            shutil.copyfile(path, scratch)
+            journal.clear(scratch)
+            store.sidecar_path(scratch).unlink(missing_ok=True)
+            store.open_cache(scratch).close()
+
+        def journal_apply_dir(scratch=scratch):
+            store.append_rows(scratch, collect_applydetail_rows(str(apply_dir)))
+
+        def compact_apply_dir(reset=reset_scratch, journal_rows=journal_apply_dir):
+            reset()
+            journal_rows()
+
+        yield f"store.append_rows[{n}]", journal_apply_dir, repeat, reset_scratch
+        yield f"compact_store[{n}]", lambda scratch=scratch: compact.compact_store(scratch), slow, compact_apply_dir
+
+        # `compact --reformat` measures every cell; loading the workbook is not timed.
+        ws = load_workbook(path).active
+        yield (f"measure_widths[{n}]",
+               lambda ws=ws: store.measure_widths(ws.iter_rows(values_only=True), {}), slow, None)
+
+
+def render_cases(repeat: int):
+    """create_cv_pdf per CV size, with an empty and with a warm section cache."""
+    from core.render import get_render_context
+    from core.section_cache import SectionCache
+    from utils.generate import create_cv_pdf
+
+    ctx = get_render_context()
+    out = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False).name
+    for size in CV_SIZES:
+        data = make_cv(size)
+        warm = SectionCache()
+
+        def cold(data=data):
+            with quiet():
+                create_cv_pdf(data, out, ctx, SectionCache())
+
+        def cached(data=data, warm=warm):
+            with quiet():
+                create_cv_pdf(data, out, ctx, warm)
+
+        cold()  # Fonts and imports, not part of any case.
+        yield f"create_cv_pdf[{size}]", cold, repeat, None
+        yield f"create_cv_pdf.cached[{size}]", cached, repeat, None
+
+
+def cli_cases(work: Path, sizes: list, repeat: int):
+    """Cold `python -m cli` starts in a fresh interpreter each run (stats on the smallest store)."""
+    n = min(sizes) if sizes else None
+    config = work / f"config_{n}.yaml"
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    if config.exists():
+        env["JOBUINE_CONFIG"] = str(config)
+
+    def cli(*argv):
+        return lambda: subprocess.run([sys.executable, "-m", "cli", *argv], cwd=SRC, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+    yield "cli --help", cli("--help"), repeat, None
+    yield "cli apply --help", cli("apply", "--help"), repeat, None
+    if config.exists():
+        yield f"cli stats[{n}]", cli("stats"), repeat, None
+
+
+# =========================
+# BASELINE
+# =========================
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {"thresholds": {"*": DEFAULT_THRESHOLD}, "budgets_ms": {}, "results": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def threshold_for(name: str, thresholds: dict) -> float:
+    """Most specific matching glob wins (longest pattern)."""
+    matches = [p for p in thresholds if fnmatch.fnmatchcase(name, p)]
+    return thresholds[max(matches, key=len)] if matches else DEFAULT_THRESHOLD
+
+
+def compare(results: dict, baseline: dict, scale: float = 1.0) -> list:
+    """
+    Return (name, message) for every case slower than its baseline × scale ×
+    threshold or over its (absolute) budget.
+    """
+    failures = []
+    for name, result in results.items():
+        current = result["median_ms"]
+        budget = baseline.get("budgets_ms", {}).get(name)
+        if budget is not None and current > budget:
+            failures.append((name, f"{current:.1f} ms is over its {budget} ms budget"))
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        expected = base["median_ms"] * scale
+        limit = expected * threshold_for(name, baseline.get("thresholds", {}))
+        if current > limit and current - expected > NOISE_FLOOR_MS:
+            failures.append((name, f"{current:.1f} ms vs baseline {expected:.1f} ms on this machine "
+                                   f"(limit {limit:.1f} ms)"))
+    return failures
+
+
+def print_results(results: dict, baseline: dict, scale: float = 1.0) -> None:
+    """Baseline column: the baseline timing scaled to this machine."""
+    base = baseline.get("results", {})
+    print(f"{'case':<34} {'median':>10} {'min':>10} {'baseline':>10} {'ratio':>7}")
+    for name, r in results.items():
+        b = base.get(name, {}).get("median_ms")
+        b = b * scale if b else None
+        ratio = f"{r['median_ms'] / b:6.2f}x" if b else "      -"
+        b_text = f"{b:8.1f}ms" if b else "         -"
+        print(f"{name:<34} {r['median_ms']:8.1f}ms {r['min_ms']:8.1f}ms {b_text} {ratio}")
+
+
+# =========================
+# MAIN
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="Run the Jobuine benchmark suite.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Store sizes in rows (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (median is compared)")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--output", default=str(RESULTS_FILE), help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store these results as the new baseline (thresholds and budgets are kept)")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path)
+
+    calibration_ms = calibrate()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="jobuine-bench-") as tmp:
+        work = Path(tmp)
+        print(f"🏗️ Generating synthetic stores: {', '.join(map(str, sizes))} rows")
+        cases = [store_cases(work, sizes, args.repeat), render_cases(args.repeat)]
+        for group in cases:
+            for name, fn, repeat, setup in group:
+                if args.filter and args.filter not in name:
+                    continue
+                results[name] = measure(fn, repeat, setup)
+                print(f"  {name:<34} {results[name]['median_ms']:9.1f} ms")
+        # After the store cases, so `cli stats` has a config and store to read.
+        for name, fn, repeat, setup in cli_cases(work, sizes, args.repeat):
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(fn, repeat, setup)
+            print(f"  {name:<34} {results[name]['median_ms']:9.1f} ms")
+    # Best of before and after, so a noisy moment at either end does not skew the scale.
+    calibration_ms = min(calibration_ms, calibrate())
+    scale = machine_scale(baseline, calibration_ms)
+    if baseline.get("meta", {}).get("calibration_ms"):
+        print(f"⚖️ Calibration {calibration_ms:.1f} ms: this machine runs at {1 / scale:.2f}x the baseline machine")
+    else:
+        print("⚠️ Baseline has no calibration; comparing absolute timings (run --update-baseline here)")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "calibration_ms": round(calibration_ms, 3),
+        },
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    print_results(results, baseline, scale)
+    print(f"\n💾 Results written to {output}")
+
+    if args.update_baseline:
+        baseline["meta"] = report["meta"]
+        baseline.setdefault("results", {}).update(results)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"📌 Baseline updated: {baseline_path}")
+        return
+
+    failures = compare(results, baseline, scale)
+    if failures:
+        print(f"\n{'❌' if args.check else '⚠️'} {len(failures)} regression(s):")
+        for name, message in failures:
+            print(f"  - {name}: {message}")
+        if args.check:
+            sys.exit(1)
+        return
+    print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# benchmarks/synthetic.py
+# Description:
+#   Deterministic synthetic data for the benchmark suite:
+#     - cv_data.json documents following src/data/schema.json, in sizes
+#     - store_file workbooks with EXCEL_HEADERS and N application rows
+#
+#   python benchmarks/synthetic.py --cv large --out /tmp/cv.json
+#   python benchmarks/synthetic.py --rows 10000 --out /tmp/store.xlsx
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from core.store import APPLY_DATETIME_FORMAT, EXCEL_HEADERS  # noqa: E402
+
+COMPANIES = ["TechNova Solutions", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Acme Corp", "Cyberdyne", "Soylent", "Aperture Science", "Tyrell"]
+ROLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Platform Engineer",
+         "Machine Learning Engineer", "DevOps Engineer", "Frontend Developer", "Site Reliability Engineer"]
+LOCATIONS = ["Berlin, Germany", "Amsterdam, Netherlands", "Remote", "London, UK",
+             "San Francisco, CA, USA", "Paris, France", "Toronto, Canada"]
+JOB_TYPES = ["Full-time", "Contract", "Part-time"]
+STATUSES = ["Applied", "Interview Scheduled", "Rejected", "Offer", "Ghosted"]
+WORDS = ("designed built scaled migrated optimized services pipelines kubernetes python postgres "
+         "latency throughput team mentored reduced cost reliability observability api platform").split()
+
+# experiences, bullets per experience, skill groups, skills per group
+CV_SIZES = {
+    "small": (2, 3, 3, 5),
+    "medium": (4, 5, 5, 8),
+    "large": (8, 8, 8, 12),
+}
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def make_cv(size: str = "medium", seed: int = 0) -> dict:
+    """Return a cv_data.json document of the given size that validates against schema.json."""
+    rng = random.Random(seed)
+    n_exp, n_bullets, n_groups, n_skills = CV_SIZES[size]
+    experiences = []
+    year = 2024
+    for i in range(n_exp):
+        start_year = year - 2
+        experiences.append({
+            "role": rng.choice(ROLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "type": rng.choice(JOB_TYPES),
+            "workType": rng.choice(["Remote", "Hybrid", "On-site"]),
+            "start": {"year": str(start_year), "month": f"{rng.randint(1, 12):02d}"},
+            "end": "Present" if i == 0 else f"{year}-{rng.randint(1, 12):02d}",
+            "detail": "\n".join(f"- {_sentence(rng)}" for _ in range(n_bullets)),
+        })
+        year = start_year
+    return {
+        "applyDetail": {
+            "role": rng.choice(ROLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "jobType": rng.choice(JOB_TYPES),
+            "salary": f"{rng.randint(50, 150)}k",
+            "applyDateTime": "2025-10-15T14:30:00Z",
+            "status": rng.choice(STATUSES),
+            "link": f"https://jobs.example.com/{rng.randint(1, 10 ** 6)}",
+            "address": rng.choice(LOCATIONS),
+        },
+        "name": "Jane Doe",
+        "role": rng.choice(ROLES),
+        "contact": {
+            "email": "jane@example.com",
+            "linkedin": "linkedin.com/in/janedoe",
+            "github": "github.com/janedoe",
+            "address": rng.choice(LOCATIONS),
+            "phone": "+1 555 0100",
+        },
+        "summary": " ".join(_sentence(rng) + "." for _ in range(3)),
+        "experiences": experiences,
+        "coreSkills": [
+            {"category": f"Category {g}", "skills": [rng.choice(WORDS) for _ in range(n_skills)]}
+            for g in range(n_groups)
+        ],
+        "priority": ["experiences", "coreSkills", "education"],
+        "education": {
+            "grade": "M.Sc. Computer Science",
+            "university": "Example University",
+            "start": {"year": "2012", "month": "09"},
+            "end": {"year": "2014", "month": "06"},
+        },
+        "languages": [{"language": "English", "level": "Fluent"}, {"language": "German", "level": "B2"}],
+    }
+
+
+def store_rows(n: int, seed: int = 0):
+    """Yield n store rows in EXCEL_HEADERS order, spread over the last year."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 9, 0)
+    for i in range(n):
+        applied = start + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        company = rng.choice(COMPANIES)
+        yield [
+            f"apl_{company.split()[0]}_{i}",
+            rng.choice(ROLES),
+            company,
+            rng.choice(LOCATIONS),
+            rng.choice(JOB_TYPES),
+            f"{rng.randint(50, 150)}k",
+            f"https://jobs.example.com/{i}",
+            rng.choice(LOCATIONS),
+            rng.choice(STATUSES),
+            applied.strftime(APPLY_DATETIME_FORMAT),
+        ]
+
+
+def make_store(path: Path, n: int, seed: int = 0) -> Path:
+    """Write a store_file workbook with n rows (write-only, so 100k rows stay cheap)."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Applications")
+    ws.append(EXCEL_HEADERS)
+    for row in store_rows(n, seed):
+        ws.append(row)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic CV JSONs or store workbooks.")
+    parser.add_argument("--cv", choices=sorted(CV_SIZES), help="Write a CV of this size")
+    parser.add_argument("--rows", type=int, help="Write a store workbook with this many rows")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output file")
+    args = parser.parse_args()
+
+    if args.cv:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(make_cv(args.cv, args.seed), f, indent=2, ensure_ascii=False)
+    elif args.rows:
+        make_store(Path(args.out), args.rows, args.seed)
+    else:
+        parser.error("pass --cv or --rows")
+    print(f"✅ Written {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,237 @@
 import argparse
+import importlib
 import sys
-from utils import apply, check, generate, statistics  # 👈 added import
+import time
+from collections import Counter
 
+from core import profile
 
-def main():
+# Subcommand -> module under utils/. Modules are imported only when their
+# command runs, so `jobuine apply` or `jobuine --help` never load
+# pandas, openpyxl or reportlab.
+COMMAND_MODULES = {
+    "apply": "utils.apply",
+    "check": "utils.check",
+    "generate": "utils.generate",
+    "compact": "utils.compact",
+    "stats": "utils.statistics",
+    "serve": "utils.serve",
+    "validate": "utils.validate",
+    "list": "utils.listing",
+    "tailor": "utils.tailor",
+    "archive": "utils.archive",
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="jobuine", description="Jobuine CLI")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print how long argument parsing, imports and the command took")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print wall/CPU time and peak memory per stage and input file")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, also record peak memory per stage (tracemalloc, much slower)")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="With --profile, also write a Chrome trace JSON (chrome://tracing, Perfetto)")
+    parser.add_argument("--cprofile", metavar="FILE", nargs="?", const="",
+                        help="Dump cProfile stats of the command (default: jobuine-<command>.prof)")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # apply
-    subparsers.add_parser("apply", help="Create a new apply directory interactively")
+    apply_parser = subparsers.add_parser("apply", help="Create a new apply directory interactively")
+    apply_parser.add_argument("--from", dest="from_file",
+                              help="Create one apply directory per posting of a JSONL or CSV file")
+    apply_parser.add_argument("--allow-duplicates", action="store_true",
+                              help="Create apply directories even for postings already applied to")
 
     # check
     check_parser = subparsers.add_parser("check", help="Search in Excel file")
-    check_parser.add_argument("--search", required=True, help="Search term")
+    check_parser.add_argument("--search", action="append", help="Search term (repeat to look up several at once)")
+    check_parser.add_argument("--terms-file", help="File with one search term per line (# comments allowed)")
+    check_parser.add_argument("--limit", type=int, default=20,
+                              help="Maximum number of rows to show (row numbers per term with several terms)")
+    check_parser.add_argument("--min-score", type=float, default=0.75,
+                              help="Minimum match score (1.0 = exact substring, lower allows typos)")
 
     # generate
-    subparsers.add_parser("generate", help="Generate PDFs and update Excel (path from config.yaml)")
+    generate_parser = subparsers.add_parser("generate", help="Generate PDFs and update Excel (path from config.yaml)")
+    generate_parser.add_argument("--all", action="store_true", help="Render every apply directory under applies_dir")
+    generate_parser.add_argument("--since", help="Only apply directories on or after this date (YYYY-MM-DD)")
+    generate_parser.add_argument("--until", help="Only apply directories on or before this date (YYYY-MM-DD)")
+    generate_parser.add_argument("--workers", type=int, help="Worker processes for batch mode (default: CPU count)")
+    generate_parser.add_argument("--force", action="store_true", help="Re-render JSONs even if their content is unchanged")
+    generate_parser.add_argument("--watch", action="store_true",
+                                 help="Stay running and re-render JSONs when they change (with --all: every apply directory)")
+    generate_parser.add_argument("--debounce", type=float,
+                                 help="With --watch, seconds a file must stay unchanged before rendering (default: 0.3)")
+    generate_parser.add_argument("--fit-pages", type=int, metavar="N",
+                                 help="Tighten spacing, font size and bullets until each CV fits in N pages")
+
+    # compact
+    compact_parser = subparsers.add_parser("compact", help="Fold the application journal into the Excel file (generate only writes the journal)")
+    compact_parser.add_argument("--reformat", action="store_true",
+                                help="Recompute every column width from all cells (rewrites even with an empty journal)")
+    compact_parser.add_argument("--shard", action="store_true",
+                                help="Split the single Excel file into per-period shards (set store_shards first)")
 
     # stats
-    subparsers.add_parser("stats", help="Show today's application statistics") 
+    stats_parser = subparsers.add_parser("stats", help="Show today's application statistics, or a windowed report")
+    stats_parser.add_argument("--since", help="First day of the report (YYYY-MM-DD)")
+    stats_parser.add_argument("--until", help="Last day of the report (YYYY-MM-DD)")
+    stats_parser.add_argument("--by", choices=["day", "week", "month"], help="Report period (default: day)")
+    stats_parser.add_argument("--group", choices=["location", "company", "status", "jobType"],
+                              help="Break each period down by this column")
+    stats_parser.add_argument("--format", dest="fmt", choices=["table", "json", "csv"], default="table",
+                              help="Output format (default: table)")
+    stats_parser.add_argument("--rebuild", action="store_true",
+                              help="Re-read the Excel file into the cache and its daily rollups first")
 
-    args = parser.parse_args()
+    # validate
+    validate_parser = subparsers.add_parser("validate", help="Check cv_data.json files against schema.json")
+    validate_parser.add_argument("paths", nargs="*", help="JSON files or directories (default: current_apply_dir)")
+    validate_parser.add_argument("--all", action="store_true", help="Validate every apply directory under applies_dir")
+    validate_parser.add_argument("--workers", type=int, help="Worker processes for large batches (default: CPU count)")
+
+    # tailor
+    tailor_parser = subparsers.add_parser("tailor", help="Fill cv_data.json of apply directories with an LLM backend")
+    tailor_parser.add_argument("paths", nargs="*", help="Apply directories (default: current_apply_dir)")
+    tailor_parser.add_argument("--all", action="store_true", help="Every apply directory under applies_dir")
+    tailor_parser.add_argument("--since", help="Only apply directories on or after this date (YYYY-MM-DD)")
+    tailor_parser.add_argument("--until", help="Only apply directories on or before this date (YYYY-MM-DD)")
+    tailor_parser.add_argument("--force", action="store_true", help="Also redo directories whose cv_data.json is filled")
+    tailor_parser.add_argument("--backend", choices=["openai", "command", "mock"],
+                               help="LLM backend (default: tailor.backend in config.yaml, else openai)")
+    tailor_parser.add_argument("--model", help="Model name for the openai backend")
+    tailor_parser.add_argument("--base-url", help="OpenAI-compatible API base URL (e.g. http://localhost:8000/v1)")
+    tailor_parser.add_argument("--command", dest="model_command",
+                               help="Local model command for the command backend (prompt on stdin)")
+    tailor_parser.add_argument("--concurrency", type=int, help="Requests in flight at once (default: 8)")
+    tailor_parser.add_argument("--rate-limit", type=float, help="Maximum requests per minute, 0 = unlimited (default: 60)")
+    tailor_parser.add_argument("--retries", type=int, help="Retries per directory on transient errors or invalid replies (default: 3)")
+
+    # list
+    list_parser = subparsers.add_parser("list", help="List past apply directories from the catalog")
+    list_parser.add_argument("--company", help="Company name contains this text (case-insensitive)")
+    list_parser.add_argument("--role", help="Role title contains this text (case-insensitive)")
+    list_parser.add_argument("--status", help="applyDetail status, or draft/rendered without one")
+    list_parser.add_argument("--since", help="Apply directories on or after this date (YYYY-MM-DD)")
+    list_parser.add_argument("--until", help="Apply directories on or before this date (YYYY-MM-DD)")
+    list_parser.add_argument("--limit", type=int, default=50, help="Maximum number of rows to show (0 = all)")
+    list_parser.add_argument("--format", dest="fmt", choices=["table", "json"], default="table",
+                             help="Output format (default: table)")
 
-    # Dispatch commands
+    # archive
+    archive_parser = subparsers.add_parser("archive", help="Move old apply directories into the compressed archive")
+    archive_parser.add_argument("--older-than", default="90d",
+                                help="Archive apply directories older than this: 90d, 12w, 6m, 1y (default: 90d)")
+    archive_parser.add_argument("--dry-run", action="store_true", help="Only list the directories that would be archived")
+    archive_parser.add_argument("--restore", nargs="+", metavar="DIR",
+                                help="Put archived directories back on disk (paths relative to applies_dir or absolute)")
+
+    # serve
+    serve_parser = subparsers.add_parser("serve", help="Run the local HTTP API with warm render workers")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    serve_parser.add_argument("--workers", type=int, help="Render worker processes (default: CPU count)")
+    serve_parser.add_argument("--queue", type=int, default=32,
+                              help="Requests allowed to wait for a worker before returning 503")
+
+    return parser
+
+
+def dispatch(module, args) -> None:
     if args.command == "apply":
-        apply.main()
+        module.main(from_file=args.from_file, allow_duplicates=args.allow_duplicates)
 
     elif args.command == "check":
-        check.main(args.search)
+        module.main(args.search, limit=args.limit, min_score=args.min_score, terms_file=args.terms_file)
 
     elif args.command == "generate":
-        generate.main()
+        module.main(all_dirs=args.all, since=args.since, until=args.until,
+                    workers=args.workers, force=args.force, watch=args.watch, debounce=args.debounce,
+                    fit_pages=args.fit_pages)
+
+    elif args.command == "compact":
+        module.main(reformat=args.reformat, shard=args.shard)
+
+    elif args.command == "stats":
+        module.main(since=args.since, until=args.until, by=args.by, group=args.group, fmt=args.fmt,
+                    rebuild=args.rebuild)
+
+    elif args.command == "validate":
+        module.main(paths=args.paths, all_dirs=args.all, workers=args.workers)
+
+    elif args.command == "tailor":
+        module.main(paths=args.paths, all_dirs=args.all, since=args.since, until=args.until, force=args.force,
+                    backend=args.backend, model=args.model, base_url=args.base_url, command=args.model_command,
+                    concurrency=args.concurrency, rate_limit=args.rate_limit, retries=args.retries)
+
+    elif args.command == "list":
+        module.main(company=args.company, role=args.role, status=args.status, since=args.since,
+                    until=args.until, limit=args.limit, fmt=args.fmt)
+
+    elif args.command == "archive":
+        module.main(older_than=args.older_than, dry_run=args.dry_run, restore=args.restore)
+
+    elif args.command == "serve":
+        module.main(host=args.host, port=args.port, workers=args.workers, max_queue=args.queue)
+
+
+def print_timings(command: str, steps: list, new_modules: list) -> None:
+    """Print a small per-step timing report (to stderr, like -X importtime)."""
+    print(f"\n⏱️ Timings for `jobuine {command}`:", file=sys.stderr)
+    for label, seconds in steps:
+        print(f"  {label:<28} {seconds * 1000:9.1f} ms", file=sys.stderr)
+    print(f"  {'total':<28} {sum(s for _, s in steps) * 1000:9.1f} ms", file=sys.stderr)
+    packages = Counter(name.split(".")[0] for name in new_modules)
+    if packages:
+        heaviest = ", ".join(f"{name} ({count})" for name, count in packages.most_common(8))
+        print(f"  imported {len(new_modules)} modules: {heaviest}", file=sys.stderr)
+
+
+def main():
+    started = time.perf_counter()
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.command == "check" and not (args.search or args.terms_file):
+        parser.error("check: pass --search and/or --terms-file")
+    parsed = time.perf_counter()
+
+    if args.profile or args.profile_trace or args.profile_memory:
+        profile.enable(trace_memory=args.profile_memory)
 
-    elif args.command == "stats":  
-        statistics.main()
+    before = set(sys.modules)
+    with profile.stage(f"import {COMMAND_MODULES[args.command]}"):
+        module = importlib.import_module(COMMAND_MODULES[args.command])
+    imported = time.perf_counter()
+    new_modules = sorted(set(sys.modules) - before)
+    profile.start_memory_tracing()
 
-    else:
-        parser.print_help()
+    profiler = None
+    if args.cprofile is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with profile.stage(f"{args.command} command"):
+            dispatch(module, args)
+    finally:
+        if profiler:
+            profiler.disable()
+            dump = args.cprofile or f"jobuine-{args.command}.prof"
+            profiler.dump_stats(dump)
+            print(f"\n🧪 cProfile stats written to {dump} (python -m pstats {dump})", file=sys.stderr)
+        if profile.enabled():
+            profile.print_summary()
+            if args.profile_trace:
+                profile.write_trace(args.profile_trace)
+                print(f"🧭 Trace written to {args.profile_trace}", file=sys.stderr)
+        if args.timings:
+            print_timings(args.command, [
+                ("parse arguments", parsed - started),
+                (f"import {COMMAND_MODULES[args.command]}", imported - parsed),
+                ("run", time.perf_counter() - imported),
+            ], new_modules)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Layout of applies_dir: one YYYY_MM_DD folder per day, holding the
+apl_<company> directory of every application made that day. Folders that
+are not dates (the archive, caches) are never apply directories.
+
+Kept free of heavy imports so `jobuine apply` can walk applies_dir without
+loading the renderer.
+"""
+import glob
+import os
+from datetime import datetime
+from pathlib import Path
+
+APPLY_DATE_FORMAT = "%Y_%m_%d"
+APPLY_DIR_PREFIX = "apl_"
+
+
+def parse_apply_date(value: str):
+    """Parse a --since/--until value given as YYYY-MM-DD or YYYY_MM_DD."""
+    return datetime.strptime(value.replace("-", "_"), APPLY_DATE_FORMAT).date()
+
+
+def date_dir_day(name: str):
+    """The day of a YYYY_MM_DD folder name, or None if it is not one."""
+    try:
+        return datetime.strptime(name, APPLY_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def discover_apply_dirs(applies_dir: Path, since=None, until=None) -> list:
+    """Return every applies_dir/YYYY_MM_DD/apl_* directory, optionally limited to a date range."""
+    applies_dir = Path(applies_dir)
+    if not applies_dir.is_dir():
+        return []
+    found = []
+    for date_dir in sorted(applies_dir.iterdir()):
+        day = date_dir_day(date_dir.name) if date_dir.is_dir() else None
+        if day is None or (since and day < since) or (until and day > until):
+            continue
+        found.extend(d for d in sorted(date_dir.glob(f"{APPLY_DIR_PREFIX}*")) if d.is_dir())
+    return found
+
+
+def apply_dirs_in(path: Path) -> list:
+    """Apply directories at path: path itself, the ones of a YYYY_MM_DD folder, or all under an applies_dir."""
+    path = Path(path)
+    if path.name.startswith(APPLY_DIR_PREFIX):
+        return [path]
+    if date_dir_day(path.name):
+        return [d for d in sorted(path.glob(f"{APPLY_DIR_PREFIX}*")) if d.is_dir()]
+    return discover_apply_dirs(path)
+
+
+def input_jsons(dir_path) -> list:
+    """The CV JSONs of an apply directory: every *.json but dotfiles (the manifest)."""
+    return sorted(glob.glob(os.path.join(str(dir_path), "*.json")))
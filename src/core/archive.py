@@ -0,0 +1,287 @@
+"""
+Content-addressed archive of old apply directories (`jobuine archive`).
+
+Archived directories leave applies_dir and live in one SQLite file,
+applies_dir/.jobuine_archive.sqlite:
+  - blobs: zlib-compressed content keyed by its sha256, stored once and
+    reference-counted;
+  - files: one row per archived file (directory, name, size, mtime) with
+    the packed digests of the blobs it is made of, in order.
+Text files (prompt.txt, the JSONs) are cut into chunks at content-defined
+line boundaries, so the career and schema blocks that every filled
+prompt.txt repeats, and identical PDFs, are stored only once however many
+directories embed them. A blob goes away when no file refers to it.
+
+Directories are keyed by their path relative to applies_dir. read() and
+names() give the archived files back without restoring them, which is how
+the catalog, the duplicate index and generate see archived directories;
+restore() puts a directory back on disk unchanged (content and mtimes).
+"""
+import os
+import re
+import shutil
+import sqlite3
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from core import profile
+from core.applies import date_dir_day
+from core.manifest import content_digest
+
+ARCHIVE_NAME = ".jobuine_archive.sqlite"
+
+# Line-based content-defined chunking of text files: a chunk ends after a
+# line whose crc32 has its low bits clear, once it holds MIN_CHUNK bytes.
+TEXT_SUFFIXES = {".txt", ".json", ".md"}
+MIN_CHUNK = 256
+MAX_CHUNK = 64 * 1024
+BOUNDARY_MASK = 0x7
+COMPRESS_LEVEL = 9
+AGE_UNITS = {"d": 1, "w": 7, "m": 30, "y": 365}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    archived_at TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    chunks BLOB NOT NULL,
+    PRIMARY KEY (dir, name)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest BLOB PRIMARY KEY,
+    size INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    refs INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+DIGEST_SIZE = 32  # sha256, stored raw
+
+
+def archive_path(applies_dir: Path) -> Path:
+    return Path(applies_dir) / ARCHIVE_NAME
+
+
+def parse_age(value: str) -> timedelta:
+    """Parse an --older-than value: a number of days, weeks, months or years (90d, 12w, 6m, 1y)."""
+    match = re.fullmatch(r"\s*(\d+)\s*([dwmy]?)\s*", value or "")
+    if not match:
+        raise ValueError(f"❌ Invalid age: {value!r} (expected e.g. 90d, 12w, 6m or 1y)")
+    return timedelta(days=int(match.group(1)) * AGE_UNITS[match.group(2) or "d"])
+
+
+def chunk(name: str, content: bytes) -> list:
+    """Cut a file into chunks: text at content-defined line boundaries, anything else whole."""
+    if Path(name).suffix.lower() not in TEXT_SUFFIXES:
+        return [content] if content else []
+    chunks, start, pos = [], 0, 0
+    for line in content.splitlines(keepends=True):
+        pos += len(line)
+        size = pos - start
+        if size >= MAX_CHUNK or (size >= MIN_CHUNK and not zlib.crc32(line) & BOUNDARY_MASK):
+            chunks.append(content[start:pos])
+            start = pos
+    if start < len(content):
+        chunks.append(content[start:])
+    return chunks
+
+
+def _day_of(rel_path: str):
+    return date_dir_day(Path(rel_path).parent.name)
+
+
+class Archive:
+    """The archive of one applies_dir; open it, use it, close() it."""
+
+    def __init__(self, applies_dir: Path):
+        self.applies_dir = Path(applies_dir)
+        self.conn = sqlite3.connect(archive_path(applies_dir))
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _key(self, dir_path) -> str:
+        return Path(os.path.relpath(Path(dir_path).absolute(), self.applies_dir.absolute())).as_posix()
+
+    # =========================
+    # READ-BACK
+    # =========================
+    def archived_dirs(self, since: date = None, until: date = None) -> list:
+        """[(absolute path, day, archived_at)] of archived directories, optionally in a date range."""
+        where, params = [], []
+        if since:
+            where.append("day >= ?")
+            params.append(since.isoformat())
+        if until:
+            where.append("day <= ?")
+            params.append(until.isoformat())
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        return [(self.applies_dir / rel, day, archived_at) for rel, day, archived_at in
+                self.conn.execute(f"SELECT path, day, archived_at FROM dirs{clause} ORDER BY path", params)]
+
+    def contains(self, dir_path) -> bool:
+        return self.conn.execute("SELECT 1 FROM dirs WHERE path = ?", (self._key(dir_path),)).fetchone() is not None
+
+    def names(self, dir_path) -> list:
+        """Names of the archived files of a directory (sorted, relative to it)."""
+        return [name for (name,) in self.conn.execute(
+            "SELECT name FROM files WHERE dir = ? ORDER BY name", (self._key(dir_path),))]
+
+    def read(self, dir_path, name: str) -> bytes:
+        """Content of one archived file; FileNotFoundError if it is not in the archive."""
+        key = self._key(dir_path)
+        row = self.conn.execute("SELECT digest, chunks FROM files WHERE dir = ? AND name = ?", (key, name)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{key}/{name} is not archived")
+        file_digest, packed = row
+        parts = []
+        for i in range(0, len(packed), DIGEST_SIZE):
+            blob = self.conn.execute("SELECT codec, data FROM blobs WHERE digest = ?",
+                                     (packed[i:i + DIGEST_SIZE],)).fetchone()
+            if blob is None:
+                raise OSError(f"❌ Archived {key}/{name} is missing a blob")
+            parts.append(zlib.decompress(blob[1]) if blob[0] == "zlib" else blob[1])
+        content = b"".join(parts)
+        if bytes.fromhex(content_digest(content)) != file_digest:
+            raise OSError(f"❌ Archived {key}/{name} is corrupt (digest mismatch)")
+        return content
+
+    # =========================
+    # ARCHIVING
+    # =========================
+    def _store_blob(self, content: bytes) -> tuple:
+        """Store content once (or count one more reference); returns (digest, bytes newly stored)."""
+        digest = bytes.fromhex(content_digest(content))
+        if self.conn.execute("UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (digest,)).rowcount:
+            return digest, 0
+        packed = zlib.compress(content, COMPRESS_LEVEL)
+        codec, data = ("zlib", packed) if len(packed) < len(content) else ("raw", content)
+        self.conn.execute("INSERT INTO blobs (digest, size, codec, refs, data) VALUES (?, ?, ?, 1, ?)",
+                          (digest, len(content), codec, data))
+        return digest, len(data)
+
+    def _forget(self, key: str) -> None:
+        """Drop a directory and release its blob references (blobs left unreferenced are deleted)."""
+        refs = Counter()
+        for (packed,) in self.conn.execute("SELECT chunks FROM files WHERE dir = ?", (key,)):
+            refs.update(packed[i:i + DIGEST_SIZE] for i in range(0, len(packed), DIGEST_SIZE))
+        self.conn.executemany("UPDATE blobs SET refs = refs - ? WHERE digest = ?",
+                              ((count, digest) for digest, count in refs.items()))
+        self.conn.executemany("DELETE FROM blobs WHERE digest = ? AND refs <= 0", ((d,) for d in refs))
+        self.conn.execute("DELETE FROM files WHERE dir = ?", (key,))
+        self.conn.execute("DELETE FROM dirs WHERE path = ?", (key,))
+
+    def _store_dir(self, dir_path: Path) -> dict:
+        key = self._key(dir_path)
+        day = _day_of(key)
+        if day is None:
+            raise ValueError(f"❌ Not an apply directory (YYYY_MM_DD/apl_*): {dir_path}")
+        self._forget(key)
+        stats = {"files": [], "size": 0, "stored": 0}
+        for root, _, names in os.walk(dir_path):
+            for name in names:
+                path = Path(root) / name
+                stats["files"].append(path.relative_to(dir_path).as_posix())
+                content = path.read_bytes()
+                stats["size"] += len(content)
+                digests = []
+                for part in chunk(name, content):
+                    digest, stored = self._store_blob(part)
+                    digests.append(digest)
+                    stats["stored"] += stored
+                self.conn.execute(
+                    "INSERT INTO files (dir, name, size, mtime_ns, digest, chunks) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, stats["files"][-1], len(content), path.stat().st_mtime_ns,
+                     bytes.fromhex(content_digest(content)), b"".join(digests)))
+        self.conn.execute("INSERT INTO dirs (path, day, archived_at, size) VALUES (?, ?, ?, ?)",
+                          (key, day.isoformat(), datetime.now().isoformat(timespec="seconds"), stats["size"]))
+        return stats
+
+    def add(self, dirs: list, on_error=None) -> dict:
+        """
+        Archive apply directories in one transaction, then remove each from
+        disk once every file of it reads back identical. A directory that
+        cannot be read is skipped and reported to on_error(dir_path, error).
+        Returns {"dirs", "files", "size", "stored"} (stored = compressed bytes of new blobs).
+        """
+        done, totals = [], {"dirs": 0, "files": 0, "size": 0, "stored": 0}
+        with profile.stage("archive: store"), self.conn:
+            # One explicit transaction (one fsync); the savepoints only undo a failed directory.
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+            for dir_path in dirs:
+                dir_path = Path(dir_path)
+                self.conn.execute("SAVEPOINT dir")
+                try:
+                    stats = self._store_dir(dir_path)
+                except (OSError, ValueError) as e:
+                    self.conn.execute("ROLLBACK TO dir")
+                    if on_error:
+                        on_error(dir_path, e)
+                    continue
+                finally:
+                    self.conn.execute("RELEASE dir")
+                done.append((dir_path, stats["files"]))
+                totals["files"] += len(stats["files"])
+                totals["size"] += stats["size"]
+                totals["stored"] += stats["stored"]
+
+        for dir_path, names in done:
+            with profile.stage("archive: verify"):
+                for name in names:
+                    self.read(dir_path, name)  # raises on a digest mismatch
+            # Out of sight (catalog and discovery only look at apl_*) before the slow delete.
+            doomed = dir_path.with_name(f".archived-{dir_path.name}")
+            os.replace(dir_path, doomed)
+            shutil.rmtree(doomed)
+            try:
+                dir_path.parent.rmdir()  # the date directory, once its last apply directory is gone
+            except OSError:
+                pass
+            totals["dirs"] += 1
+        return totals
+
+    def restore(self, dir_path) -> int:
+        """Write an archived directory back to disk and drop it from the archive. Returns its file count."""
+        dir_path = Path(dir_path)
+        key = self._key(dir_path)
+        if dir_path.exists():
+            raise FileExistsError(f"❌ {dir_path} already exists on disk")
+        rows = self.conn.execute("SELECT name, mtime_ns FROM files WHERE dir = ?", (key,)).fetchall()
+        tmp_dir = dir_path.with_name(f".restoring-{dir_path.name}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for name, mtime_ns in rows:
+            path = tmp_dir / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(self.read(dir_path, name))
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_dir, dir_path)
+        with self.conn:
+            self._forget(key)
+        return len(rows)
+
+    def totals(self) -> dict:
+        """{"dirs", "size" (original bytes), "stored" (compressed blob bytes), "blobs"}."""
+        dirs, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM dirs").fetchone()
+        blobs, stored = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(length(data)), 0) FROM blobs").fetchone()
+        return {"dirs": dirs, "size": size, "stored": stored, "blobs": blobs}
+
+
+def open_archive(applies_dir: Path):
+    """The Archive of applies_dir, or None if nothing was ever archived there."""
+    if not archive_path(applies_dir).exists():
+        return None
+    return Archive(applies_dir)
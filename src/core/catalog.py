@@ -0,0 +1,209 @@
+"""
+SQLite catalog of the apply directories (applies_dir/YYYY_MM_DD/apl_*).
+
+One row per directory with its company, role, link and status (from the
+applyDetail of its JSONs, else the posting recorded by `apply`), the sha256
+of every input JSON and the PDFs next to them. `refresh` only re-reads
+directories whose signature (directory mtime plus the newest JSON mtime, so
+in-place edits count too) changed, and drops rows of deleted directories, so
+`jobuine list` stays instant on trees with thousands of directories.
+Directories moved to the archive (core/archive.py) stay listed, read back
+from it and flagged `archived`.
+"""
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from core import archive as arc
+from core import manifest as mf
+from core import profile
+from core.applies import date_dir_day, discover_apply_dirs
+from core.store import normalize
+
+CATALOG_NAME = ".jobuine_catalog.sqlite"
+CATALOG_VERSION = "2"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    company TEXT,
+    role TEXT,
+    link TEXT,
+    status TEXT,
+    company_norm TEXT,
+    role_norm TEXT,
+    status_norm TEXT,
+    inputs TEXT NOT NULL,
+    pdfs TEXT NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0,
+    signature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_day ON dirs (day);
+"""
+COLUMNS = ["day", "company", "role", "status", "link", "path", "inputs", "pdfs", "archived"]
+
+
+def catalog_path(applies_dir: Path) -> Path:
+    return Path(applies_dir) / CATALOG_NAME
+
+
+def connect(applies_dir: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the catalog of applies_dir."""
+    conn = sqlite3.connect(catalog_path(applies_dir))
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if not row or row[0] != CATALOG_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS dirs")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (CATALOG_VERSION,))
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# =========================
+# SCANNING
+# =========================
+def scan_signatures(applies_dir: Path) -> dict:
+    """Return {apply dir path: (day, signature)} for every apply directory on disk."""
+    found = {}
+    for dir_path in discover_apply_dirs(applies_dir):
+        try:
+            found[str(dir_path)] = (date_dir_day(dir_path.parent.name).isoformat(), dir_signature(dir_path))
+        except OSError:  # removed while scanning
+            continue
+    return found
+
+
+def dir_signature(dir_path) -> str:
+    """Directory mtime (files added/removed) plus the newest JSON mtime (edited in place)."""
+    newest = 0
+    with os.scandir(dir_path) as files:
+        for f in files:
+            if f.name.endswith(".json") and not f.name.startswith("."):
+                try:
+                    newest = max(newest, f.stat().st_mtime_ns)
+                except OSError:
+                    continue
+    return f"{os.stat(dir_path).st_mtime_ns}:{newest}"
+
+
+def describe(dir_path: str, archive=None) -> dict:
+    """Read the catalog fields of one apply directory (from archive if given)."""
+    inputs, pdfs, detail = {}, [], {}
+    names = archive.names(dir_path) if archive else sorted(os.listdir(dir_path))
+    for name in names:
+        if name.startswith(".") or "/" in name:
+            continue
+        if name.endswith(".pdf"):
+            pdfs.append(name)
+        elif name.endswith(".json"):
+            try:
+                if archive:
+                    content = archive.read(dir_path, name)
+                else:
+                    with open(os.path.join(dir_path, name), "rb") as f:
+                        content = f.read()
+            except OSError:
+                continue
+            inputs[name] = mf.content_digest(content)
+            try:
+                candidate = (json.loads(content) or {}).get("applyDetail") or {}
+            except (ValueError, AttributeError):
+                continue
+            if candidate.get("company") or candidate.get("role"):
+                detail = candidate
+
+    read = (lambda name: archive.read(dir_path, name)) if archive else None
+    posting = mf.load_manifest(dir_path, read).get("posting") or {}
+    company = detail.get("company") or posting.get("company") or os.path.basename(dir_path)[4:].replace("_", " ")
+    role = detail.get("role") or posting.get("role") or ""
+    # Without an applyDetail status: "rendered" once a PDF exists, else "draft".
+    status = detail.get("status") or ("rendered" if pdfs else "draft")
+    return {
+        "company": company, "role": role, "link": detail.get("link") or posting.get("link") or "",
+        "status": status, "inputs": inputs, "pdfs": pdfs,
+    }
+
+
+def refresh(conn: sqlite3.Connection, applies_dir: Path) -> tuple:
+    """Bring the catalog in line with applies_dir. Returns (updated, removed) directory counts."""
+    with profile.stage("catalog: scan"):
+        on_disk = scan_signatures(applies_dir)
+        archive = arc.open_archive(applies_dir)
+        archived = {}
+        if archive:
+            # A directory both on disk and in the archive (restored, or an interrupted archive run) is read from disk.
+            archived = {str(path): (day, f"archived:{archived_at}")
+                        for path, day, archived_at in archive.archived_dirs() if str(path) not in on_disk}
+    known = dict(conn.execute("SELECT path, signature FROM dirs"))
+    current = {**on_disk, **archived}
+    changed = [path for path, (_, signature) in current.items() if known.get(path) != signature]
+    removed = [path for path in known if path not in current]
+    if not changed and not removed:
+        if archive:
+            archive.close()
+        return 0, 0
+
+    try:
+        with profile.stage("catalog: update"), conn:
+            conn.executemany("DELETE FROM dirs WHERE path = ?", ((p,) for p in removed))
+            for path in changed:
+                day, signature = current[path]
+                is_archived = path in archived
+                info = describe(path, archive if is_archived else None)
+                conn.execute(
+                    "INSERT OR REPLACE INTO dirs (path, day, name, company, role, link, status, company_norm, "
+                    "role_norm, status_norm, inputs, pdfs, archived, signature) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, day, os.path.basename(path), info["company"], info["role"], info["link"], info["status"],
+                     normalize(info["company"]), normalize(info["role"]), normalize(info["status"]),
+                     json.dumps(info["inputs"]), json.dumps(info["pdfs"]), int(is_archived), signature),
+                )
+    finally:
+        if archive:
+            archive.close()
+    return len(changed), len(removed)
+
+
+# =========================
+# QUERIES
+# =========================
+def query(conn: sqlite3.Connection, company: str = None, role: str = None, status: str = None,
+          since=None, until=None, limit: int = None) -> tuple:
+    """
+    Return (total matches, newest `limit` matching directories as dicts).
+    company/role match as case-insensitive substrings, status exactly (case-insensitive).
+    """
+    where, params = [], []
+    if company:
+        where.append("instr(company_norm, ?) > 0")
+        params.append(normalize(company))
+    if role:
+        where.append("instr(role_norm, ?) > 0")
+        params.append(normalize(role))
+    if status:
+        where.append("status_norm = ?")
+        params.append(normalize(status))
+    if since:
+        where.append("day >= ?")
+        params.append(since.isoformat())
+    if until:
+        where.append("day <= ?")
+        params.append(until.isoformat())
+    clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+    total = conn.execute(f"SELECT COUNT(*) FROM dirs{clause}", params).fetchone()[0]
+    sql = f"SELECT {', '.join(COLUMNS)} FROM dirs{clause} ORDER BY day DESC, path"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    rows = []
+    for values in conn.execute(sql, params):
+        row = dict(zip(COLUMNS, values))
+        row["inputs"] = json.loads(row["inputs"])
+        row["pdfs"] = json.loads(row["pdfs"])
+        row["archived"] = bool(row["archived"])
+        rows.append(row)
+    return total, rows
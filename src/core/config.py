@@ -1,16 +1,38 @@
+import copy
+import os
 import yaml
 from pathlib import Path
 
+from core import profile
 
-def load_config() -> dict:
-    """Load config.yaml from the project root directory."""
+# (path, mtime_ns, size) -> parsed config, so the get_* getters parse YAML once.
+_parsed = {}
+
+
+def config_path() -> Path:
+    """Path of config.yaml: $JOBUINE_CONFIG if set, else the one in the project root directory."""
     project_root = Path(__file__).resolve().parents[2]
-    config_path = project_root / "config.yaml"
-    if not config_path.exists():
-        raise FileNotFoundError(f"❌ config.yaml not found at {config_path}")
+    return Path(os.environ.get("JOBUINE_CONFIG") or project_root / "config.yaml")
+
+
+def load_config() -> dict:
+    """
+    Load config.yaml (see config_path).
+    The parsed file is cached until its mtime or size changes; callers get a copy.
+    """
+    path = config_path()
+    try:
+        st = path.stat()
+    except OSError:
+        raise FileNotFoundError(f"❌ config.yaml not found at {path}")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if key not in _parsed:
+        with profile.stage("config.yaml"):
+            with open(path, "r", encoding="utf-8") as f:
+                _parsed.clear()
+                _parsed[key] = yaml.safe_load(f) or {}
+    return copy.deepcopy(_parsed[key])
 
 
 def get_value(cfg: dict, *keys: str):
@@ -53,3 +75,45 @@ def get_current_apply_dir() -> Path:
     if not value:
         raise KeyError("❌ 'current_apply_dir' not found in config.yaml. Run apply.sh first.")
     return Path(value).expanduser().resolve()
+
+
+def get_compact_threshold() -> int:
+    """Return how many journaled rows trigger an automatic compaction (default 200)."""
+    cfg = load_config()
+    value = get_value(cfg, "journal_compact_threshold")
+    return int(value) if value else 200
+
+
+def get_store_shards():
+    """Return the store sharding mode from config.yaml: None (one workbook), "year" or "month"."""
+    cfg = load_config()
+    value = get_value(cfg, "store_shards")
+    if not value or str(value).lower() in ("none", "off", "false"):
+        return None
+    value = str(value).lower()
+    if value not in ("year", "month"):
+        raise ValueError(f"❌ store_shards must be year, month or none, not {value!r}.")
+    return value
+
+
+def get_theme_file():
+    """Return the optional PDF theme file (YAML/JSON) from config.yaml, or None."""
+    cfg = load_config()
+    value = get_value(cfg, "theme_file")
+    return str(Path(value).expanduser().resolve()) if value else None
+
+
+def get_cache_dir() -> str:
+    """Return the render cache directory (config `cache_dir`, default applies_dir/.jobuine_cache)."""
+    cfg = load_config()
+    value = get_value(cfg, "cache_dir")
+    if value:
+        return str(Path(value).expanduser().resolve())
+    return str(get_applies_dir() / ".jobuine_cache")
+
+
+def get_tailor_config() -> dict:
+    """Return the `tailor:` section of config.yaml (LLM backend settings), or {}."""
+    cfg = load_config()
+    value = get_value(cfg, "tailor")
+    return dict(value) if isinstance(value, dict) else {}
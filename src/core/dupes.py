@@ -0,0 +1,112 @@
+"""
+Duplicate-application index used by `jobuine apply`.
+
+Hashed (company, role) and posting-link keys (store.application_keys) live in
+the `dupe_keys` table of the store sidecar, so a lookup is a primary-key probe
+instead of a workbook scan. Keys come from two origins:
+  - store: every row of the workbook and journal, kept current by the
+    sidecar itself (rebuilds and appends);
+  - apply: apply directories, scanned once from their manifests and JSONs,
+    then added by `apply` as it creates each directory.
+A stale sidecar (workbook edited by hand) is still used for lookups; it is
+only built when missing, so apply never has to load the xlsx afterwards.
+In a sharded store the store keys live in each shard's sidecar and are
+probed too; apply keys stay in the sidecar of store_file itself.
+Archived apply directories are scanned from the archive.
+"""
+import glob
+import json
+import os
+from pathlib import Path
+
+from core import archive as arc
+from core import manifest as mf
+from core import shards, store
+from core.applies import discover_apply_dirs
+
+APPLY_SCANNED_META = "apply_keys_scanned"
+
+
+def dir_postings(dir_path, archive=None) -> list:
+    """(company, role, link) of an apply directory: its recorded posting and every applyDetail."""
+    postings = []
+    read = (lambda name: archive.read(dir_path, name)) if archive else None
+    posting = mf.load_manifest(dir_path, read).get("posting")
+    if posting:
+        postings.append((posting.get("company"), posting.get("role"), posting.get("link")))
+    if archive:
+        paths = [name for name in archive.names(dir_path) if name.endswith(".json") and "/" not in name]
+    else:
+        paths = sorted(glob.glob(os.path.join(str(dir_path), "*.json")))
+    for path in paths:
+        try:
+            if archive:
+                detail = (json.loads(archive.read(dir_path, path)) or {}).get("applyDetail") or {}
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    detail = (json.load(f) or {}).get("applyDetail") or {}
+        except (OSError, ValueError, AttributeError):
+            continue
+        if detail:
+            postings.append((detail.get("company"), detail.get("role"), detail.get("link")))
+    return postings
+
+
+class DuplicateIndex:
+    """Open once per apply run; find() before creating a directory, add() after."""
+
+    def __init__(self, excel_path: Path, applies_dir: Path):
+        self.applies_dir = Path(applies_dir)
+        self.conn = store.open_cache(excel_path, stale_ok=True)
+        self.shard_conns = [store.open_cache(path, stale_ok=True) for path in shards.store_files(excel_path)
+                            if path != Path(excel_path) and store.exists(path)]
+        if store._get_meta(self.conn, APPLY_SCANNED_META) is None:
+            self.scan()
+
+    def scan(self) -> int:
+        """(Re)index every apply directory under applies_dir. Returns the number of keys."""
+        count = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM dupe_keys WHERE origin = 'apply'")
+            for dir_path in discover_apply_dirs(self.applies_dir):
+                for company, role, link in dir_postings(dir_path):
+                    count += self._insert(dir_path, company, role, link)
+            archive = arc.open_archive(self.applies_dir)
+            if archive:
+                try:
+                    for dir_path, _, _ in archive.archived_dirs():
+                        for company, role, link in dir_postings(dir_path, archive):
+                            count += self._insert(dir_path, company, role, link)
+                finally:
+                    archive.close()
+            store._set_meta(self.conn, APPLY_SCANNED_META, "1")
+        return count
+
+    def _label(self, dir_path) -> str:
+        dir_path = Path(dir_path)
+        return f"{dir_path.parent.name}/{dir_path.name}"
+
+    def _insert(self, dir_path, company, role, link) -> int:
+        keys = store.application_keys(company, role, link)
+        self.conn.executemany("INSERT OR IGNORE INTO dupe_keys (key, origin, label) VALUES (?, 'apply', ?)",
+                              ((key, self._label(dir_path)) for key in keys))
+        return len(keys)
+
+    def find(self, company, role, link=None) -> list:
+        """Return where an application with the same company+role or link already exists."""
+        keys = store.application_keys(company, role, link)
+        if not keys:
+            return []
+        sql = f"SELECT DISTINCT label FROM dupe_keys WHERE key IN ({', '.join('?' for _ in keys)})"
+        labels = set()
+        for conn in [self.conn] + self.shard_conns:
+            labels.update(label for (label,) in conn.execute(sql, keys))
+        return sorted(labels)
+
+    def add(self, dir_path, company, role, link=None) -> None:
+        with self.conn:
+            self._insert(dir_path, company, role, link)
+
+    def close(self) -> None:
+        for conn in [self.conn] + self.shard_conns:
+            conn.close()
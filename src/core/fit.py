@@ -0,0 +1,258 @@
+"""
+Fit a CV into a page budget (`jobuine generate --fit-pages N`).
+
+Instead of building the PDF over and over until it fits, every candidate
+layout is measured: its flowables are wrapped and split into a frame with
+the page geometry of write_pdf, which is what doc.build does minus drawing
+and serializing. Candidates tighten, least visible first, the `spacing`
+theme key, then the font sizes, then drop the last bullets of the oldest
+experiences; each knob is bisected and the looser ones are relaxed back up
+as far as the budget allows. The PDF is then written once.
+"""
+import copy
+import io
+import time
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import PageBreak
+from reportlab.platypus.doctemplate import ActionFlowable
+from reportlab.platypus.frames import Frame, _FUZZ
+
+from core.render import RenderContext
+
+SPACINGS = (1.0, 0.9, 0.8, 0.7, 0.6, 0.5)
+FONT_SCALES = (1.0, 0.95, 0.9, 0.85)
+FONT_KEYS = ("header_font_size", "role_font_size", "section_font_size", "body_font_size", "contact_font_size")
+# Bullets every experience keeps when bullets have to be trimmed.
+MIN_BULLETS = 2
+BULLET_PREFIXES = ("- ", "• ")
+# ActionFlowables that end the (single-frame) page, as handled by BaseDocTemplate.
+PAGE_ACTIONS = ("frameEnd", "pageEnd", "pageBreak")
+
+_contexts = {}
+
+
+# =========================
+# MEASUREMENT
+# =========================
+class _Measure:
+    """Stand-in for the doctemplate that KeepTogether asks for the next frame."""
+
+    def __init__(self, frame: Frame):
+        self.frame_template = frame
+
+    def _peekNextFrame(self):
+        return self.frame_template
+
+
+def page_frame(ctx: RenderContext) -> Frame:
+    """The frame SimpleDocTemplate lays out every page of ctx in."""
+    width, height = ctx.page_size
+    m = ctx.margins
+    return Frame(m["leftMargin"], m["bottomMargin"],
+                 width - m["leftMargin"] - m["rightMargin"], height - m["topMargin"] - m["bottomMargin"])
+
+
+def _place(frame: Frame, flowable, canv) -> bool:
+    """Frame._add without drawing: advance the frame past flowable, or return False if it does not fit."""
+    flowable._frame = frame
+    flowable.canv = canv
+    try:
+        if getattr(flowable, "frameAction", None):
+            flowable.frameAction(frame)
+            return True
+        zero_size = getattr(flowable, "_ZEROSIZE", False)
+        space = 0
+        if not frame._atTop:
+            space = flowable.getSpaceBefore()
+            if frame._oASpace:
+                if getattr(flowable, "_SPACETRANSFER", False) or zero_size:
+                    space = frame._prevASpace
+                space = max(space - frame._prevASpace, 0)
+        avail = frame._y - frame._y1p - space
+        if avail <= 0 and not zero_size:
+            return False
+        _, height = flowable.wrap(frame._getAvailableWidth(), avail)
+        y = frame._y - height - space
+        if y < frame._y1p - _FUZZ:
+            return False
+        space_after = flowable.getSpaceAfter()
+        if frame._oASpace:
+            if getattr(flowable, "_SPACETRANSFER", False):
+                space_after = frame._prevASpace
+            frame._prevASpace = space_after
+        y -= space_after
+        if y != frame._y:
+            frame._atTop = 0
+        frame._y = y
+        return True
+    finally:
+        for attr in ("canv", "_frame"):
+            if hasattr(flowable, attr):
+                delattr(flowable, attr)
+
+
+def count_pages(flowables: list, ctx: RenderContext, limit: int = None) -> int:
+    """
+    Pages write_pdf would produce for flowables, following the split and
+    page-break rules of BaseDocTemplate.handle_flowable. Stops counting once
+    the count is past limit. The flowables are consumed: build fresh ones to render.
+    """
+    frame = page_frame(ctx)
+    canv = Canvas(io.BytesIO(), pagesize=ctx.page_size)
+    canv._doctemplate = _Measure(frame)
+    queue = list(flowables)
+    pages = 1
+
+    def new_page():
+        nonlocal pages
+        frame._reset()
+        pages += 1
+
+    while queue and (limit is None or pages <= limit):
+        f = queue.pop(0)
+        if f is None:
+            continue
+        if isinstance(f, PageBreak) or isinstance(f, ActionFlowable):
+            action = f.action[0] if isinstance(f, ActionFlowable) else "pageBreak"
+            if action in PAGE_ACTIONS:
+                new_page()
+            continue
+        if _place(frame, f, canv):
+            continue
+        parts = frame.split(f, canv)
+        if parts:
+            if isinstance(parts[0], (PageBreak, ActionFlowable)):
+                queue[0:0] = parts
+            elif _place(frame, parts[0], canv):
+                queue[0:0] = parts[1:]
+            else:  # doc.build raises a LayoutError here: never a fit
+                return max(pages, limit or 0) + 1
+        elif frame._atTop:  # too large even for an empty page
+            return max(pages, limit or 0) + 1
+        else:
+            queue.insert(0, f)
+            new_page()
+    return pages
+
+
+# =========================
+# SEARCH
+# =========================
+def fitted_context(ctx: RenderContext, spacing: float, font_scale: float) -> RenderContext:
+    """ctx with its spacing and font sizes scaled; memoized per process."""
+    if spacing == 1.0 and font_scale == 1.0:
+        return ctx
+    theme = dict(ctx.theme)
+    theme["spacing"] = theme["spacing"] * spacing
+    for key in FONT_KEYS:
+        theme[key] = round(theme[key] * font_scale, 2)
+    key = tuple(sorted(theme.items()))
+    fitted = _contexts.get(key)
+    if fitted is None:
+        fitted = _contexts[key] = RenderContext(theme)
+    return fitted
+
+
+def _is_bullet(line: str) -> bool:
+    return line.strip().startswith(BULLET_PREFIXES)
+
+
+def trimmable_bullets(data: dict) -> int:
+    """Bullets trim_bullets can drop without leaving an experience under MIN_BULLETS."""
+    total = 0
+    for exp in data.get("experiences", []) or []:
+        count = sum(1 for line in (exp.get("detail", "") or "").splitlines() if _is_bullet(line))
+        total += max(count - MIN_BULLETS, 0)
+    return total
+
+
+def trim_bullets(data: dict, n: int) -> dict:
+    """Copy of data without the last n bullets, taken from the oldest (last listed) experiences first."""
+    if not n:
+        return data
+    data = copy.deepcopy(data)
+    for exp in reversed(data.get("experiences", []) or []):
+        lines = (exp.get("detail", "") or "").splitlines()
+        bullets = [i for i, line in enumerate(lines) if _is_bullet(line)]
+        drop = set(bullets[MIN_BULLETS:][-n:]) if len(bullets) > MIN_BULLETS else set()
+        if drop:
+            exp["detail"] = "\n".join(line for i, line in enumerate(lines) if i not in drop)
+            n -= len(drop)
+        if not n:
+            break
+    return data
+
+
+def _first_fit(lo: int, hi: int, fits) -> int:
+    """Smallest index in [lo, hi] for which fits holds, given that it holds at hi."""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if fits(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return hi
+
+
+def fit(data: dict, ctx: RenderContext, pages: int, build) -> tuple:
+    """
+    Find the loosest layout of data that fits in pages. build(data, ctx)
+    returns fresh flowables. Returns (ctx, data, report) for the winning
+    layout; report has spacing, font_scale, trimmed, pages, fits,
+    measured (layouts) and ms. When nothing fits, the tightest layout wins.
+    """
+    started = time.perf_counter()
+    max_trim = trimmable_bullets(data)
+    counted = {}
+
+    def pages_of(s: int, f: int, t: int) -> int:
+        if (s, f, t) not in counted:
+            fitted = fitted_context(ctx, SPACINGS[s], FONT_SCALES[f])
+            counted[s, f, t] = count_pages(build(trim_bullets(data, t), fitted), fitted, limit=pages)
+        return counted[s, f, t]
+
+    def fits(s: int, f: int, t: int) -> bool:
+        return pages_of(s, f, t) <= pages
+
+    s_min, f_min = len(SPACINGS) - 1, len(FONT_SCALES) - 1
+    if fits(0, 0, 0):
+        s, f, t = 0, 0, 0
+    elif fits(s_min, 0, 0):
+        s, f, t = _first_fit(1, s_min, lambda i: fits(i, 0, 0)), 0, 0
+    elif fits(s_min, f_min, 0):
+        f = _first_fit(1, f_min, lambda j: fits(s_min, j, 0))
+        s, t = _first_fit(0, s_min, lambda i: fits(i, f, 0)), 0
+    elif max_trim and fits(s_min, f_min, max_trim):
+        t = _first_fit(1, max_trim, lambda k: fits(s_min, f_min, k))
+        f = _first_fit(0, f_min, lambda j: fits(s_min, j, t))
+        s = _first_fit(0, s_min, lambda i: fits(i, f, t))
+    else:
+        s, f, t = s_min, f_min, max_trim
+    report = {
+        "spacing": SPACINGS[s],
+        "font_scale": FONT_SCALES[f],
+        "trimmed": t,
+        "pages": pages_of(s, f, t),
+        "fits": fits(s, f, t),
+        "measured": len(counted),
+        "ms": (time.perf_counter() - started) * 1000,
+    }
+    return fitted_context(ctx, SPACINGS[s], FONT_SCALES[f]), trim_bullets(data, t), report
+
+
+def format_report(report: dict, pages: int) -> str:
+    """One line for create_cv_pdf, e.g. `Fitted to 1 page: spacing 80%, font 95% (…)`."""
+    changes = []
+    if report["spacing"] != 1.0:
+        changes.append(f"spacing {report['spacing']:.0%}")
+    if report["font_scale"] != 1.0:
+        changes.append(f"font {report['font_scale']:.0%}")
+    if report["trimmed"]:
+        changes.append(f"{report['trimmed']} bullet{'s' if report['trimmed'] > 1 else ''} trimmed")
+    budget = f"{pages} page{'s' if pages > 1 else ''}"
+    how = ", ".join(changes) or "as is"
+    timing = f"({report['measured']} layouts measured in {report['ms']:.0f} ms)"
+    if report["fits"]:
+        return f"📐 Fitted to {budget}: {how} {timing}"
+    return f"⚠️ Does not fit in {budget} even at {how}; {report['pages']}+ pages {timing}"
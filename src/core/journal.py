@@ -0,0 +1,93 @@
+"""
+Append-only journal of new application rows.
+
+generate appends rows here in O(1) under an advisory file lock instead of
+rewriting the whole workbook; `jobuine compact` later folds the journal into
+the xlsx. The same lock serializes appends, compaction and sidecar rebuilds,
+so concurrent runs never lose each other's rows.
+"""
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def journal_path(excel_path: Path) -> Path:
+    """Return the journal file stored next to the workbook."""
+    excel_path = Path(excel_path)
+    return excel_path.with_name(f"{excel_path.stem}.journal.jsonl")
+
+
+def lock_path(excel_path: Path) -> Path:
+    """Return the lock file guarding the workbook, its journal and sidecar."""
+    excel_path = Path(excel_path)
+    return excel_path.with_name(f"{excel_path.stem}.lock")
+
+
+@contextmanager
+def locked(excel_path: Path):
+    """Hold the exclusive advisory lock of the store for the duration of the block."""
+    path = lock_path(excel_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def append(excel_path: Path, rows: list) -> None:
+    """Append rows to the journal and fsync. Caller must hold `locked`."""
+    if not rows:
+        return
+    lines = "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+    with open(journal_path(excel_path), "a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read(excel_path: Path) -> list:
+    """Return every journaled row in append order. Caller must hold `locked`."""
+    rows = []
+    try:
+        with open(journal_path(excel_path), "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    rows.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return rows
+
+
+def pending_count(excel_path: Path) -> int:
+    """Number of journaled rows not yet compacted into the workbook."""
+    try:
+        with open(journal_path(excel_path), "rb") as f:
+            return sum(1 for line in f if line.strip())
+    except FileNotFoundError:
+        return 0
+
+
+def clear(excel_path: Path) -> None:
+    """Remove the journal after compaction. Caller must hold `locked`."""
+    try:
+        os.remove(journal_path(excel_path))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,200 @@
+"""
+LLM backends for `jobuine tailor`.
+
+A backend turns one filled prompt.txt into the model's reply text with a
+blocking `complete(prompt)`; tailor runs many of them concurrently in
+threads. Backends:
+  - openai:  any OpenAI-compatible /chat/completions endpoint (OpenAI, a
+             local llama.cpp / vLLM / Ollama server, a mock server in tests),
+             over one pooled requests.Session;
+  - command: a local program that reads the prompt on stdin and prints the
+             reply (e.g. `ollama run llama3`);
+  - mock:    no model at all, answers a small schema-valid CV (dry runs).
+Errors worth retrying (timeouts, 429, 5xx) raise BackendError(retryable=True).
+"""
+import abc
+import asyncio
+import json
+import os
+import re
+import shlex
+import subprocess
+import time
+
+DEFAULTS = {
+    "backend": "openai",
+    "base_url": "https://api.openai.com/v1",
+    "model": "gpt-4o-mini",
+    "api_key_env": "OPENAI_API_KEY",
+    "command": None,
+    "concurrency": 8,
+    "rate_limit": 60,  # requests per minute, 0 = unlimited
+    "retries": 3,
+    "timeout": 120,
+    "temperature": 0.2,
+    "mock_delay": 0.0,
+}
+
+
+class BackendError(Exception):
+    def __init__(self, message: str, retryable: bool = False, retry_after: float = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class Backend(abc.ABC):
+    name = "backend"
+
+    @abc.abstractmethod
+    def complete(self, prompt: str) -> str:
+        """Return the model's reply to prompt; raise BackendError on failure."""
+
+    def close(self) -> None:
+        pass
+
+
+class OpenAIBackend(Backend):
+    """POST {base_url}/chat/completions; one keep-alive connection per concurrent request."""
+
+    name = "openai"
+
+    def __init__(self, base_url: str, model: str, api_key: str = None, timeout: float = 120,
+                 temperature: float = 0.2, pool_size: int = 8):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.model = model
+        self.timeout = timeout
+        self.temperature = temperature
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def complete(self, prompt: str) -> str:
+        import requests
+
+        body = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+        }
+        try:
+            response = self.session.post(self.url, json=body, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise BackendError(f"{type(e).__name__}: {e}", retryable=True)
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            raise BackendError(f"HTTP {response.status_code}", retryable=True,
+                               retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+        if response.status_code >= 400:
+            raise BackendError(f"HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise BackendError(f"unexpected response: {response.text[:200]}")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class CommandBackend(Backend):
+    """Run a local model command with the prompt on stdin; its stdout is the reply."""
+
+    name = "command"
+
+    def __init__(self, command: str, timeout: float = 120):
+        self.argv = shlex.split(command)
+        self.timeout = timeout
+
+    def complete(self, prompt: str) -> str:
+        try:
+            done = subprocess.run(self.argv, input=prompt, capture_output=True, text=True, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise BackendError(f"timed out after {self.timeout}s", retryable=True)
+        except OSError as e:
+            raise BackendError(str(e))
+        if done.returncode != 0:
+            raise BackendError(f"exit status {done.returncode}: {done.stderr.strip()[:200]}", retryable=True)
+        return done.stdout
+
+
+class MockBackend(Backend):
+    """Answer a minimal valid CV for the prompt's company and role, after `delay` seconds."""
+
+    name = "mock"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def complete(self, prompt: str) -> str:
+        if self.delay:
+            time.sleep(self.delay)
+        company = re.search(r"COMPANY_NAME:\s*(.*)", prompt)
+        role = re.search(r"role\s*:\s*(.*)", prompt)
+        company = company.group(1).strip() if company else ""
+        role = role.group(1).strip() if role else ""
+        return json.dumps({
+            "applyDetail": {"company": company, "role": role, "status": "Applied"},
+            "name": "Mock Candidate",
+            "role": role,
+            "contact": {"email": "mock@example.com"},
+            "summary": f"Mock CV tailored for {role} at {company}.",
+            "experiences": [{
+                "role": role, "company": "Example Corp", "start": {"year": "2020", "month": "01"},
+                "end": "Present", "detail": "- Built things\n- Shipped things",
+            }],
+            "coreSkills": [{"category": "General", "skills": ["Python"]}],
+            "priority": ["experiences", "coreSkills", "education"],
+        })
+
+
+def get_backend(settings: dict) -> Backend:
+    """Build the backend described by tailor settings (see DEFAULTS)."""
+    kind = settings["backend"]
+    if kind == "openai":
+        api_key = os.environ.get(settings["api_key_env"]) if settings.get("api_key_env") else None
+        return OpenAIBackend(settings["base_url"], settings["model"], api_key, settings["timeout"],
+                             settings["temperature"], pool_size=settings["concurrency"])
+    if kind == "command":
+        if not settings.get("command"):
+            raise ValueError("❌ tailor.command is required for the command backend.")
+        return CommandBackend(settings["command"], settings["timeout"])
+    if kind == "mock":
+        return MockBackend(float(settings.get("mock_delay") or 0))
+    raise ValueError(f"❌ Unknown tailor backend: {kind} (openai, command or mock)")
+
+
+class RateLimiter:
+    """Space request starts evenly to stay under `per_minute` requests (0 = no limit)."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def extract_json(text: str):
+    """Parse the JSON object of a reply, tolerating ```json fences and text around it."""
+    text = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1).strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in the reply")
+    return json.loads(text[start:end + 1])
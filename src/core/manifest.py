@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Dot-prefixed so glob("*.json") in generate never picks it up as an input.
+MANIFEST_NAME = ".jobuine_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path(dir_path) -> Path:
+    """Return the manifest path of an apply directory."""
+    return Path(dir_path) / MANIFEST_NAME
+
+
+def load_manifest(dir_path, read=None) -> dict:
+    """
+    Load the manifest of an apply directory.
+    Returns an empty manifest when it is missing, unreadable or from another version.
+    read(name) -> bytes reads it from somewhere else than the disk (an archive).
+    """
+    try:
+        if read is not None:
+            manifest = json.loads(read(MANIFEST_NAME))
+        else:
+            with open(manifest_path(dir_path), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION}
+    manifest.setdefault("files", {})
+    manifest.setdefault("logged_rows", [])
+    return manifest
+
+
+def save_manifest(dir_path, manifest: dict) -> None:
+    """Atomically write the manifest of an apply directory."""
+    path = manifest_path(dir_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def content_digest(content: bytes) -> str:
+    """Return the sha256 hex digest of raw file content."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def row_digest(row: list) -> str:
+    """Return a stable digest of an Excel row."""
+    encoded = json.dumps(row, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def is_rendered(manifest: dict, name: str, digest: str, dir_path) -> bool:
+    """True if `name` was rendered from identical content and its PDF still exists."""
+    entry = manifest["files"].get(name)
+    if not entry or entry.get("sha256") != digest:
+        return False
+    pdf = entry.get("pdf")
+    return bool(pdf) and (Path(dir_path) / pdf).exists()
+
+
+def record_render(manifest: dict, name: str, digest: str, pdf_name: str) -> None:
+    """Remember that `name` with content `digest` produced `pdf_name`."""
+    manifest["files"][name] = {"sha256": digest, "pdf": pdf_name}
+
+
+def unlogged_rows(manifest: dict, rows: list) -> list:
+    """Return the rows that are not yet recorded as logged to the Excel store."""
+    logged = set(manifest["logged_rows"])
+    return [row for row in rows if row_digest(row) not in logged]
+
+
+def record_logged(manifest: dict, rows: list) -> None:
+    """Mark rows as appended to the Excel store."""
+    logged = manifest["logged_rows"]
+    seen = set(logged)
+    for row in rows:
+        digest = row_digest(row)
+        if digest not in seen:
+            logged.append(digest)
+            seen.add(digest)
+
+
+def record_posting(manifest: dict, company: str, role: str, link: str = None) -> None:
+    """Remember the posting an apply directory was created for (duplicate detection)."""
+    manifest["posting"] = {"company": company, "role": role, "link": link or ""}
@@ -0,0 +1,67 @@
+"""
+Aho-Corasick multi-pattern matcher for `check` with many search terms.
+
+All patterns are compiled into one automaton, so a text is scanned once no
+matter how many terms there are (instead of one `in` test per term).
+Overlapping and nested matches are all reported ("nova" and "technova").
+"""
+from collections import deque
+
+
+class AhoCorasick:
+    """Compile patterns once; `find(text)` returns the indices of the patterns occurring in text."""
+
+    def __init__(self, patterns: list):
+        self.patterns = list(patterns)
+        # State 0 is the root; goto[state] maps a character to the next state.
+        goto = [{}]
+        out = [()]
+        for idx, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (idx,)
+
+        # Breadth-first failure links; each state also inherits the outputs of its failure state.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                # Children of the root fail back to the root, not to themselves.
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def find(self, text: str) -> set:
+        """Return the set of pattern indices found in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while True:
+                nxt = goto[state].get(ch)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            if out[state]:
+                found.update(out[state])
+        return found
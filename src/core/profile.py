@@ -0,0 +1,198 @@
+"""
+Opt-in instrumentation for `jobuine --profile`.
+
+Code marks named stages with `with profile.stage("doc.build", file=name):`.
+While profiling is off a stage is a shared no-op object, so instrumented
+code pays one attribute check. While on, each stage records wall and CPU
+time, and with memory tracing also its peak traced memory (tracemalloc, so
+Python allocations only, and several times slower; nested stages include
+their children). Worker processes send their records back with
+their results (`drain` / `merge`), so batch runs are covered too.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+_enabled = False
+_trace_memory = False
+# True in pool workers started with worker_initializer: their records go back to the parent.
+_worker = False
+_records = []
+_stack = []
+
+
+def enable(trace_memory: bool = False) -> None:
+    """
+    Start recording stages. tracemalloc slows imports down a lot, so the CLI
+    starts it with start_memory_tracing() once the command module is imported.
+    """
+    global _enabled, _trace_memory
+    _enabled = True
+    _trace_memory = trace_memory
+
+
+def start_memory_tracing() -> None:
+    if _enabled and _trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def enable_worker(trace_memory: bool = False) -> None:
+    """Pool initializer: profile a worker, dropping records inherited through fork."""
+    global _worker
+    _worker = True
+    _records.clear()
+    _stack.clear()
+    enable(trace_memory)
+    start_memory_tracing()
+
+
+def worker_initializer() -> tuple:
+    """(initializer, initargs) that profile pool workers like this process, or (None, ())."""
+    return (enable_worker, (_trace_memory,)) if _enabled else (None, ())
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def in_worker() -> bool:
+    """True in a profiled pool worker, whose records must be drained and sent back."""
+    return _enabled and _worker
+
+
+class _NoStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+class _Stage:
+    def __init__(self, name: str, file: str = None):
+        self.name = name
+        self.file = file
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if _stack:
+                _stack[-1]["max"] = max(_stack[-1]["max"], peak)
+            tracemalloc.reset_peak()
+            _stack.append({"base": current, "max": 0})
+        self.cpu = time.process_time()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        cpu = time.process_time() - self.cpu
+        peak = 0
+        if tracemalloc.is_tracing() and _stack:
+            _, traced_peak = tracemalloc.get_traced_memory()
+            entry = _stack.pop()
+            top = max(entry["max"], traced_peak)
+            peak = max(0, top - entry["base"])
+            if _stack:
+                _stack[-1]["max"] = max(_stack[-1]["max"], top)
+            tracemalloc.reset_peak()
+        _records.append({
+            "name": self.name, "file": self.file, "start_ns": self.start,
+            "wall_ms": (end - self.start) / 1e6, "cpu_ms": cpu * 1000, "peak_kb": peak / 1024,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        })
+        return False
+
+
+def stage(name: str, file: str = None):
+    """Context manager timing one named stage (optionally for one input file)."""
+    return _Stage(name, file) if _enabled else _NO_STAGE
+
+
+def drain() -> list:
+    """Return and forget the records of this process (for sending back from workers)."""
+    records = list(_records)
+    _records.clear()
+    return records
+
+
+def merge(records: list) -> None:
+    """Add records collected in another process."""
+    if _enabled and records:
+        _records.extend(records)
+
+
+# =========================
+# REPORTS
+# =========================
+def summary(records: list = None) -> list:
+    """Aggregate records per stage name: count, wall/CPU totals and the highest peak."""
+    by_name = defaultdict(lambda: {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "peak_kb": 0.0})
+    for r in _records if records is None else records:
+        row = by_name[r["name"]]
+        row["count"] += 1
+        row["wall_ms"] += r["wall_ms"]
+        row["cpu_ms"] += r["cpu_ms"]
+        row["peak_kb"] = max(row["peak_kb"], r["peak_kb"])
+    return sorted(({"stage": name, **row} for name, row in by_name.items()),
+                  key=lambda row: row["wall_ms"], reverse=True)
+
+
+def print_summary(top_files: int = 10, out=sys.stderr) -> None:
+    """Print the per-stage table and the slowest input files."""
+    rows = summary()
+    if not rows:
+        return
+    def peak(kb: float) -> str:
+        return f" {kb:>10.0f}" if _trace_memory else ""
+
+    print("\n🔬 Profile (per stage, nested stages included in their parent):", file=out)
+    print(f"  {'stage':<32} {'count':>6} {'wall ms':>10} {'cpu ms':>10}"
+          + (f" {'peak KiB':>10}" if _trace_memory else ""), file=out)
+    for row in rows:
+        print(f"  {row['stage']:<32} {row['count']:>6} {row['wall_ms']:>10.1f} "
+              f"{row['cpu_ms']:>10.1f}{peak(row['peak_kb'])}", file=out)
+
+    per_file = defaultdict(lambda: [0.0, 0.0, 0.0])
+    for r in _records:
+        if r["file"]:
+            totals = per_file[r["file"]]
+            totals[0] += r["wall_ms"]
+            totals[1] += r["cpu_ms"]
+            totals[2] = max(totals[2], r["peak_kb"])
+    if per_file:
+        print(f"\n  Slowest input files (of {len(per_file)}):", file=out)
+        for file, (wall, cpu, kb) in sorted(per_file.items(), key=lambda i: i[1][0], reverse=True)[:top_files]:
+            print(f"  {file:<32} {'':>6} {wall:>10.1f} {cpu:>10.1f}{peak(kb)}", file=out)
+
+    try:
+        import resource
+        # ru_maxrss is KiB on Linux, bytes on macOS.
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+        print(f"\n  Peak RSS of this process: {rss_mb:.1f} MiB", file=out)
+    except ImportError:
+        pass
+
+
+def write_trace(path) -> None:
+    """Write the records as a Chrome trace (open in chrome://tracing or ui.perfetto.dev)."""
+    events = []
+    for r in _records:
+        args = {"cpu_ms": round(r["cpu_ms"], 3), "peak_kb": round(r["peak_kb"], 1)}
+        if r["file"]:
+            args["file"] = r["file"]
+        events.append({
+            "name": r["name"], "cat": "jobuine", "ph": "X",
+            "ts": r["start_ns"] / 1000, "dur": r["wall_ms"] * 1000,
+            "pid": r["pid"], "tid": r["tid"], "args": args,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,31 @@
+"""
+Precompiled prompt template for apply.
+
+prompt.txt is split once into static text segments and placeholder names, so
+filling it is a single join instead of one str.replace pass per placeholder.
+Values are substituted in one pass, so a placeholder-like string inside a job
+description is never expanded.
+"""
+import re
+
+PLACEHOLDERS = ("career_json", "job_description", "date_and_time", "company_name", "output_schema")
+
+
+class PromptTemplate:
+    """prompt.txt compiled into alternating static segments and placeholders."""
+
+    def __init__(self, text: str, placeholders=PLACEHOLDERS):
+        pattern = re.compile("{(" + "|".join(re.escape(p) for p in placeholders) + ")}")
+        # re.split with one group alternates: text, name, text, name, ..., text
+        parts = pattern.split(text)
+        self.segments = parts[0::2]
+        self.names = parts[1::2]
+
+    def render(self, values: dict) -> str:
+        """Fill every placeholder from values (missing ones are left as-is)."""
+        out = [self.segments[0]]
+        for name, segment in zip(self.names, self.segments[1:]):
+            value = values.get(name)
+            out.append("{" + name + "}" if value is None else value)
+            out.append(segment)
+        return "".join(out)
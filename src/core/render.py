@@ -0,0 +1,207 @@
+"""
+Render context shared by every create_cv_pdf call in a process.
+
+Building the sample stylesheet, the ParagraphStyles and TableStyles is done
+once per theme and cached, so batch runs only pay for it on the first PDF.
+Themes are plain dicts; a YAML/JSON theme file can override any key of
+DEFAULT_THEME.
+
+The `pdf_profile` theme key picks how write_pdf serializes the document:
+  - standard: reportlab defaults (what every earlier version wrote);
+  - compact:  binary Flate streams (no ASCII85 layer), a title-only info
+              dictionary, and byte-for-byte deterministic output: no
+              timestamps, and a document ID derived from the content, so
+              unchanged CVs produce unchanged files (left untouched on disk).
+"""
+import contextlib
+import hashlib
+import io
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+from reportlab import rl_config
+from reportlab.lib import colors, pagesizes
+from reportlab.lib.enums import TA_LEFT
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase.pdfdoc import PDFDictionary, PDFInfo, PDFString
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import HRFlowable, SimpleDocTemplate, TableStyle
+
+DEFAULT_THEME = {
+    "page_size": "LETTER",
+    "margin_left": 50,
+    "margin_right": 50,
+    "margin_top": 60,
+    "margin_bottom": 40,
+    "header_font_size": 22,
+    "role_font_size": 12,
+    "section_font_size": 14,
+    "body_font_size": 10,
+    "contact_font_size": 9,
+    "rule_color": "#DDDDDD",
+    "bullet_color": "#333333",
+    "pdf_profile": "standard",
+    "spacing": 1.0,  # scales the space between blocks and the extra leading between lines
+}
+PDF_PROFILES = ("standard", "compact")
+
+
+def load_theme(theme_file=None) -> dict:
+    """Return DEFAULT_THEME overridden by the keys of a YAML/JSON theme file."""
+    theme = dict(DEFAULT_THEME)
+    if not theme_file:
+        return theme
+    path = Path(theme_file).expanduser()
+    if not path.exists():
+        raise FileNotFoundError(f"❌ Theme file not found: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        overrides = (json.load(f) if path.suffix == ".json" else yaml.safe_load(f)) or {}
+    unknown = set(overrides) - set(DEFAULT_THEME)
+    if unknown:
+        raise KeyError(f"❌ Unknown theme keys in {path}: {', '.join(sorted(unknown))}")
+    theme.update(overrides)
+    if theme["pdf_profile"] not in PDF_PROFILES:
+        raise ValueError(f"❌ Unknown pdf_profile in {path}: {theme['pdf_profile']} ({' or '.join(PDF_PROFILES)})")
+    return theme
+
+
+class RenderContext:
+    """Styles, table styles, dividers and measured widths for one theme."""
+
+    def __init__(self, theme: dict):
+        self.theme = theme
+        self.page_size = getattr(pagesizes, theme["page_size"])
+        self.pdf_profile = theme["pdf_profile"]
+        self.margins = dict(
+            leftMargin=theme["margin_left"], rightMargin=theme["margin_right"],
+            topMargin=theme["margin_top"], bottomMargin=theme["margin_bottom"],
+        )
+        sample = getSampleStyleSheet()
+        body = theme["body_font_size"]
+        self.spacing = sp = theme["spacing"]
+
+        self.header = ParagraphStyle('Header', parent=sample['Heading1'], fontSize=theme["header_font_size"],
+                                     leading=theme["header_font_size"], alignment=TA_LEFT, spaceAfter=6 * sp)
+        self.role = ParagraphStyle('Role', parent=sample['Heading2'], fontSize=theme["role_font_size"],
+                                   leading=theme["role_font_size"] + 6 * sp, alignment=TA_LEFT,
+                                   spaceBefore=12 * sp, spaceAfter=12 * sp)
+        self.section_header = ParagraphStyle('SectionHeader', parent=sample['Heading2'],
+                                             fontSize=theme["section_font_size"],
+                                             leading=theme["section_font_size"] + 4 * sp,
+                                             spaceBefore=6 * sp, spaceAfter=6 * sp, fontName="Helvetica-Bold")
+        # A copy of Normal, so the shared sample stylesheet is never mutated.
+        self.normal = ParagraphStyle('Body', parent=sample['Normal'], fontSize=body, leading=body + 2 * sp)
+        self.exp_text = ParagraphStyle('ExpText', parent=self.normal, leading=body + 3 * sp,
+                                       spaceBefore=1 * sp, spaceAfter=3 * sp)
+        self.bullet_text = ParagraphStyle('BulletText', parent=self.normal, leftIndent=0,
+                                          leading=body + 2 * sp, spaceAfter=1 * sp)
+        self.contact_text = ParagraphStyle('ContactText', parent=self.normal, alignment=TA_LEFT,
+                                           fontSize=theme["contact_font_size"])
+
+        self.exp_table_style = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ])
+        self.edu_table_style = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+        ])
+
+        self.rule_color = colors.HexColor(theme["rule_color"])
+        self.bullet_color = colors.HexColor(theme["bullet_color"])
+        self._widths = {}
+
+    def section_rule(self) -> HRFlowable:
+        return HRFlowable(width="100%", thickness=0.8, lineCap='round',
+                          color=self.rule_color, spaceBefore=10 * self.spacing, spaceAfter=10 * self.spacing)
+
+    def thin_divider(self) -> HRFlowable:
+        return HRFlowable(width="100%", thickness=0.5, lineCap='round',
+                          color=self.rule_color, spaceBefore=6 * self.spacing, spaceAfter=6 * self.spacing)
+
+    def string_width(self, text: str, font_name: str = None, font_size: float = None) -> float:
+        """stringWidth in the body font by default, memoized per context."""
+        key = (text, font_name or self.normal.fontName, font_size or self.normal.fontSize)
+        width = self._widths.get(key)
+        if width is None:
+            width = self._widths[key] = stringWidth(*key)
+        return width
+
+
+# =========================
+# PDF OUTPUT
+# =========================
+class _TitleOnlyInfo(PDFInfo):
+    """Info dictionary without producer, creator, author, subject, keywords, dates or trapping."""
+
+    def format(self, document):
+        return PDFDictionary({"Title": PDFString(self.title)}).format(document)
+
+
+class CompactCanvas(Canvas):
+    """Canvas of the compact profile: invariant timestamps, compressed pages, title-only info."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.update(invariant=1, pageCompression=1)
+        super().__init__(*args, **kwargs)
+        self._doc.info = _TitleOnlyInfo()
+
+
+@contextlib.contextmanager
+def _binary_streams():
+    """Write Flate streams without the ASCII85 layer (about 25% smaller); rl_config is process-wide."""
+    saved = rl_config.useA85
+    rl_config.useA85 = 0
+    try:
+        yield
+    finally:
+        rl_config.useA85 = saved
+
+
+_TRAILER_ID = re.compile(rb"/ID\s*\[<[0-9a-fA-F]+><[0-9a-fA-F]+>\]\s*(?:%[^\n]*\n)?")
+
+
+def _content_id(data: bytes) -> bytes:
+    """
+    Replace the trailer /ID (in invariant mode the same for every document)
+    with a digest of the rest of the file. The trailer follows the xref
+    table, so no object offset moves.
+    """
+    match = _TRAILER_ID.search(data)
+    if match is None:
+        return data
+    digest = hashlib.md5(data[:match.start()] + data[match.end():], usedforsecurity=False).hexdigest().encode()
+    return data[:match.start()] + b"/ID [<" + digest + b"><" + digest + b">]\n" + data[match.end():]
+
+
+def write_pdf(output_pdf_path: str, flowables: list, ctx: "RenderContext", title: str = "") -> int:
+    """Build flowables into a PDF with ctx's page setup and pdf_profile. Returns the file size."""
+    if ctx.pdf_profile != "compact":
+        SimpleDocTemplate(output_pdf_path, pagesize=ctx.page_size, **ctx.margins).build(flowables)
+        return Path(output_pdf_path).stat().st_size
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=ctx.page_size, title=title or "", **ctx.margins)
+    with _binary_streams():
+        doc.build(flowables, canvasmaker=CompactCanvas)
+    data = _content_id(buffer.getvalue())
+    try:
+        with open(output_pdf_path, "rb") as f:
+            unchanged = f.read() == data
+    except OSError:
+        unchanged = False
+    if not unchanged:  # keep the mtime of an identical file, so backups and syncs skip it
+        with open(output_pdf_path, "wb") as f:
+            f.write(data)
+    return len(data)
+
+
+@lru_cache(maxsize=8)
+def get_render_context(theme_file: str = None) -> RenderContext:
+    """Build the render context of a theme once per process."""
+    return RenderContext(load_theme(theme_file))
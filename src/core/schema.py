@@ -0,0 +1,189 @@
+"""
+Validation of cv_data.json files against src/data/schema.json.
+
+The schema is compiled once into a tree of small check functions and cached
+by the schema file's path, mtime and size, so validating a file is a plain
+walk over the data with no per-call schema interpretation or file I/O.
+Supported keywords are the ones schema.json uses: type, properties,
+required, items, enum, pattern, additionalProperties (false), minItems,
+minLength, oneOf; others are ignored.
+Errors are path-level, e.g. `$.experiences[1].start.year: is required`.
+"""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SCHEMA_FILE = Path(__file__).resolve().parents[1] / "data" / "schema.json"
+
+TYPES = {
+    "string": str,
+    "object": dict,
+    "array": list,
+    "boolean": bool,
+    "integer": int,
+    "number": (int, float),
+    "null": type(None),
+}
+
+# Below this many files a process pool costs more than it saves.
+PARALLEL_MIN_FILES = 64
+
+# str(schema file) -> ((mtime_ns, size), Validator)
+_validators = {}
+
+
+def _type_name(value) -> str:
+    for name, py_type in TYPES.items():
+        if isinstance(value, py_type) and not (name in ("integer", "number") and isinstance(value, bool)):
+            return name
+    return type(value).__name__
+
+
+def _compile(schema: dict):
+    """Compile one schema node into check(value, path, errors)."""
+    checks = []
+
+    if "type" in schema:
+        allowed = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+
+        def check_type(value, path, errors):
+            if _type_name(value) not in allowed and not ("number" in allowed and _type_name(value) == "integer"):
+                errors.append(f"{path}: expected {' or '.join(allowed)}, got {_type_name(value)}")
+                return False
+            return True
+        checks.append(check_type)
+
+    if "enum" in schema:
+        options = schema["enum"]
+
+        def check_enum(value, path, errors):
+            if value not in options:
+                errors.append(f"{path}: must be one of {options}, got {value!r}")
+            return True
+        checks.append(check_enum)
+
+    if "pattern" in schema or "minLength" in schema:
+        regex = re.compile(schema["pattern"]) if "pattern" in schema else None
+        min_length = schema.get("minLength", 0)
+
+        def check_string(value, path, errors):
+            if isinstance(value, str):
+                if len(value) < min_length:
+                    errors.append(f"{path}: shorter than {min_length} characters")
+                elif regex and not regex.search(value):
+                    errors.append(f"{path}: {value!r} does not match {regex.pattern}")
+            return True
+        checks.append(check_string)
+
+    if "properties" in schema or "required" in schema or schema.get("additionalProperties") is False:
+        properties = {key: _compile(sub) for key, sub in schema.get("properties", {}).items()}
+        required = schema.get("required", [])
+        closed = schema.get("additionalProperties") is False
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return True
+            for key in required:
+                if key not in value:
+                    errors.append(f"{path}.{key}: is required")
+            for key, item in value.items():
+                check = properties.get(key)
+                if check:
+                    check(item, f"{path}.{key}", errors)
+                elif closed:
+                    errors.append(f"{path}.{key}: unexpected property")
+            return True
+        checks.append(check_object)
+
+    if "items" in schema or "minItems" in schema:
+        item_check = _compile(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems", 0)
+
+        def check_array(value, path, errors):
+            if not isinstance(value, list):
+                return True
+            if len(value) < min_items:
+                errors.append(f"{path}: needs at least {min_items} item(s)")
+            if item_check:
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]", errors)
+            return True
+        checks.append(check_array)
+
+    if "oneOf" in schema:
+        branches = [_compile(sub) for sub in schema["oneOf"]]
+
+        def check_one_of(value, path, errors):
+            results = []
+            for branch in branches:
+                branch_errors = []
+                branch(value, path, branch_errors)
+                results.append(branch_errors)
+            matched = sum(1 for r in results if not r)
+            if matched == 0:
+                errors.append(f"{path}: matches none of oneOf ({'; '.join(r[0] for r in results)})")
+            elif matched > 1:
+                errors.append(f"{path}: matches more than one of oneOf")
+            return True
+        checks.append(check_one_of)
+
+    def check(value, path, errors):
+        for step in checks:
+            # A failed type check makes the remaining checks meaningless.
+            if not step(value, path, errors):
+                return
+    return check
+
+
+class Validator:
+    """A compiled schema: validator.errors(data) returns a list of path-level messages."""
+
+    def __init__(self, schema: dict):
+        self._check = _compile(schema)
+
+    def errors(self, data) -> list:
+        errors = []
+        self._check(data, "$", errors)
+        return errors
+
+
+def get_validator(schema_file=SCHEMA_FILE) -> Validator:
+    """Compile schema_file once per process, until its mtime or size changes (like load_config)."""
+    st = os.stat(schema_file)
+    signature = (st.st_mtime_ns, st.st_size)
+    cached = _validators.get(str(schema_file))
+    if cached is None or cached[0] != signature:
+        with open(schema_file, "r", encoding="utf-8") as f:
+            cached = _validators[str(schema_file)] = (signature, Validator(json.load(f)))
+    return cached[1]
+
+
+def validate_data(data, schema_file=SCHEMA_FILE) -> list:
+    """Return the path-level errors of already-loaded data (empty when valid)."""
+    return get_validator(schema_file).errors(data)
+
+
+def validate_file(path, schema_file=SCHEMA_FILE) -> tuple:
+    """Return (path, errors) for one JSON file; unreadable JSON is reported as a `$` error."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        return str(path), [f"$: invalid JSON: {e}"]
+    return str(path), validate_data(data, schema_file)
+
+
+def validate_files(paths, workers: int = None, schema_file=SCHEMA_FILE) -> dict:
+    """
+    Validate many files, in a process pool when there are enough of them.
+    Returns {path: errors} for the invalid files only.
+    """
+    paths = [str(p) for p in paths]
+    if len(paths) < PARALLEL_MIN_FILES or workers == 1:
+        results = [validate_file(p, schema_file) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_file, paths, [schema_file] * len(paths), chunksize=32))
+    return {path: errors for path, errors in results if errors}
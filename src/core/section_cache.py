@@ -0,0 +1,160 @@
+"""
+Section-level flowable cache for create_cv_pdf.
+
+Tailored CVs share most sections (header, skills, experience blocks,
+education, languages). Each section's flowables are cached under a hash of
+its input and the theme. Flowables cannot be reused once a document was built
+from them, so both tiers hold pickled, never-built flowables and every hit
+unpickles a fresh copy, which skips Paragraph markup parsing.
+Tier 1 is an in-process LRU, tier 2 is one file per section under cache_dir.
+The disk tier is capped at max_disk_bytes: a hit refreshes the file's mtime,
+and a write that takes the tier over the cap deletes the least recently
+used files.
+"""
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+# Bump when the section builders change their output.
+SECTION_CACHE_VERSION = "2"
+# Disk tier cap (a section is a few KB) and the fraction of it a prune goes down to.
+MAX_DISK_BYTES = 64 * 1024 * 1024
+PRUNE_TO = 0.8
+
+
+def section_key(section: str, section_input, theme: dict) -> str:
+    """Hash a section's input together with the theme it is rendered with."""
+    payload = json.dumps([SECTION_CACHE_VERSION, section, section_input, theme],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SectionCache:
+    """Two-tier (memory + optional disk) cache of pickled section flowables."""
+
+    def __init__(self, cache_dir=None, max_entries: int = 512, max_disk_bytes: int = MAX_DISK_BYTES):
+        self.cache_dir = Path(cache_dir) / "sections" if cache_dir else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        # Running estimate of the disk tier's size, scanned on the first write.
+        self._disk_bytes = None
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        self._memory[key] = blob
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str):
+        blob = self._memory.get(key)
+        if blob is not None:
+            self._memory.move_to_end(key)
+            return blob
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                blob = path.read_bytes()
+                os.utime(path)  # mtime = last use, for prune
+            except OSError:
+                return None
+            self.disk_hits += 1
+            self._remember(key, blob)
+        return blob
+
+    def _store(self, key: str, blob: bytes) -> None:
+        self._remember(key, blob)
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(blob)
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # The disk tier is best effort.
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        else:
+            self._disk_bytes += len(blob)
+        if self._disk_bytes > self.max_disk_bytes:
+            self.prune()
+
+    def _disk_entries(self) -> list:
+        """[(mtime_ns, size, path)] of every file in the disk tier."""
+        entries = []
+        try:
+            for bucket in os.scandir(self.cache_dir):
+                if bucket.is_dir():
+                    for entry in os.scandir(bucket.path):
+                        st = entry.stat()
+                        entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        except OSError:
+            pass  # Another process pruned concurrently; the next write rescans.
+        return entries
+
+    def prune(self) -> int:
+        """Delete least recently used disk entries down to PRUNE_TO of the cap; return the bytes freed."""
+        if not self.cache_dir:
+            return 0
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * PRUNE_TO
+        freed = 0
+        for _, size, path in entries:
+            if total - freed <= target:
+                break
+            try:
+                os.unlink(path)
+                freed += size
+            except OSError:
+                pass
+        self._disk_bytes = total - freed
+        return freed
+
+    def get_or_build(self, section: str, section_input, theme: dict, builder) -> list:
+        """Return fresh flowables for a section, building them only on a miss."""
+        key = section_key(section, section_input, theme)
+        blob = self._load(key)
+        if blob is not None:
+            try:
+                flowables = pickle.loads(blob)
+                self.hits += 1
+                return flowables
+            except Exception:
+                pass  # Stale or corrupt entry: rebuild below.
+        flowables = builder()
+        self.misses += 1
+        try:
+            self._store(key, pickle.dumps(flowables, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass  # Unpicklable flowables are simply not cached.
+        return flowables
+
+    def counts(self) -> tuple:
+        """Return (hits, disk_hits, misses) so callers can diff before/after a run."""
+        return self.hits, self.disk_hits, self.misses
+
+
+def format_ratio(hits: int, disk_hits: int, misses: int) -> str:
+    """Human-readable hit/miss summary."""
+    total = hits + misses
+    ratio = hits / total * 100 if total else 0.0
+    return f"🧩 Section cache: {hits} hits ({disk_hits} from disk) / {misses} misses ({ratio:.0f}% hit rate)"
+
+
+@lru_cache(maxsize=4)
+def get_section_cache(cache_dir: str = None) -> SectionCache:
+    """One section cache per process (and cache_dir)."""
+    return SectionCache(cache_dir)
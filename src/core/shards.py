@@ -0,0 +1,234 @@
+"""
+Optional year/month sharding of the application store (config `store_shards`).
+
+Each shard is an ordinary store next to store_file, named after its period
+(applications_2026_10.xlsx), with its own journal, lock and sidecar, so
+everything in core/store.py works on it unchanged. A small manifest
+(<stem>.shards.json) lists the shards with their row counts. Appends go
+only to the shard of each row's applyDateTime (rows without one go to the
+current period); check and stats fan out to the shards overlapping their
+date window in a thread pool (SQLite releases the GIL) and merge.
+Rows already in store_file when sharding is turned on stay visible (it is
+read alongside the shards) until they are migrated into their shards, by
+`compact --shard` or automatically before the next append.
+
+Without sharding every function here falls back to the single store_file.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+from core import journal, profile, store
+from core.config import get_store_shards
+
+PERIOD_FORMATS = {"year": "%Y", "month": "%Y_%m"}
+MAX_FAN_OUT = 8
+
+
+def manifest_path(store_file: Path) -> Path:
+    store_file = Path(store_file)
+    return store_file.with_name(f"{store_file.stem}.shards.json")
+
+
+def load_manifest(store_file: Path) -> dict:
+    """Return {"mode", "shards": {period: {"file", "rows"}}}; empty when there are no shards yet."""
+    try:
+        with open(manifest_path(store_file), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    manifest.setdefault("mode", None)
+    manifest.setdefault("shards", {})
+    return manifest
+
+
+def save_manifest(store_file: Path, manifest: dict) -> None:
+    """Atomically write the shard manifest. Caller must hold the lock of store_file."""
+    path = manifest_path(store_file)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def period_of(apply_datetime, mode: str) -> str:
+    """Shard period of an applyDateTime cell (the current period when it cannot be parsed)."""
+    when = store.parse_apply_datetime(apply_datetime) or datetime.now()
+    return when.strftime(PERIOD_FORMATS[mode])
+
+
+def period_bounds(period: str, mode: str) -> tuple:
+    """First and last day of a period."""
+    if mode == "year":
+        year = int(period)
+        return date(year, 1, 1), date(year, 12, 31)
+    year, month = (int(p) for p in period.split("_"))
+    following = date(year + month // 12, month % 12 + 1, 1)
+    return date(year, month, 1), date.fromordinal(following.toordinal() - 1)
+
+
+def shard_path(store_file: Path, period: str) -> Path:
+    store_file = Path(store_file)
+    return store_file.with_name(f"{store_file.stem}_{period}{store_file.suffix}")
+
+
+def store_files(store_file: Path, since=None, until=None) -> list:
+    """
+    The store files a query over [since, until] has to read: the shards whose
+    period overlaps it, oldest first, or just store_file without sharding.
+    An unsplit store_file (or journal) left from before sharding comes first.
+    """
+    mode = get_store_shards()
+    if not mode:
+        return [Path(store_file)]
+    manifest = load_manifest(store_file)
+    found = [Path(store_file)] if store.exists(store_file) else []
+    for period, entry in sorted(manifest["shards"].items()):
+        first, last = period_bounds(period, manifest["mode"] or mode)
+        if (since and last < since) or (until and first > until):
+            continue
+        found.append(Path(store_file).with_name(entry["file"]))
+    return found
+
+
+def shard_label(store_file: Path, path: Path) -> str:
+    """The period of a shard file ("" for the unsharded store_file itself)."""
+    store_file, path = Path(store_file), Path(path)
+    if path == store_file:
+        return ""
+    return path.stem[len(store_file.stem) + 1:]
+
+
+def pre_shard_path(store_file: Path) -> Path:
+    """Where migrate sets the unsplit workbook aside (<stem>.pre-shard.xlsx, numbered if taken)."""
+    store_file = Path(store_file)
+    path = store_file.with_name(f"{store_file.stem}.pre-shard{store_file.suffix}")
+    n = 1
+    while path.exists():
+        n += 1
+        path = store_file.with_name(f"{store_file.stem}.pre-shard-{n}{store_file.suffix}")
+    return path
+
+
+def _reorder(values, headers: list, target: list) -> list:
+    """values of a row in headers order, rearranged by name into target order."""
+    if list(headers) == list(target):
+        return list(values)
+    pos = {h: i for i, h in enumerate(headers)}
+    return [values[pos[h]] if h in pos and pos[h] < len(values) else None for h in target]
+
+
+def migrate(store_file: Path, mode: str, manifest: dict) -> tuple:
+    """
+    Move the rows of an unsplit store_file (first sheet plus journal) into the
+    shards of their period: a new shard is written as a workbook, rows for an
+    existing shard are journaled to it. The workbook is set aside (see
+    pre_shard_path) and other sheets stay there. Updates manifest; the caller
+    saves it and must hold the lock of store_file.
+    Returns ({period: rows moved}, path the workbook was set aside as or None).
+    """
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.utils import get_column_letter
+
+    store_file = Path(store_file)
+    journaled = journal.read(store_file)
+    headers = list(store.EXCEL_HEADERS)
+    by_period = {}
+    source = load_workbook(store_file, read_only=True) if store_file.exists() else None
+    try:
+        if source:
+            rows = source.worksheets[0].iter_rows(values_only=True)
+            headers = list(next(rows, None) or headers)
+            date_pos = headers.index("applyDateTime") if "applyDateTime" in headers else None
+            with profile.stage("split rows"):
+                for values in rows:
+                    if any(v is not None for v in values):
+                        when = values[date_pos] if date_pos is not None and date_pos < len(values) else None
+                        by_period.setdefault(period_of(when, mode), []).append(list(values))
+    finally:
+        if source:
+            source.close()
+    date_pos = store.EXCEL_HEADERS.index("applyDateTime")
+    for row in journaled:
+        by_period.setdefault(period_of(row[date_pos], mode), []).append(
+            _reorder(row, store.EXCEL_HEADERS, headers))
+
+    moved = {}
+    for period, period_rows in sorted(by_period.items()):
+        path = shard_path(store_file, period)
+        entry = manifest["shards"].setdefault(period, {"file": path.name, "rows": 0})
+        if store.exists(path):
+            store.append_rows(path, [_reorder(v, headers, store.EXCEL_HEADERS) for v in period_rows])
+        else:
+            out = Workbook(write_only=True)
+            ws = out.create_sheet(title="Applications")
+            widths = store.measure_widths([headers], {})
+            store.measure_widths(period_rows, widths)
+            for col_idx, max_len in widths.items():
+                ws.column_dimensions[get_column_letter(col_idx)].width = store.column_width(max_len)
+            ws.append(headers)
+            for values in period_rows:
+                ws.append(values)
+            with profile.stage("wb.save"):
+                out.save(path)
+        entry["rows"] += len(period_rows)
+        moved[period] = len(period_rows)
+
+    backup = None
+    if store_file.exists():
+        backup = pre_shard_path(store_file)
+        os.replace(store_file, backup)
+    journal.clear(store_file)
+    store.sidecar_path(store_file).unlink(missing_ok=True)
+    return moved, backup
+
+
+def append_rows(store_file: Path, rows: list) -> list:
+    """
+    Log rows (EXCEL_HEADERS order) to the shard of their applyDateTime, or to
+    store_file without sharding. Rows still in an unsplit store_file are
+    migrated into their shards first. Returns the store files that received rows.
+    """
+    mode = get_store_shards()
+    if not rows:
+        return []
+    if not mode:
+        store.append_rows(store_file, rows)
+        return [Path(store_file)]
+
+    date_pos = store.EXCEL_HEADERS.index("applyDateTime")
+    by_period = {}
+    for row in rows:
+        by_period.setdefault(period_of(row[date_pos] if len(row) > date_pos else None, mode), []).append(row)
+
+    touched = []
+    # The store_file lock guards the manifest; each shard append takes its own lock.
+    with journal.locked(store_file):
+        manifest = load_manifest(store_file)
+        if manifest["shards"] and manifest["mode"] != mode:
+            raise ValueError(f"❌ The store is sharded by {manifest['mode']}, but store_shards is {mode}.")
+        manifest["mode"] = mode
+        if store.exists(store_file):
+            touched.extend(shard_path(store_file, period) for period in migrate(store_file, mode, manifest)[0])
+        for period, period_rows in sorted(by_period.items()):
+            path = shard_path(store_file, period)
+            store.append_rows(path, period_rows)
+            entry = manifest["shards"].setdefault(period, {"file": path.name, "rows": 0})
+            entry["rows"] += len(period_rows)
+            touched.append(path)
+        save_manifest(store_file, manifest)
+    return list(dict.fromkeys(touched))
+
+
+def fan_out(fn, paths: list) -> list:
+    """Call fn(path) for every store file in a thread pool; results in the order of paths."""
+    if len(paths) <= 1:
+        return [fn(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(MAX_FAN_OUT, len(paths))) as pool:
+        return list(pool.map(fn, paths))
+
+
+def any_exists(paths: list) -> bool:
+    return any(store.exists(p) for p in paths)
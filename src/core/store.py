@@ -0,0 +1,667 @@
+"""
+Typed SQLite sidecar cache of the Excel store_file.
+
+The workbook stays the source of truth. Read-only commands (stats, check)
+load the sidecar instead of parsing the xlsx; the sidecar is rebuilt whenever
+the workbook's mtime or size no longer matches the signature it was built from
+(e.g. after the xlsx was edited by hand), and generate keeps it current by
+recording the rows it appends to the journal (core/journal.py). The sidecar
+covers the workbook plus any journaled rows not yet compacted into it.
+
+Every cell is also indexed by its trigrams (one posting list of row ids per
+trigram) so `check --search` can find substring and typo-tolerant matches
+without scanning all rows.
+"""
+import contextlib
+import hashlib
+import heapq
+import json
+import math
+from array import array
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from core import journal, profile
+
+EXCEL_HEADERS = [
+    "Dir", "role", "company", "location",
+    "jobType", "salary", "link", "address",
+    "status", "applyDateTime"
+]
+# Format written by generate.format_apply_datetime.
+APPLY_DATETIME_FORMAT = "%a %b %d %Y %H:%M"
+NORMALIZED_COLUMNS = ["company", "role", "location", "status"]
+_MONTHS = {m: i for i, m in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], start=1)}
+CACHE_VERSION = "8"
+
+# Column names in the sidecar; header names are quoted because of mixed case.
+_ROW_COLUMNS = (
+    ["sheet_idx", "row_no"]
+    + EXCEL_HEADERS
+    + ["applied_at"]
+    + [f"{c}_norm" for c in NORMALIZED_COLUMNS]
+    + ["text"]
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sheets (idx INTEGER PRIMARY KEY, title TEXT, headers TEXT, last_row INTEGER,
+                                   widths TEXT);
+CREATE TABLE IF NOT EXISTS rows (
+    id INTEGER PRIMARY KEY,
+    sheet_idx INTEGER NOT NULL,
+    row_no INTEGER NOT NULL,
+    {", ".join(f'"{h}" TEXT' for h in EXCEL_HEADERS)},
+    applied_at TEXT,
+    {", ".join(f"{c}_norm TEXT" for c in NORMALIZED_COLUMNS)},
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_applied_at ON rows (applied_at);
+CREATE TABLE IF NOT EXISTS grams (gram TEXT PRIMARY KEY, postings BLOB NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    sheet_idx INTEGER NOT NULL, day TEXT NOT NULL, dim TEXT NOT NULL, key TEXT NOT NULL,
+    label TEXT, count INTEGER NOT NULL, PRIMARY KEY (sheet_idx, day, dim, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dupe_keys (
+    key BLOB NOT NULL, origin TEXT NOT NULL, label TEXT, PRIMARY KEY (key, origin)
+) WITHOUT ROWID;
+"""
+SEARCH_COLUMNS = ["Dir", "company", "role", "applyDateTime", "status"]
+# Columns pre-aggregated per day in the rollups table (plus dim "total").
+ROLLUP_DIMENSIONS = ["location", "company", "status", "jobType"]
+_ROLLUP_POS = {dim: 2 + EXCEL_HEADERS.index(dim) for dim in ROLLUP_DIMENSIONS}
+_APPLIED_POS = 2 + len(EXCEL_HEADERS)
+# Positions of the duplicate-key inputs in a _build_row tuple.
+_DIR_POS, _COMPANY_POS, _ROLE_POS, _LINK_POS = (2 + EXCEL_HEADERS.index(h) for h in ("Dir", "company", "role", "link"))
+
+
+# =========================
+# NORMALIZATION
+# =========================
+def normalize(value) -> str:
+    """Casefold and collapse whitespace for comparisons."""
+    if value is None:
+        return ""
+    return " ".join(str(value).split()).casefold()
+
+
+def normalize_link(link) -> str:
+    """Normalize a posting URL: no scheme, www., fragment, utm_* parameters or trailing slash."""
+    from urllib.parse import parse_qsl, urlencode, urlsplit
+
+    text = normalize(link)
+    if not text:
+        return ""
+    parts = urlsplit(text if "//" in text else f"//{text}")
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.startswith("utm_")])
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+
+def application_keys(company, role, link=None) -> list:
+    """
+    Hashed duplicate-detection keys of an application: normalized company+role
+    and, when there is one, the normalized posting link.
+    """
+    keys = []
+    company, role, link = normalize(company), normalize(role), normalize_link(link)
+    if company and role:
+        keys.append(hashlib.blake2b(f"cr\x1f{company}\x1f{role}".encode(), digest_size=12).digest())
+    if link:
+        keys.append(hashlib.blake2b(f"link\x1f{link}".encode(), digest_size=12).digest())
+    return keys
+
+
+def parse_apply_datetime(value):
+    """
+    Parse an applyDateTime cell using the explicit format generate writes,
+    falling back to ISO-8601. Returns a naive datetime or None.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    text = str(value).strip()
+    parts = text.split()
+    if len(parts) == 5 and parts[1] in _MONTHS:
+        # Fast path for APPLY_DATETIME_FORMAT, strptime is slow on large stores.
+        try:
+            hour, minute = parts[4].split(":")
+            return datetime(int(parts[3]), _MONTHS[parts[1]], int(parts[2]), int(hour), int(minute))
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(text, APPLY_DATETIME_FORMAT)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def trigrams(text: str, pad: bool = True) -> set:
+    """Return the set of character trigrams of normalized text (padded with spaces by default)."""
+    text = normalize(text)
+    if pad or len(text) < 3:
+        text = f" {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Cell values repeat a lot across rows (status, location, company), so the
+# per-cell work of a rebuild is memoized.
+_normalize_cell = lru_cache(maxsize=1 << 16)(normalize)
+_cell_grams = lru_cache(maxsize=1 << 16)(lambda cell: frozenset(trigrams(cell)))
+
+
+def _row_grams(text: str) -> set:
+    """Trigrams of every cell of a row's search text."""
+    grams = set()
+    for cell in text.split("\x1f"):
+        if cell:
+            grams |= _cell_grams(cell)
+    return grams
+
+
+def similarity(term: str, cell: str, floor: float = 0.0, matcher: SequenceMatcher = None) -> float:
+    """
+    Best fuzzy similarity between a normalized term and any run of words of a
+    normalized cell with the same number of words (1.0 for a substring).
+    Windows whose cheap upper bounds cannot beat `floor` are not fully compared.
+    Pass a matcher whose seq2 is already term to reuse it across cells.
+    """
+    if term in cell:
+        return 1.0
+    words = cell.split()
+    width = len(term.split())
+    best = 0.0
+    if matcher is None:
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(term)  # seq2 is the side SequenceMatcher caches
+    for i in range(max(1, len(words) - width + 1)):
+        matcher.set_seq1(" ".join(words[i:i + width]))
+        bar = max(best, floor)
+        if matcher.real_quick_ratio() > bar and matcher.quick_ratio() > bar:
+            best = max(best, matcher.ratio())
+    return best
+
+
+def _cell_text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _build_row(sheet_idx: int, row_no: int, headers: list, values) -> tuple:
+    """Map a worksheet row onto the sidecar columns."""
+    values = list(values)
+    by_header = {}
+    for pos, header in enumerate(headers):
+        if header in EXCEL_HEADERS and pos < len(values) and values[pos] is not None:
+            by_header[header] = _cell_text(values[pos])
+    applied_at = parse_apply_datetime(by_header.get("applyDateTime"))
+    return (
+        sheet_idx, row_no,
+        *(by_header.get(h) for h in EXCEL_HEADERS),
+        applied_at.isoformat(timespec="minutes") if applied_at else None,
+        *(_normalize_cell(by_header.get(c)) for c in NORMALIZED_COLUMNS),
+        # Normalized cells, kept apart so a search term never spans two cells.
+        "\x1f".join(_normalize_cell(v) for v in values if v is not None),
+    )
+
+
+def column_width(max_len: int) -> int:
+    """Excel column width for the longest value in a column (applied by compact and shards)."""
+    return min(max(12, max_len + 2), 60)
+
+
+def measure_widths(rows, widths: dict) -> dict:
+    """Grow widths ({1-based column: longest value length}) with the values of rows."""
+    for values in rows:
+        for col_idx, value in enumerate(values, start=1):
+            if value is not None:
+                length = len(str(value))
+                if length > widths.get(col_idx, 0):
+                    widths[col_idx] = length
+    return widths
+
+
+# =========================
+# SIDECAR
+# =========================
+def sidecar_path(excel_path: Path) -> Path:
+    """Return the sidecar cache path stored next to the workbook."""
+    excel_path = Path(excel_path)
+    return excel_path.with_name(f"{excel_path.stem}.jobuine.sqlite")
+
+
+def workbook_signature(excel_path: Path):
+    """Return 'mtime_ns:size' of the workbook, or None if it does not exist."""
+    try:
+        st = os.stat(excel_path)
+    except FileNotFoundError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def store_signature(excel_path: Path) -> str:
+    """Signature of the workbook together with its journal."""
+    return f"{workbook_signature(excel_path)}|{workbook_signature(journal.journal_path(excel_path))}"
+
+
+def exists(excel_path: Path) -> bool:
+    """True if the store has a workbook or journaled rows."""
+    return Path(excel_path).exists() or journal.journal_path(excel_path).exists()
+
+
+def connect(excel_path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the sidecar of excel_path."""
+    conn = sqlite3.connect(sidecar_path(excel_path))
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    if _get_meta(conn, "version") != CACHE_VERSION:
+        # Layout changed: drop everything, the next read rebuilds from the workbook.
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        with conn:
+            for table in tables:
+                conn.execute(f'DROP TABLE "{table}"')
+    conn.executescript(_SCHEMA)
+    if _get_meta(conn, "version") is None:
+        with conn:
+            _set_meta(conn, "version", CACHE_VERSION)
+    return conn
+
+
+def _get_meta(conn: sqlite3.Connection, key: str):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def _index_rows(conn: sqlite3.Connection, id_texts, fresh: bool = False) -> None:
+    """Add (row id, search text) pairs to the trigram posting lists."""
+    postings = defaultdict(list)
+    for row_id, text in id_texts:
+        for gram in _row_grams(text):
+            postings[gram].append(row_id)
+    if not fresh:
+        for gram, ids in postings.items():
+            row = conn.execute("SELECT postings FROM grams WHERE gram = ?", (gram,)).fetchone()
+            if row:
+                existing = array("q")
+                existing.frombytes(row[0])
+                ids[:0] = existing
+    conn.executemany("INSERT OR REPLACE INTO grams (gram, postings) VALUES (?, ?)",
+                     ((gram, array("q", ids).tobytes()) for gram, ids in postings.items()))
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: list, index: bool = True) -> None:
+    """Insert sidecar rows and (unless a rebuild indexes everything at the end) their trigrams."""
+    columns = ", ".join(["id"] + [f'"{c}"' for c in _ROW_COLUMNS])
+    marks = ", ".join("?" for _ in range(len(_ROW_COLUMNS) + 1))
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM rows").fetchone()[0]
+    conn.executemany(f"INSERT INTO rows ({columns}) VALUES ({marks})",
+                     ((next_id + i, *row) for i, row in enumerate(rows)))
+    conn.executemany("INSERT OR IGNORE INTO dupe_keys (key, origin, label) VALUES (?, 'store', ?)",
+                     ((key, f"{row[_DIR_POS] or 'store'} (row {row[1]})")
+                      for row in rows
+                      for key in application_keys(row[_COMPANY_POS], row[_ROLE_POS], row[_LINK_POS])))
+    _rollup_rows(conn, rows)
+    if index:
+        _index_rows(conn, ((next_id + i, row[-1]) for i, row in enumerate(rows)))
+
+
+def _rollup_rows(conn: sqlite3.Connection, rows: list) -> None:
+    """
+    Add rows to the daily rollups: one count per (sheet, day, dimension,
+    normalized value), labelled with the first spelling seen. Rows without a
+    parsable applyDateTime are not counted (stats drops them too).
+    """
+    counts, labels = Counter(), {}
+    for row in rows:
+        applied_at = row[_APPLIED_POS]
+        if not applied_at:
+            continue
+        day = applied_at[:10]
+        counts[(row[0], day, "total", "")] += 1
+        for dim, pos in _ROLLUP_POS.items():
+            value = row[pos] or ""
+            key = (row[0], day, dim, _normalize_cell(value))
+            counts[key] += 1
+            labels.setdefault(key, value)
+    conn.executemany(
+        "INSERT INTO rollups (sheet_idx, day, dim, key, label, count) VALUES (?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (sheet_idx, day, dim, key) DO UPDATE SET count = count + excluded.count",
+        ((*key, labels.get(key, ""), n) for key, n in counts.items()),
+    )
+
+
+def _read_workbook(conn: sqlite3.Connection, excel_path: Path) -> int:
+    """Load every sheet of the workbook into the (emptied) sidecar tables."""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    count = 0
+    try:
+        for sheet_idx, sheet in enumerate(workbook.worksheets):
+            rows = sheet.iter_rows(values_only=True)
+            header_row = next(rows, None) or ()
+            headers = [_cell_text(h) for h in header_row]
+            widths = measure_widths([header_row], {})
+            last_row = 1 if header_row else 0
+            batch = []
+            for row_no, values in enumerate(rows, start=2):
+                last_row = row_no
+                if any(v is not None for v in values):
+                    batch.append(_build_row(sheet_idx, row_no, headers, values))
+                    measure_widths((values,), widths)
+            conn.execute("INSERT INTO sheets (idx, title, headers, last_row, widths) VALUES (?, ?, ?, ?, ?)",
+                         (sheet_idx, sheet.title, json.dumps(headers), last_row, json.dumps(widths)))
+            _insert_rows(conn, batch, index=False)
+            count += len(batch)
+    finally:
+        workbook.close()
+    return count
+
+
+def _insert_journal_rows(conn: sqlite3.Connection, rows: list, index: bool = True) -> int:
+    """Add journaled rows to the first sheet, numbered where compaction will put them."""
+    if not rows:
+        return 0
+    sheet = conn.execute("SELECT headers, last_row, widths FROM sheets WHERE idx = 0").fetchone()
+    if sheet is None:
+        # No workbook yet: compaction creates it with EXCEL_HEADERS.
+        sheet = (json.dumps(EXCEL_HEADERS), 1, json.dumps(measure_widths([EXCEL_HEADERS], {})))
+        conn.execute("INSERT INTO sheets (idx, title, headers, last_row, widths) VALUES (0, ?, ?, ?, ?)",
+                     ("Applications", *sheet))
+    headers, last_row = json.loads(sheet[0]), sheet[1]
+    # JSON object keys are strings.
+    widths = {int(k): v for k, v in json.loads(sheet[2] or "{}").items()}
+    _insert_rows(conn, [
+        _build_row(0, last_row + offset, headers, row)
+        for offset, row in enumerate(rows, start=1)
+    ], index)
+    conn.execute("UPDATE sheets SET last_row = ?, widths = ? WHERE idx = 0",
+                 (last_row + len(rows), json.dumps(measure_widths(rows, widths))))
+    return len(rows)
+
+
+def rebuild(conn: sqlite3.Connection, excel_path: Path, lock: bool = True) -> int:
+    """
+    Re-read the workbook and its journal into the sidecar. Returns the row count.
+    Pass lock=False when the caller already holds `journal.locked`.
+    """
+    with journal.locked(excel_path) if lock else contextlib.nullcontext():
+        signature = store_signature(excel_path)
+        with conn:
+            conn.execute("DELETE FROM sheets")
+            conn.execute("DELETE FROM rows")
+            conn.execute("DELETE FROM grams")
+            conn.execute("DELETE FROM rollups")
+            conn.execute("DELETE FROM dupe_keys WHERE origin = 'store'")
+            with profile.stage("sidecar: read workbook"):
+                count = _read_workbook(conn, excel_path) if Path(excel_path).exists() else 0
+            with profile.stage("sidecar: read journal"):
+                count += _insert_journal_rows(conn, journal.read(excel_path), index=False)
+            with profile.stage("sidecar: trigram index"):
+                _index_rows(conn, conn.execute("SELECT id, text FROM rows").fetchall(), fresh=True)
+            _set_meta(conn, "signature", signature)
+    return count
+
+
+def open_cache(excel_path: Path, stale_ok: bool = False, rebuild_now: bool = False) -> sqlite3.Connection:
+    """
+    Return a sidecar connection that is guaranteed to match the store on disk.
+    With stale_ok, a sidecar built from an older workbook is used as-is; only a
+    missing one is built (for lookups that must not load the xlsx every time).
+    With rebuild_now, the sidecar is rebuilt from the workbook even when current
+    (once: a stale sidecar is not rebuilt twice).
+    """
+    conn = connect(excel_path)
+    signature = _get_meta(conn, "signature")
+    if rebuild_now or signature is None or (not stale_ok and signature != store_signature(excel_path)):
+        with profile.stage("sidecar rebuild"):
+            rebuild(conn, excel_path)
+    return conn
+
+
+def append_rows(excel_path: Path, rows: list) -> None:
+    """
+    Durably log new rows: append them to the journal under the store lock and
+    add them to the sidecar in place when it was current. A stale sidecar is
+    left alone and rebuilt on the next read.
+    """
+    if not rows:
+        return
+    with journal.locked(excel_path):
+        signature_before = store_signature(excel_path)
+        journal.append(excel_path, rows)
+        if not sidecar_path(excel_path).exists():
+            return
+        conn = connect(excel_path)
+        try:
+            if _get_meta(conn, "signature") == signature_before:
+                with conn:
+                    _insert_journal_rows(conn, rows)
+                    _set_meta(conn, "signature", store_signature(excel_path))
+        finally:
+            conn.close()
+
+
+def column_widths(excel_path: Path, sheet_idx: int = 0) -> dict:
+    """
+    Longest value length per column ({1-based column: length}) of a sheet,
+    journaled rows included, as tracked by the sidecar. Only a stale sidecar
+    costs a rebuild; otherwise nothing is rescanned. Caller must hold `journal.locked`.
+    """
+    conn = connect(excel_path)
+    try:
+        if _get_meta(conn, "signature") != store_signature(excel_path):
+            with profile.stage("sidecar rebuild"):
+                rebuild(conn, excel_path, lock=False)
+        row = conn.execute("SELECT widths FROM sheets WHERE idx = ?", (sheet_idx,)).fetchone()
+    finally:
+        conn.close()
+    return {int(k): v for k, v in json.loads(row[0] or "{}").items()} if row else {}
+
+
+def mark_compacted(excel_path: Path, signature_before: str) -> None:
+    """
+    After the journal was folded into the workbook the logical content is
+    unchanged, so a sidecar that matched before compaction stays valid.
+    Caller must hold `journal.locked`.
+    """
+    if not sidecar_path(excel_path).exists():
+        return
+    conn = connect(excel_path)
+    try:
+        if _get_meta(conn, "signature") == signature_before:
+            with conn:
+                _set_meta(conn, "signature", store_signature(excel_path))
+    finally:
+        conn.close()
+
+
+# =========================
+# QUERIES
+# =========================
+def sheet_headers(conn: sqlite3.Connection, sheet_idx: int = 0) -> list:
+    """Return the header row of a sheet as stored in the sidecar."""
+    row = conn.execute("SELECT headers FROM sheets WHERE idx = ?", (sheet_idx,)).fetchone()
+    return json.loads(row[0]) if row else []
+
+
+# Upper bound on candidate rows fuzzy-scored per search.
+MAX_SCORED = 2000
+# Candidate rows proposing similar cells for a term without exact matches (search_terms).
+FUZZY_CANDIDATES = 200
+
+
+def _needed_grams(grams, min_score: float) -> int:
+    """Trigrams a row must share with a term to be scored at all."""
+    # A single typo (or transposition) breaks up to four trigrams, so pre-filter loosely.
+    return max(1, math.ceil(min_score * len(grams)) - 4)
+
+
+def _candidates(conn: sqlite3.Connection, term: str, min_score: float, cap: int) -> list:
+    """Ids of the rows sharing enough trigrams with term, at most `cap` of those sharing the most."""
+    grams = sorted(trigrams(term, pad=False))
+    needed = _needed_grams(grams, min_score)
+    marks = ", ".join("?" for _ in grams)
+    shared = Counter()
+    for (blob,) in conn.execute(f"SELECT postings FROM grams WHERE gram IN ({marks})", grams):
+        ids = array("q")
+        ids.frombytes(blob)
+        shared.update(ids)
+    candidates = [row_id for row_id, count in shared.items() if count >= needed]
+    if len(candidates) > cap:
+        # Most shared trigrams first, newest row first among ties.
+        candidates = heapq.nlargest(cap, candidates, key=lambda row_id: (shared[row_id] << 40) | row_id)
+    return candidates
+
+
+def _cell_scorer(term: str, min_score: float):
+    """similarity(term, cell) memoized per cell: values repeat across rows (company, location, status)."""
+    scores = {}
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2(term)
+
+    def cell_score(cell: str) -> float:
+        score = scores.get(cell)
+        if score is None:
+            score = scores[cell] = similarity(term, cell, min_score, matcher)
+        return score
+    return cell_score
+
+
+def search(conn: sqlite3.Connection, search_string: str, limit: int = 20,
+           min_score: float = 0.75) -> list:
+    """
+    Find rows matching search_string through the trigram index.
+
+    Candidate rows are those sharing enough trigrams with the term; only the
+    ones sharing the most (at most MAX_SCORED) are scored, 1.0 when a cell
+    contains the term as a substring, otherwise by its best fuzzy `similarity`
+    (typo tolerance). Returns up to `limit` hits
+    with score >= min_score as dicts of SEARCH_COLUMNS plus sheet, row_no and
+    score, best first.
+    """
+    term = normalize(search_string)
+    if not term:
+        return []
+    candidates = _candidates(conn, term, min_score, max(MAX_SCORED, limit))
+    if not candidates:
+        return []
+    cell_score = _cell_scorer(term, min_score)
+
+    columns = ", ".join(f'"{c}"' for c in SEARCH_COLUMNS)
+    hits = []
+    # Stay well below SQLite's bound-parameter limit.
+    for start in range(0, len(candidates), 500):
+        chunk = candidates[start:start + 500]
+        rows = conn.execute(
+            f"SELECT id, sheet_idx, row_no, text, applied_at, {columns} FROM rows "
+            f"WHERE id IN ({', '.join('?' for _ in chunk)})", chunk,
+        ).fetchall()
+        for row_id, sheet_idx, row_no, text, applied_at, *values in rows:
+            score = 1.0 if term in text else max(cell_score(c) for c in text.split("\x1f"))
+            if score >= min_score:
+                hit = dict(zip(SEARCH_COLUMNS, values))
+                hit.update(sheet=sheet_idx, row_no=row_no, score=round(score, 3),
+                           applied_at=applied_at or "")
+                hits.append(hit)
+    # Best score first, most recent application first among equal scores.
+    hits.sort(key=lambda h: h["applied_at"], reverse=True)
+    hits.sort(key=lambda h: h["score"], reverse=True)
+    return hits[:limit]
+
+
+def search_terms(conn: sqlite3.Connection, terms: list, min_score: float = 0.75) -> dict:
+    """
+    Look up many terms in one pass over the stored rows.
+
+    Every normalized term goes into one Aho-Corasick automaton that scans each
+    distinct cell once (company, location and status values repeat a lot).
+    Terms without a substring match fall back to typo-tolerant matching when
+    min_score < 1: the trigram index proposes a few candidate rows, and every
+    row holding one of their similar-enough cells is reported. Returns
+    {term: {"rows": [(sheet, row_no), ...], "fuzzy": bool}} in the order of
+    terms, rows in sheet order.
+    """
+    from core.matcher import AhoCorasick
+
+    normalized = [normalize(t) for t in terms]
+    unique = list(dict.fromkeys(t for t in normalized if t))
+    matcher = AhoCorasick(unique)
+    found = [[] for _ in unique]
+    cell_matches = {}
+    cell_rows = defaultdict(list)
+    for sheet_idx, row_no, text in conn.execute("SELECT sheet_idx, row_no, text FROM rows ORDER BY id"):
+        row_terms = set()
+        for cell in text.split("\x1f"):
+            matches = cell_matches.get(cell)
+            if matches is None:
+                matches = cell_matches[cell] = matcher.find(cell)
+            row_terms |= matches
+            cell_rows[cell].append((sheet_idx, row_no))
+        for idx in row_terms:
+            found[idx].append((sheet_idx, row_no))
+
+    by_term = dict(zip(unique, found))
+    fuzzy = set()
+    for term in unique:
+        if by_term[term] or min_score >= 1.0:
+            continue
+        cell_score = _cell_scorer(term, min_score)
+        grams = trigrams(term, pad=False)
+        needed = _needed_grams(grams, min_score)
+        similar = set()
+        candidates = _candidates(conn, term, min_score, FUZZY_CANDIDATES)
+        for (text,) in conn.execute(f"SELECT text FROM rows WHERE id IN ({', '.join('?' for _ in candidates)})",
+                                    candidates):
+            # Only cells that share trigrams themselves (not just their row) are worth scoring.
+            similar.update(cell for cell in text.split("\x1f")
+                           if len(_cell_grams(cell) & grams) >= needed and cell_score(cell) >= min_score)
+        rows = set()
+        for cell in similar:
+            rows.update(cell_rows[cell])
+        if rows:
+            by_term[term] = sorted(rows)
+            fuzzy.add(term)
+    return {term: {"rows": by_term.get(norm, []), "fuzzy": norm in fuzzy}
+            for term, norm in zip(terms, normalized)}
+
+
+def load_rollups(excel_path: Path, dims: list, since=None, until=None, sheet_idx: int = 0):
+    """
+    Load the daily rollups of the given dimensions ("total" and/or
+    ROLLUP_DIMENSIONS) as a DataFrame of day (datetime64), dim, key, label and
+    count. since/until (dates, inclusive) select days; the work is proportional
+    to days × distinct values, not to rows.
+    """
+    import pandas as pd
+
+    where = ["sheet_idx = ?", f"dim IN ({', '.join('?' for _ in dims)})"]
+    params = [sheet_idx, *dims]
+    if since:
+        where.append("day >= ?")
+        params.append(since.isoformat())
+    if until:
+        where.append("day <= ?")
+        params.append(until.isoformat())
+
+    conn = open_cache(excel_path)
+    try:
+        with profile.stage("sidecar: load rollups"):
+            df = pd.read_sql_query(f"SELECT day, dim, key, label, count FROM rollups "
+                                   f"WHERE {' AND '.join(where)} ORDER BY day", conn, params=params)
+    finally:
+        conn.close()
+    df["day"] = pd.to_datetime(df["day"], format="%Y-%m-%d")
+    return df
@@ -5,7 +5,17 @@
 # 2. Read data from src/data/{prompt.txt, career.json, schema.json}.
 # 3. Replace placeholders and save prompt.txt in applies/YYYY_MM_DD/apl_<company_name>.
 # 4. Update config.yaml.
+#
+# Batch mode (`jobuine apply --from postings.jsonl|postings.csv`) streams
+# postings from a job-board export and does steps 2-3 for each of them with
+# the template compiled and career/schema serialized once; config.yaml is
+# updated once at the end.
+#
+# Both modes look the posting up in the duplicate index (core/dupes.py) first:
+# the interactive flow asks before creating a second directory for the same
+# company+role or link, batch mode skips duplicates unless --allow-duplicates.
 
+import csv
 import os
 import sys
 import yaml
@@ -13,26 +23,193 @@ import json
 from datetime import datetime
 from pathlib import Path
 
-def main():
-    # --- Setup paths ---
-    root_dir = Path(__file__).resolve().parents[2]  # project root
-    config_file = root_dir / "config.yaml"
-    data_dir = root_dir / "src" / "data"
-    prompt_file = data_dir / "prompt.txt"
-    career_file = data_dir / "career.json"
-    schema_file = data_dir / "schema.json"
+from core import manifest as mf
+from core import profile
+from core.applies import APPLY_DATE_FORMAT
+from core.config import config_path, get_store_file
+from core.dupes import DuplicateIndex
+from core.prompt import PromptTemplate
 
-    # --- Read config and applies_dir ---
-    if config_file.exists():
-        with open(config_file, "r") as f:
+ROOT_DIR = Path(__file__).resolve().parents[2]  # project root
+DATA_DIR = ROOT_DIR / "src" / "data"
+
+# Accepted column/key names of a posting, first match wins.
+POSTING_FIELDS = {
+    "company": ("company", "company_name", "companyName"),
+    "role": ("role", "title", "role_title", "position"),
+    "description": ("description", "job_description", "jobDescription", "text"),
+    "link": ("link", "url", "job_url", "apply_url"),
+}
+
+
+# =========================
+# SHARED STEPS
+# =========================
+def read_config() -> tuple:
+    """Return (config, applies_dir) from config.yaml, with the applies/ default."""
+    config = {}
+    path = config_path()
+    if path.exists():
+        with open(path, "r") as f:
             try:
                 config = yaml.safe_load(f) or {}
             except yaml.YAMLError:
                 config = {}
-        applies_dir = Path(config.get("applies_dir", root_dir / "applies"))
-    else:
-        applies_dir = root_dir / "applies"
-        config = {}
+    return config, Path(config.get("applies_dir", ROOT_DIR / "applies"))
+
+
+def load_prompt_inputs() -> tuple:
+    """Compile prompt.txt and serialize career.json / schema.json once."""
+    try:
+        with open(DATA_DIR / "prompt.txt", "r", encoding="utf-8") as f:
+            template = PromptTemplate(f.read())
+        with open(DATA_DIR / "career.json", "r", encoding="utf-8") as f:
+            career_json = json.dumps(json.load(f), indent=2, ensure_ascii=False)
+        with open(DATA_DIR / "schema.json", "r", encoding="utf-8") as f:
+            output_schema = json.dumps(json.load(f), indent=2, ensure_ascii=False)
+    except FileNotFoundError as e:
+        print(f"❌ Missing data file: {e.filename}")
+        sys.exit(1)
+    return template, {"career_json": career_json, "output_schema": output_schema}
+
+
+def apply_dir_for(applies_dir: Path, company_name: str, unique: bool = False) -> Path:
+    """applies/YYYY_MM_DD/apl_<company>, with a _2, _3... suffix if unique and taken."""
+    date_dir = applies_dir / datetime.now().strftime(APPLY_DATE_FORMAT)
+    final_dir = date_dir / f"apl_{company_name.replace(' ', '_')}"
+    if unique:
+        base, n = final_dir, 2
+        while final_dir.exists():
+            final_dir = base.with_name(f"{base.name}_{n}")
+            n += 1
+    return final_dir
+
+
+def write_apply_dir(final_dir: Path, template: PromptTemplate, shared: dict,
+                    company_name: str, role: str, job_description: str, link: str = "") -> Path:
+    """Create the apply directory with its filled prompt.txt and an empty cv_data.json."""
+    final_dir.mkdir(parents=True, exist_ok=True)
+    filled_prompt = template.render({
+        **shared,
+        # --- Add role at the beginning of the job description ---
+        "job_description": f"role : {role}\n\n{job_description}",
+        "date_and_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "company_name": company_name,
+    })
+    with open(final_dir / "prompt.txt", "w", encoding="utf-8") as f:
+        f.write(filled_prompt)
+    with open(final_dir / "cv_data.json", "w", encoding="utf-8") as f:
+        f.write("{}")
+    manifest = mf.load_manifest(final_dir)
+    mf.record_posting(manifest, company_name, role, link)
+    mf.save_manifest(final_dir, manifest)
+    return final_dir
+
+
+def update_config(config: dict, final_dir: Path) -> None:
+    config["current_apply_dir"] = str(final_dir)
+    path = config_path()
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    print(f"📝 Updated {path.name} → current_apply_dir: {final_dir}")
+
+
+def open_duplicate_index(applies_dir: Path):
+    """Return the DuplicateIndex of the store, or None (with a warning) if it is unavailable."""
+    try:
+        return DuplicateIndex(get_store_file(), applies_dir)
+    except Exception as e:
+        print(f"⚠️ Duplicate check unavailable: {e}")
+        return None
+
+
+# =========================
+# BATCH MODE
+# =========================
+def read_postings(postings_file: Path):
+    """Yield (line_no, posting dict) from a JSONL or CSV file, one at a time."""
+    with open(postings_file, "r", encoding="utf-8", newline="") as f:
+        if postings_file.suffix.lower() == ".csv":
+            # Line 1 is the CSV header.
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, row
+            return
+        for line_no, line in enumerate(f, start=1):
+            if line.strip():
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, e
+
+
+def posting_field(posting: dict, field: str) -> str:
+    for key in POSTING_FIELDS[field]:
+        value = posting.get(key)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return ""
+
+
+def batch_main(postings_file, allow_duplicates: bool = False) -> None:
+    postings_file = Path(postings_file).expanduser()
+    if not postings_file.exists():
+        print(f"❌ Postings file not found: {postings_file}")
+        sys.exit(1)
+
+    config, applies_dir = read_config()
+    template, shared = load_prompt_inputs()
+
+    dupes = open_duplicate_index(applies_dir)
+    created, skipped, duplicates, last_dir = 0, 0, 0, None
+    for line_no, posting in read_postings(postings_file):
+        if not isinstance(posting, dict):
+            print(f"⚠️ Line {line_no}: not a JSON object ({posting}), skipped.")
+            skipped += 1
+            continue
+        company_name = posting_field(posting, "company")
+        role = posting_field(posting, "role")
+        job_description = posting_field(posting, "description")
+        if not (company_name and role and job_description):
+            print(f"⚠️ Line {line_no}: company, role and description are required, skipped.")
+            skipped += 1
+            continue
+        link = posting_field(posting, "link")
+        if dupes and not allow_duplicates:
+            with profile.stage("duplicate check"):
+                existing = dupes.find(company_name, role, link)
+            if existing:
+                print(f"⚠️ Line {line_no}: {company_name} / {role} already applied ({', '.join(existing[:3])}), skipped.")
+                duplicates += 1
+                continue
+        with profile.stage("write apply dir"):
+            last_dir = write_apply_dir(apply_dir_for(applies_dir, company_name, unique=True),
+                                       template, shared, company_name, role, job_description, link)
+        if dupes:
+            # Catches the same posting appearing twice in one file.
+            dupes.add(last_dir, company_name, role, link)
+        created += 1
+    if dupes:
+        dupes.close()
+
+    notes = [f"{skipped} skipped"] if skipped else []
+    if duplicates:
+        notes.append(f"{duplicates} duplicate{'' if duplicates == 1 else 's'}")
+    print(f"✅ Created {created} apply director{'y' if created == 1 else 'ies'} from {postings_file}"
+          + (f" ({', '.join(notes)})" if notes else ""))
+    if last_dir:
+        update_config(config, last_dir)
+
+
+# =========================
+# INTERACTIVE MODE
+# =========================
+def main(from_file=None, allow_duplicates=False):
+    if from_file:
+        return batch_main(from_file, allow_duplicates)
+
+    # --- Read config and applies_dir ---
+    config, applies_dir = read_config()
+
     # --- User input ---
     company_name = input("🏢 Enter company name: ").strip()
     if not company_name:
@@ -44,6 +221,19 @@ def main():
         print("❌ Role cannot be empty.")
         sys.exit(1)
 
+    # --- Duplicate check (before the long paste) ---
+    dupes = None if allow_duplicates else open_duplicate_index(applies_dir)
+    if dupes:
+        existing = dupes.find(company_name, role)
+        if existing:
+            print(f"⚠️ Already applied to {company_name} / {role}:")
+            for label in existing:
+                print(f"   - {label}")
+            if input("❓ Create anyway? [y/N]: ").strip().lower() not in ("y", "yes"):
+                dupes.close()
+                print("👋 Cancelled.")
+                return
+
     print("📝 Paste the job description below (press Ctrl+D to finish on macOS/Linux, or Ctrl+Z then Enter on Windows):")
     print("──────────────────────────────────────────────────────────────")
     job_description = sys.stdin.read().strip()
@@ -53,54 +243,20 @@ def main():
         print("❌ Job description cannot be empty.")
         sys.exit(1)
 
-    # --- Add role at the beginning of the job description ---
-    job_description = f"role : {role}\n\n{job_description}"
+    # --- Read data files (prompt.txt compiled, career/schema serialized) ---
+    template, shared = load_prompt_inputs()
 
-    # --- Create apply directory ---
-    today_dir = datetime.now().strftime("%Y_%m_%d")
-    date_dir = applies_dir / today_dir
-    final_dir = date_dir / f"apl_{company_name.replace(' ', '_')}"
-    final_dir.mkdir(parents=True, exist_ok=True)
-
-    # --- Read data files ---
-    try:
-        with open(prompt_file, "r", encoding="utf-8") as f:
-            prompt_template = f.read()
-        with open(career_file, "r", encoding="utf-8") as f:
-            career_json = json.dumps(json.load(f), indent=2, ensure_ascii=False)
-        with open(schema_file, "r", encoding="utf-8") as f:
-            output_schema = json.dumps(json.load(f), indent=2, ensure_ascii=False)
-    except FileNotFoundError as e:
-        print(f"❌ Missing data file: {e.filename}")
-        sys.exit(1)
-
-    # --- Replace placeholders in prompt.txt ---
-    filled_prompt = (
-        prompt_template
-        .replace("{career_json}", career_json)
-        .replace("{job_description}", job_description)
-        .replace("{date_and_time}", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        .replace("{company_name}", company_name)
-        .replace("{output_schema}", output_schema)
-    )
-
-    # --- Save final prompt.txt ---
-    prompt_output_path = final_dir / "prompt.txt"
-    with open(prompt_output_path, "w", encoding="utf-8") as f:
-        f.write(filled_prompt)
-    print(f"✅ Generated prompt.txt → {prompt_output_path}")
-
-    cv_data_path = final_dir/ "cv_data.json"
-    with open(cv_data_path, "w", encoding="utf-8") as f:
-        f.write("{}")
-    print(f"✅ Generated cv_data.json → {cv_data_path}")
-    
+    # --- Create apply directory, prompt.txt and cv_data.json ---
+    final_dir = write_apply_dir(apply_dir_for(applies_dir, company_name), template, shared,
+                                company_name, role, job_description)
+    print(f"✅ Generated prompt.txt → {final_dir / 'prompt.txt'}")
+    print(f"✅ Generated cv_data.json → {final_dir / 'cv_data.json'}")
+    if dupes:
+        dupes.add(final_dir, company_name, role)
+        dupes.close()
 
     # --- Update config.yaml ---
-    config["current_apply_dir"] = str(final_dir)
-    with open(config_file, "w", encoding="utf-8") as f:
-        yaml.safe_dump(config, f, sort_keys=False)
-    print(f"📝 Updated config.yaml → current_apply_dir: {final_dir}")
+    update_config(config, final_dir)
 
     print("🎉 Apply directory successfully created!")
     print(f"📁 {final_dir}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# src/utils/archive.py
+# Description:
+#   `jobuine archive`: move apply directories older than --older-than (by
+#   their YYYY_MM_DD directory) into the content-addressed archive of
+#   core/archive.py, and `--restore` them back onto disk. `list` and the
+#   duplicate check of `apply` read archived directories in place; `generate`
+#   restores the ones it has to render again. `check` and `stats` only read
+#   the Excel store, so archiving never changes their answers.
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from core import archive as arc
+from core import profile
+from core.applies import discover_apply_dirs
+from core.config import get_applies_dir, get_current_apply_dir
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_totals(archive: arc.Archive) -> None:
+    totals = archive.totals()
+    ratio = totals["size"] / totals["stored"] if totals["stored"] else 0.0
+    print(f"🗄️ Archive: {totals['dirs']} directories, {format_size(totals['size'])} stored as "
+          f"{format_size(totals['stored'])} in {totals['blobs']} unique blobs ({ratio:.1f}x)")
+
+
+def restore_main(applies_dir: Path, paths: list) -> None:
+    archive = arc.Archive(applies_dir)
+    try:
+        restored = 0
+        for raw in paths:
+            dir_path = Path(raw).expanduser()
+            dir_path = (dir_path if dir_path.is_absolute() else applies_dir / dir_path).absolute()
+            if not archive.contains(dir_path):
+                print(f"❌ Not archived: {dir_path}")
+                continue
+            try:
+                count = archive.restore(dir_path)
+            except OSError as e:
+                print(f"❌ {e}")
+                continue
+            restored += 1
+            print(f"♻️ Restored {count} files → {dir_path}")
+        if restored:
+            print_totals(archive)
+    finally:
+        archive.close()
+
+
+def main(older_than: str = "90d", dry_run: bool = False, restore: list = None):
+    try:
+        applies_dir = get_applies_dir()
+        cutoff = date.today() - arc.parse_age(older_than)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not applies_dir.is_dir():
+        print(f"❌ applies_dir not found: {applies_dir}")
+        sys.exit(1)
+
+    if restore:
+        restore_main(applies_dir, restore)
+        return
+
+    try:
+        current = get_current_apply_dir().resolve()
+    except (FileNotFoundError, KeyError):
+        current = None
+    old = discover_apply_dirs(applies_dir, until=cutoff - timedelta(days=1))
+    dirs = [d for d in old if d.resolve() != current]
+    if not dirs:
+        print(f"✅ No apply directories from before {cutoff.isoformat()} to archive.")
+        return
+    if dry_run:
+        print(f"🗄️ Would archive {len(dirs)} apply directories from before {cutoff.isoformat()}:")
+        for d in dirs:
+            print(f"  - {d.parent.name}/{d.name}")
+        return
+
+    def report(dir_path, error):
+        print(f"❌ {dir_path.parent.name}/{dir_path.name}: {error}", file=sys.stderr)
+
+    archive = arc.Archive(applies_dir)
+    try:
+        with profile.stage("archive"):
+            totals = archive.add(dirs, on_error=report)
+        print(f"🗄️ Archived {totals['dirs']} apply directories ({totals['files']} files) from before "
+              f"{cutoff.isoformat()}: {format_size(totals['size'])} → {format_size(totals['stored'])} of new blobs")
+        print_totals(archive)
+    finally:
+        archive.close()
+    if totals["dirs"] < len(dirs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,151 @@
 # cli/check.py
-import openpyxl
 import argparse
 from pathlib import Path
 from core.config import get_store_file
+from core import profile, shards, store
 
-def search_in_excel(file_path: Path, search_string: str) -> bool:
+def search_in_excel(file_path: Path, search_string: str, limit: int = 20,
+                    min_score: float = 0.75) -> list:
     """
     Search for a string in all sheets and cells of an Excel file.
-    Returns True if found, otherwise False.
+    Uses the trigram index of the sidecar cache, which is rebuilt if the workbook changed.
+    Returns the matching rows ranked by score (empty list if nothing matched).
     """
-    workbook = openpyxl.load_workbook(file_path, data_only=True)
-    for sheet in workbook.worksheets:
-        for row in sheet.iter_rows(values_only=True):
-            for cell in row:
-                if cell and search_string.lower() in str(cell).lower():
-                    return True
-    return False
+    conn = store.open_cache(file_path)
+    try:
+        with profile.stage("search"):
+            return store.search(conn, search_string, limit=limit, min_score=min_score)
+    finally:
+        conn.close()
 
-def main():
-    parser = argparse.ArgumentParser(description="Search for a string in the Excel file located under 'data/'.")
-    parser.add_argument("--search", required=True, help="String to search for in the Excel file.")
-    args = parser.parse_args()
+def search_many_in_excel(file_path: Path, terms: list, min_score: float = 0.75) -> dict:
+    """Look up every term in one pass over the sidecar rows; {term: {"rows", "fuzzy"}}."""
+    conn = store.open_cache(file_path)
+    try:
+        with profile.stage("search terms"):
+            return store.search_terms(conn, terms, min_score=min_score)
+    finally:
+        conn.close()
+
+def search_store(store_file: Path, search_string: str, limit: int = 20, min_score: float = 0.75) -> list:
+    """
+    search_in_excel over every shard of the store in parallel (or store_file
+    itself without sharding). Hits from a shard carry its period as "shard".
+    """
+    paths = [p for p in shards.store_files(store_file) if store.exists(p)]
+
+    def search_shard(path):
+        hits = search_in_excel(path, search_string, limit=limit, min_score=min_score)
+        for hit in hits:
+            hit["shard"] = shards.shard_label(store_file, path)
+        return hits
+
+    hits = [hit for shard_hits in shards.fan_out(search_shard, paths) for hit in shard_hits]
+    # Same order as store.search: best score first, most recent application first among equals.
+    hits.sort(key=lambda h: h["applied_at"], reverse=True)
+    hits.sort(key=lambda h: h["score"], reverse=True)
+    return hits[:limit]
+
+def search_many_in_store(store_file: Path, terms: list, min_score: float = 0.75) -> dict:
+    """
+    search_many_in_excel over every shard in parallel, merged per term.
+    Rows become (shard, sheet, row_no); shard is "" without sharding.
+    """
+    paths = [p for p in shards.store_files(store_file) if store.exists(p)]
+    per_shard = shards.fan_out(lambda path: search_many_in_excel(path, terms, min_score=min_score), paths)
+    merged = {term: {"rows": [], "fuzzy": False} for term in terms}
+    for path, results in zip(paths, per_shard):
+        label = shards.shard_label(store_file, path)
+        for term, result in results.items():
+            merged[term]["rows"].extend((label, sheet, row) for sheet, row in result["rows"])
+            merged[term]["fuzzy"] = merged[term]["fuzzy"] or result["fuzzy"]
+    return merged
+
+def row_ref(shard: str, sheet: int, row: int) -> str:
+    """`row`, `sheet!row` outside the first sheet, prefixed by `shard:` in a sharded store."""
+    ref = str(row) if sheet == 0 else f"{sheet + 1}!{row}"
+    return f"{shard}:{ref}" if shard else ref
+
+def read_terms_file(path) -> list:
+    """One term per line; blank lines and # comments are skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+def format_rows(rows: list, limit: int) -> str:
+    """Row references (row_ref) of one term, cut after limit."""
+    shown = [row_ref(*ref) for ref in rows[:limit]]
+    more = len(rows) - len(shown)
+    return ", ".join(shown) + (f", … (+{more})" if more > 0 else "")
+
+def print_term_table(results: dict, limit: int) -> None:
+    """Print one line per term: found / fuzzy / not found, match count and row numbers."""
+    headers = ["term", "found", "count", "rows"]
+    table = []
+    for term, result in results.items():
+        rows = result["rows"]
+        found = ("✅ fuzzy" if result["fuzzy"] else "✅ yes") if rows else "❌ no"
+        table.append([term, found, str(len(rows)), format_rows(rows, limit)])
+    widths = [max(len(r[i]) for r in [headers] + table) for i in range(len(headers))]
+    for line in [headers] + table:
+        print("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip())
+
+def print_hits(hits: list) -> None:
+    """Print search hits as an aligned table."""
+    headers = ["score", "row"] + store.SEARCH_COLUMNS
+    table = [[f"{h['score']:.2f}", row_ref(h.get("shard", ""), h["sheet"], h["row_no"])]
+             + [h[c] or "" for c in store.SEARCH_COLUMNS]
+             for h in hits]
+    widths = [max(len(r[i]) for r in [headers] + table) for i in range(len(headers))]
+    for line in [headers] + table:
+        print("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip())
+
+def main(search=None, limit: int = 20, min_score: float = 0.75, terms_file: str = None):
+    """
+    search is one term or a list of terms. One term prints its best-matching
+    rows; several terms (or a terms file) print a found / not-found table.
+    """
+    if search is None and terms_file is None:
+        parser = argparse.ArgumentParser(description="Search for a string in the Excel file located under 'data/'.")
+        parser.add_argument("--search", required=True, help="String to search for in the Excel file.")
+        search = parser.parse_args().search
+
+    terms = [search] if isinstance(search, str) else list(search or [])
+    if terms_file:
+        try:
+            terms += read_terms_file(terms_file)
+        except OSError as e:
+            print(f"❌ Cannot read terms file: {e}")
+            return
+    if not terms:
+        print("❌ Pass --search and/or --terms-file.")
+        return
 
     # file_path = Path(__file__).resolve().parent.parent / "data" / "All_applyDetail.xlsx"
 
-    file_path = get_store_file()
+    try:
+        file_path = get_store_file()
+        found_store = shards.any_exists(shards.store_files(file_path))
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return
 
-    if not file_path.exists():
+    if not found_store:
         print(f"❌ Excel file not found: {file_path}")
         return
 
-    found = search_in_excel(file_path, args.search)
-    print("✅ Found!" if found else "❌ Not found.")
+    if len(terms) > 1 or terms_file:
+        results = search_many_in_store(file_path, terms, min_score=min_score)
+        found = sum(1 for r in results.values() if r["rows"])
+        print(f"🔎 {found} of {len(results)} term(s) found:")
+        print_term_table(results, limit)
+        return
+
+    hits = search_store(file_path, terms[0], limit=limit, min_score=min_score)
+    if not hits:
+        print("❌ Not found.")
+        return
+    print(f"✅ Found {len(hits)} matching row(s):")
+    print_hits(hits)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# src/utils/compact.py
+# Description:
+#   Fold the application journal into the Excel store_file.
+#   generate only appends rows to the journal, so the workbook itself is
+#   created or updated only here (automatically once the journal reaches
+#   journal_compact_threshold rows). Rows are appended to the existing
+#   workbook under the store lock, keeping its styles, links and sheets;
+#   openpyxl can only do that with a full load and save, so each compaction
+#   costs time linear in the store size (hence the threshold).
+#   Column widths only grow, from the per-column maxima the sidecar keeps up
+#   to date as rows are appended, so existing rows are never measured;
+#   `--reformat` recomputes them from every cell.
+#   With `store_shards` set, every shard with journaled rows is compacted, and
+#   `--shard` splits an existing single workbook into per-period shards (the
+#   next append does the same when it finds one left next to the shards).
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
+from core.config import get_store_file, get_compact_threshold, get_store_shards
+from core import journal, profile, shards, store
+
+
+def _sheet_rows(sheet):
+    """Stream the values of an existing sheet, or the header row of a new store."""
+    if sheet is None:
+        return iter([tuple(store.EXCEL_HEADERS)])
+    return sheet.iter_rows(values_only=True)
+
+
+def _apply_widths(ws, widths: dict, reformat: bool) -> None:
+    """
+    Set column widths from {1-based column: longest value length}. Columns are
+    only widened, so widths set by hand survive; with reformat they are recomputed.
+    """
+    for col_idx, max_len in widths.items():
+        letter = get_column_letter(col_idx)
+        width = store.column_width(max_len)
+        current = ws.column_dimensions.get(letter)
+        if reformat or current is None or not current.customWidth or (current.width or 0) < width:
+            ws.column_dimensions[letter].width = width
+
+
+def compact_store(excel_path: Path, reformat: bool = False) -> int:
+    """
+    Append every journaled row to the first sheet of the workbook, save it
+    and clear the journal. The workbook is edited in place, so styles,
+    hyperlinks, number formats, other sheets and column widths set by hand
+    are kept. First-sheet widths grow from the sidecar's tracked maxima; with
+    reformat every sheet's widths are recomputed from all of its cells (and
+    the workbook is saved even with an empty journal). Returns the number of
+    rows folded in.
+    Keeping all of that means loading and saving the whole workbook, so a
+    compaction is linear in the store size; it is deferred until the journal
+    reaches journal_compact_threshold rows, and generate never pays for it.
+    """
+    with journal.locked(excel_path):
+        rows = journal.read(excel_path)
+        if not rows and not (reformat and excel_path.exists()):
+            return 0
+        signature_before = store.store_signature(excel_path)
+        tracked = None if reformat else store.column_widths(excel_path)
+
+        if excel_path.exists():
+            with profile.stage("wb.load"):
+                wb = load_workbook(excel_path)
+            ws = wb.worksheets[0]
+        else:
+            wb = Workbook()
+            ws = wb.active
+            ws.title = "Applications"
+            ws.append(store.EXCEL_HEADERS)
+        with profile.stage("append rows"):
+            for row in rows:
+                ws.append(row)
+        for idx, sheet in enumerate(wb.worksheets if reformat else [ws]):
+            widths = tracked if idx == 0 else None
+            if not widths:
+                with profile.stage("autosize widths"):
+                    widths = store.measure_widths(_sheet_rows(sheet), {})
+            _apply_widths(sheet, widths, reformat)
+
+        tmp_path = excel_path.with_name(f"{excel_path.stem}.compacting.xlsx")
+        with profile.stage("wb.save"):
+            wb.save(tmp_path)
+        os.replace(tmp_path, excel_path)
+        journal.clear(excel_path)
+        store.mark_compacted(excel_path, signature_before)
+    return len(rows)
+
+
+def split_store(excel_path: Path) -> tuple:
+    """
+    Split the first sheet of a single-workbook store (plus its journal) into
+    per-period shards (see shards.migrate), also when some shards already
+    exist next to it. Returns ({period: rows}, path the original was set
+    aside as or None). Other sheets stay in the set-aside file.
+    """
+    mode = get_store_shards()
+    if not mode:
+        raise ValueError("❌ Set store_shards: month (or year) in config.yaml first.")
+    with journal.locked(excel_path):
+        if not store.exists(excel_path):
+            raise ValueError(f"❌ Nothing to split: {excel_path} does not exist.")
+        manifest = shards.load_manifest(excel_path)
+        if manifest["shards"] and manifest["mode"] != mode:
+            raise ValueError(f"❌ The store is sharded by {manifest['mode']}, but store_shards is {mode}.")
+        manifest["mode"] = mode
+        moved, backup = shards.migrate(excel_path, mode, manifest)
+        shards.save_manifest(excel_path, manifest)
+    return moved, backup
+
+
+def compact_in_background(excel_path: Path, threshold: int = None) -> bool:
+    """Start a detached `compact` process once the journal reaches the threshold."""
+    threshold = get_compact_threshold() if threshold is None else threshold
+    if journal.pending_count(excel_path) < threshold:
+        return False
+    src_dir = str(Path(__file__).resolve().parents[1])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")])))
+    subprocess.Popen(
+        [sys.executable, "-c", "from utils import compact; compact.main()"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+def main(reformat: bool = False, shard: bool = False):
+    try:
+        excel_path = get_store_file()
+        if shard:
+            split, backup = split_store(excel_path)
+            print(f"🧩 Split {sum(split.values())} rows into {len(split)} shard(s) next to {excel_path}")
+            if backup:
+                print(f"📦 Original kept as {backup.name}")
+            return
+        paths = shards.store_files(excel_path)
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    compacted = 0
+    for path in paths:
+        if not journal.pending_count(path) and not reformat:
+            continue
+        added = compact_store(path, reformat)
+        compacted += 1
+        print(f"🗜️ Compacted {added} journaled rows → {path}")
+    if not compacted:
+        print(f"✅ Nothing to compact; journal is empty for {excel_path}"
+              + (f" ({len(paths)} shards)" if get_store_shards() else ""))
+        return
+    if reformat:
+        print("📏 Column widths recomputed from every cell")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,30 @@
 #!/usr/bin/env python3
-import os, sys, json, glob, argparse
+import os, sys, json, glob, argparse, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from openpyxl import Workbook, load_workbook
-from openpyxl.utils import get_column_letter
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from pathlib import Path
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem,
-    Table, TableStyle, HRFlowable, KeepTogether
+    Paragraph, Spacer, ListFlowable, ListItem,
+    Table, KeepTogether
 )
-from core.config import get_store_file, get_current_apply_dir
+from core.config import (
+    get_store_file, get_current_apply_dir, get_applies_dir, get_theme_file, get_cache_dir
+)
+from core import archive as arc
+from core.applies import discover_apply_dirs, input_jsons, parse_apply_date
+from core import fit
+from core import manifest as mf
+from core import profile
+from core import shards
+from core import store
+from core.store import EXCEL_HEADERS
+from core.render import RenderContext, get_render_context, write_pdf
+from core.schema import validate_data, validate_files
+from core.section_cache import SectionCache, get_section_cache, format_ratio
+from utils import compact
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_LEFT
 from reportlab.lib import colors
-from reportlab.pdfbase.pdfmetrics import stringWidth
-
-# =========================
-# CONFIG
-# =========================
-EXCEL_HEADERS = [
-    "Dir", "role", "company", "location",
-    "jobType", "salary", "link", "address",
-    "status", "applyDateTime"
-]
 
 # =========================
 # UTILITIES
@@ -49,32 +51,11 @@ def format_apply_datetime(dt_str: str) -> str:
 # =========================
 # EXCEL HANDLING
 # =========================
-def open_or_create_excel(excel_path: str):
-    if os.path.exists(excel_path):
-        wb = load_workbook(excel_path)
-        ws = wb.active
-    else:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Applications"
-        ws.append(EXCEL_HEADERS)
-    return wb, ws
-
-def autosize_columns(ws):
-    for col_idx in range(1, ws.max_column + 1):
-        col_letter = get_column_letter(col_idx)
-        max_len = 0
-        for row in ws.iter_rows(min_col=col_idx, max_col=col_idx, values_only=True):
-            val = "" if row[0] is None else str(row[0])
-            if len(val) > max_len:
-                max_len = len(val)
-        ws.column_dimensions[col_letter].width = min(max(12, max_len + 2), 60)
-
-def append_applydetail_rows(dir_path: str, ws) -> int:
-    """Append applyDetail rows from all JSONs in dir_path to Excel."""
+def collect_applydetail_rows(dir_path: str) -> list:
+    """Build Excel rows from the applyDetail of every JSON in dir_path."""
     dir_name = os.path.basename(os.path.abspath(dir_path))
-    json_files = sorted(glob.glob(os.path.join(dir_path, "*.json")))
-    added = 0
+    json_files = input_jsons(dir_path)
+    rows = []
     for path in json_files:
         try:
             data = load_json(path)
@@ -83,7 +64,7 @@ def append_applydetail_rows(dir_path: str, ws) -> int:
                        ["role","company","location","jobType","salary","applyDateTime","status","link","address"]):
                 continue
 
-            row = [
+            rows.append([
                 dir_name,
                 ad.get("role", ""),
                 ad.get("company", ""),
@@ -94,24 +75,14 @@ def append_applydetail_rows(dir_path: str, ws) -> int:
                 ad.get("address", ""),
                 ad.get("status", ""),
                 format_apply_datetime(ad.get("applyDateTime", "")),
-            ]
-            ws.append(row)
-            added += 1
+            ])
         except Exception as e:
             print(f"⚠️  Skipping '{os.path.basename(path)}' for Excel: {e}", file=sys.stderr)
-    return added
+    return rows
 
 # =========================
 # PDF GENERATION
 # =========================
-def section_rule():
-    return HRFlowable(width="100%", thickness=0.8, lineCap='round',
-                      color=colors.HexColor("#DDDDDD"), spaceBefore=10, spaceAfter=10)
-
-def thin_divider():
-    return HRFlowable(width="100%", thickness=0.5, lineCap='round',
-                      color=colors.HexColor("#DDDDDD"), spaceBefore=6, spaceAfter=6)
-
 def format_date_range(start, end):
     def fmt(part):
         if isinstance(part, dict):
@@ -143,7 +114,8 @@ def is_bullet_line(line: str) -> bool:
     l = line.strip()
     return l.startswith("- ") or l.startswith("• ")
 
-def make_bullet_list(text: str, para_style: ParagraphStyle):
+def make_bullet_list(text: str, para_style: ParagraphStyle, bullet_color=colors.HexColor("#333333"),
+                     spacing: float = 1.0):
     items = []
     for raw in text.splitlines():
         line = raw.strip()
@@ -159,46 +131,28 @@ def make_bullet_list(text: str, para_style: ParagraphStyle):
         bulletType='bullet',
         bulletFontName='Helvetica',
         bulletFontSize=9,
-        bulletColor=colors.HexColor("#333333"),
+        bulletColor=bullet_color,
         leftIndent=10,
-        spaceBefore=2,
-        spaceAfter=2
+        spaceBefore=2 * spacing,
+        spaceAfter=2 * spacing
     )
 
-def render_detail(text: str, para_style: ParagraphStyle):
+def render_detail(text: str, para_style: ParagraphStyle, bullet_color=colors.HexColor("#333333"),
+                  spacing: float = 1.0):
     if any(is_bullet_line(l) for l in text.splitlines()):
-        lf = make_bullet_list(text, para_style)
+        lf = make_bullet_list(text, para_style, bullet_color, spacing)
         return [lf] if lf else []
     blocks = [b.strip() for b in text.replace("\r\n", "\n").split("\n\n") if b.strip()]
     if not blocks:
         blocks = [b.strip() for b in text.split("\n") if b.strip()]
     return [Paragraph(b, para_style) for b in blocks]
 
-def create_cv_pdf(data: dict, output_pdf_path: str):
-    doc = SimpleDocTemplate(output_pdf_path, pagesize=LETTER,
-                            rightMargin=50, leftMargin=50,
-                            topMargin=60, bottomMargin=40)
-    styles = getSampleStyleSheet()
-    content = []
-
-    header_style = ParagraphStyle('Header', parent=styles['Heading1'], fontSize=22,
-                                  alignment=TA_LEFT, spaceAfter=6)
-    role_style = ParagraphStyle('Role', parent=styles['Heading2'], fontSize=12,
-                                alignment=TA_LEFT, spaceAfter=12)
-    section_header = ParagraphStyle('SectionHeader', parent=styles['Heading2'], fontSize=14,
-                                    spaceBefore=6, spaceAfter=6, fontName="Helvetica-Bold")
-    normal = styles['Normal']
-    normal.leading = normal.fontSize + 2
-    exp_text = ParagraphStyle('ExpText', parent=normal, leading=normal.fontSize + 3, spaceBefore=1, spaceAfter=3)
-    bullet_text = ParagraphStyle('BulletText', parent=normal, leftIndent=0, leading=normal.fontSize + 2, spaceAfter=1)
-
-    # Header
-    content.append(Paragraph(data.get('name', ''), header_style))
-    content.append(Paragraph(data.get('role', ''), role_style))
+def build_header_section(data: dict, ctx: RenderContext) -> list:
+    content = [Paragraph(data.get('name', ''), ctx.header),
+               Paragraph(data.get('role', ''), ctx.role)]
 
     # Contact
     contact = { (k.lower() if isinstance(k, str) else k): v for k, v in (data.get('contact', {}) or {}).items() }
-    contact_text_style = ParagraphStyle('ContactText', parent=normal, alignment=TA_LEFT, fontSize=9)
     line = []
     linkedin = (contact.get("linkedin") or "").strip()
     if linkedin: line.append(f"LinkedIn: {linkedin}")
@@ -208,133 +162,398 @@ def create_cv_pdf(data: dict, output_pdf_path: str):
     if address: line.append(f"Address: {address}")
     phone = (contact.get("phone") or "").strip()
     if phone: line.append(f"Mobile: {phone}")
-    if line: content.append(Paragraph("<br/>".join(line), contact_text_style))
-
-    # Summary
-    content.append(section_rule())
-    content.append(Paragraph("Summary", section_header))
-    content.append(Paragraph(data.get("summary", "") or "", normal))
+    if line: content.append(Paragraph("<br/>".join(line), ctx.contact_text))
+    return content
 
-    # Core Skills
-    content.append(section_rule())
-    content.append(Paragraph("Skills", section_header))
-    for group in data.get("coreSkills", []) or []:
+def build_skills_section(core_skills: list, ctx: RenderContext) -> list:
+    content = [Paragraph("Skills", ctx.section_header)]
+    for group in core_skills:
         cat = group.get("category", "")
         skills_line = ", ".join(group.get("skills", []) or [])
-        content.append(Paragraph(f"<b>{cat}:</b> {skills_line}", normal))
-    content.append(Spacer(1, 0.12 * inch))
-
-    # Experience
-    content.append(section_rule())
-    content.append(Paragraph("Experience", section_header))
-    for i, exp in enumerate(data.get("experiences", []) or []):
-        date_range = format_date_range(exp.get('start', {}), exp.get('end', {}))
-        duration = calculate_duration(exp.get('start', {}), exp.get('end', {}))
-        right_text = f"{date_range} ({duration})"
-        right_w = stringWidth(right_text, normal.fontName, normal.fontSize) + 6
-        t = Table(
-            [[Paragraph(f"<b>{exp.get('role','')}</b>", normal),
-              Paragraph(f"<b>{right_text}</b>", normal)]],
-            colWidths=["*", right_w], hAlign="LEFT"
-        )
-        t.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ]))
-        company_line = f"<b>{exp.get('company','')}</b>, {exp.get('location','')} . {exp.get('type','')} . {exp.get('workType','')}"
-        detail_flow = render_detail(exp.get('detail', '') or '', bullet_text)
-        content.append(KeepTogether([t, Paragraph(company_line, exp_text)] + detail_flow))
-        if i < len((data.get("experiences") or [])) - 1:
-            content.append(thin_divider())
-
-    # Education
-    content.append(section_rule())
-    content.append(Paragraph("Education", section_header))
-    edu = data.get("education", {}) or {}
+        content.append(Paragraph(f"<b>{cat}:</b> {skills_line}", ctx.normal))
+    content.append(Spacer(1, 0.12 * inch * ctx.spacing))
+    return content
+
+def build_experience_block(exp: dict, ctx: RenderContext) -> list:
+    normal = ctx.normal
+    date_range = format_date_range(exp.get('start', {}), exp.get('end', {}))
+    duration = calculate_duration(exp.get('start', {}), exp.get('end', {}))
+    right_text = f"{date_range} ({duration})"
+    right_w = ctx.string_width(right_text) + 6
+    t = Table(
+        [[Paragraph(f"<b>{exp.get('role','')}</b>", normal),
+          Paragraph(f"<b>{right_text}</b>", normal)]],
+        colWidths=["*", right_w], hAlign="LEFT"
+    )
+    t.setStyle(ctx.exp_table_style)
+    company_line = f"<b>{exp.get('company','')}</b>, {exp.get('location','')} . {exp.get('type','')} . {exp.get('workType','')}"
+    detail_flow = render_detail(exp.get('detail', '') or '', ctx.bullet_text, ctx.bullet_color, ctx.spacing)
+    return [KeepTogether([t, Paragraph(company_line, ctx.exp_text)] + detail_flow)]
+
+def build_education_section(edu: dict, ctx: RenderContext) -> list:
+    normal = ctx.normal
+    content = [Paragraph("Education", ctx.section_header)]
     edu_left = f"<b>{edu.get('grade','')}</b>"
     edu_range = ""
     if edu.get("start") or edu.get("end"):
         edu_range = format_date_range(edu.get('start'), edu.get('end'))
     if edu_range:
         right_text = f"{edu_range}"
-        right_w = stringWidth(right_text, normal.fontName, normal.fontSize) + 6
+        right_w = ctx.string_width(right_text) + 6
         edu_table = Table(
             [[Paragraph(edu_left, normal), Paragraph(f"<b>{right_text}</b>", normal)]],
             colWidths=["*", right_w], hAlign="LEFT"
         )
-        edu_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ]))
+        edu_table.setStyle(ctx.edu_table_style)
         content.append(edu_table)
     else:
         content.append(Paragraph(edu_left, normal))
     content.append(Paragraph(edu.get('university', ''), normal))
+    return content
+
+def build_languages_section(languages: list, ctx: RenderContext) -> list:
+    content = [Paragraph("Languages", ctx.section_header)]
+    for lang in languages:
+        content.append(Paragraph(f"{lang.get('language','')}: {lang.get('level','')}", ctx.normal))
+    return content
+
+def create_cv_pdf(data: dict, output_pdf_path: str, ctx: RenderContext = None,
+                  cache: SectionCache = None, fit_pages: int = None):
+    """
+    Render a CV to PDF. `ctx` defaults to the process-wide cached render context
+    and `cache` to the process-wide in-memory section cache. With fit_pages,
+    spacing, font size and bullets are tightened until the CV fits in that
+    many pages (core/fit.py), measuring layouts instead of building them.
+    """
+    ctx = ctx or get_render_context()
+    cache = cache or get_section_cache()
+    if fit_pages:
+        with profile.stage("fit"):
+            ctx, data, report = fit.fit(data, ctx, fit_pages,
+                                        lambda d, c: build_cv_flowables(d, c, cache))
+        print(fit.format_report(report, fit_pages))
+    with profile.stage("flowables"):
+        content = build_cv_flowables(data, ctx, cache)
+    with profile.stage("doc.build"):
+        write_pdf(output_pdf_path, content, ctx, title=data.get("name") or "")
+    print(f"🧾 PDF written: {output_pdf_path}")
+
+def build_cv_flowables(data: dict, ctx: RenderContext, cache: SectionCache) -> list:
+    """Build (or fetch from the section cache) every flowable of a CV, in page order."""
+    theme = ctx.theme
+    content = []
+
+    # Header
+    header_input = {k: data.get(k) for k in ("name", "role", "contact")}
+    content += cache.get_or_build("header", header_input, theme,
+                                  lambda: build_header_section(data, ctx))
+
+    # Summary (tailored per application, not worth caching)
+    content.append(ctx.section_rule())
+    content.append(Paragraph("Summary", ctx.section_header))
+    content.append(Paragraph(data.get("summary", "") or "", ctx.normal))
+
+    # Core Skills
+    content.append(ctx.section_rule())
+    core_skills = data.get("coreSkills", []) or []
+    content += cache.get_or_build("skills", core_skills, theme,
+                                  lambda: build_skills_section(core_skills, ctx))
+
+    # Experience
+    content.append(ctx.section_rule())
+    content.append(Paragraph("Experience", ctx.section_header))
+    experiences = data.get("experiences", []) or []
+    # Durations of ongoing roles depend on the current month.
+    this_month = datetime.today().strftime("%Y-%m")
+    for i, exp in enumerate(experiences):
+        content += cache.get_or_build("experience", [exp, this_month], theme,
+                                      lambda: build_experience_block(exp, ctx))
+        if i < len(experiences) - 1:
+            content.append(ctx.thin_divider())
+
+    # Education
+    content.append(ctx.section_rule())
+    edu = data.get("education", {}) or {}
+    content += cache.get_or_build("education", edu, theme,
+                                  lambda: build_education_section(edu, ctx))
 
     # Languages
-    content.append(section_rule())
-    content.append(Paragraph("Languages", section_header))
-    for lang in data.get("languages", []) or []:
-        content.append(Paragraph(f"{lang.get('language','')}: {lang.get('level','')}", normal))
+    content.append(ctx.section_rule())
+    languages = data.get("languages", []) or []
+    content += cache.get_or_build("languages", languages, theme,
+                                  lambda: build_languages_section(languages, ctx))
 
-    content.append(section_rule())
-    doc.build(content)
-    print(f"🧾 PDF written: {output_pdf_path}")
+    content.append(ctx.section_rule())
+    return content
+
+# =========================
+# APPLY DIRECTORIES
+# =========================
+def restore_archived(applies_dir: Path, since=None, until=None, only: Path = None) -> int:
+    """
+    Put archived apply directories back on disk to render them again: every
+    one in the date range, or just `only`. Returns how many were restored.
+    """
+    archive = arc.open_archive(applies_dir)
+    if archive is None:
+        return 0
+    try:
+        if only is not None:
+            targets = [only] if archive.contains(only) and not only.exists() else []
+        else:
+            targets = [path for path, _, _ in archive.archived_dirs(since, until) if not path.exists()]
+        for dir_path in targets:
+            archive.restore(dir_path)
+    finally:
+        archive.close()
+    if targets:
+        print(f"♻️ Restored {len(targets)} archived apply director{'y' if len(targets) == 1 else 'ies'}")
+    return len(targets)
+
+def pending_jsons(dir_path, force: bool = False) -> list:
+    """Return the JSON paths of dir_path whose content changed since their last render."""
+    manifest = mf.load_manifest(str(dir_path))
+    pending = []
+    for path in input_jsons(dir_path):
+        try:
+            with open(path, "rb") as f:
+                digest = mf.content_digest(f.read())
+        except OSError:
+            continue
+        if force or not mf.is_rendered(manifest, os.path.basename(path), digest, str(dir_path)):
+            pending.append(path)
+    return pending
+
+def validate_inputs(dirs: list, force: bool = False, workers: int = None) -> set:
+    """
+    Validate every JSON that is about to be rendered against schema.json, before
+    any rendering work starts (in a process pool for large batches).
+    Prints path-level errors and returns the set of rejected file paths.
+    """
+    with profile.stage("validate"):
+        paths = [p for d in dirs for p in pending_jsons(d, force)]
+        invalid = validate_files(paths, workers)
+    for path, errors in invalid.items():
+        print(f"❌ Invalid {path}:", file=sys.stderr)
+        for error in errors:
+            print(f"    {error}", file=sys.stderr)
+    return set(invalid)
+
+def render_apply_dir(dir_path: str, force: bool = False, theme_file: str = None,
+                     cache_dir: str = None, rejected: set = None, fit_pages: int = None) -> tuple:
+    """
+    Render a PDF for every JSON in dir_path whose content changed since the last run.
+    Files in `rejected` were already found invalid by validate_inputs and are not
+    rendered; when rejected is None each file is validated here instead.
+    fit_pages is passed on to create_cv_pdf.
+    Returns (rendered, skipped) counts.
+    """
+    with profile.stage("render context"):
+        ctx = get_render_context(theme_file)
+        cache = get_section_cache(cache_dir)
+    manifest = mf.load_manifest(dir_path)
+    rendered = skipped = 0
+    for path in input_jsons(dir_path):
+        name = os.path.basename(path)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            digest = mf.content_digest(raw)
+            if not force and mf.is_rendered(manifest, name, digest, dir_path):
+                skipped += 1
+                continue
+            if rejected is not None and path in rejected:
+                continue
+            with profile.stage("input file", f"{os.path.basename(dir_path)}/{name}"):
+                with profile.stage("json.load"):
+                    data = json.loads(raw)
+                if rejected is None:
+                    with profile.stage("validate"):
+                        errors = validate_data(data)
+                    if errors:
+                        print(f"⚠️ Skipping PDF for '{name}': invalid ({'; '.join(errors)})", file=sys.stderr)
+                        continue
+                pdf_name = f"{safe_name_from_json(data, path)}.pdf"
+                out_pdf = os.path.join(dir_path, pdf_name)
+                create_cv_pdf(data, out_pdf, ctx, cache, fit_pages)
+            mf.record_render(manifest, name, digest, pdf_name)
+            rendered += 1
+        except Exception as e:
+            print(f"⚠️ Skipping PDF for '{name}': {e}", file=sys.stderr)
+    if rendered:
+        mf.save_manifest(dir_path, manifest)
+    return rendered, skipped
+
+def collect_new_rows(dir_path: str) -> list:
+    """Return applyDetail rows of dir_path that were not logged to Excel yet."""
+    return mf.unlogged_rows(mf.load_manifest(dir_path), collect_applydetail_rows(dir_path))
+
+def mark_rows_logged(dir_path: str, rows: list) -> None:
+    """Record rows in the manifest of dir_path once they are saved to Excel."""
+    manifest = mf.load_manifest(dir_path)
+    mf.record_logged(manifest, rows)
+    mf.save_manifest(dir_path, manifest)
+
+def process_apply_dir(dir_path: str, force: bool = False, theme_file: str = None,
+                      cache_dir: str = None, rejected: set = None, fit_pages: int = None) -> dict:
+    """Worker entry point: render dir_path and return its counts and new rows for the writer."""
+    cache = get_section_cache(cache_dir)
+    before = cache.counts()
+    rendered, skipped = render_apply_dir(dir_path, force, theme_file, cache_dir, rejected, fit_pages)
+    with profile.stage("collect rows"):
+        rows = collect_new_rows(dir_path)
+    return {
+        "dir": dir_path,
+        "rendered": rendered,
+        "skipped": skipped,
+        "rows": rows,
+        "cache": [after - prior for after, prior in zip(cache.counts(), before)],
+        # Stage records of a pool worker travel back with its result; in this
+        # process (single-directory mode, watch) they are already in place.
+        "profile": profile.drain() if profile.in_worker() else [],
+    }
+
+def run_batch(dirs: list, workers=None, force: bool = False, theme_file: str = None,
+              cache_dir: str = None, rejected: set = None, fit_pages: int = None) -> list:
+    """
+    Render dirs in a process pool and gather their new applyDetail rows for a single Excel write.
+    Each worker builds its render context once and reuses it for every directory it gets.
+    """
+    results = []
+    total = len(dirs)
+    initializer, initargs = profile.worker_initializer()
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        futures = [pool.submit(process_apply_dir, str(d), force, theme_file, cache_dir, rejected, fit_pages)
+                   for d in dirs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠️ Worker failed: {e}", file=sys.stderr)
+                continue
+            results.append(result)
+            profile.merge(result["profile"])
+            print(f"[{done}/{total}] {os.path.basename(result['dir'])} — "
+                  f"{result['rendered']} rendered, {result['skipped']} unchanged")
+    return results
+
+def log_results(excel_path: Path, results: list) -> int:
+    """
+    Single writer: append the new rows of worker results to the store journal
+    (O(1), under the store lock) and mark them logged in each manifest.
+    Returns the number of rows appended.
+    """
+    new_rows = {r["dir"]: r["rows"] for r in results if r["rows"]}
+    appended = [row for rows in new_rows.values() for row in rows]
+    if not appended:
+        return 0
+    with profile.stage("store.append"):
+        touched = shards.append_rows(excel_path, appended)
+    for dir_path, rows in new_rows.items():
+        mark_rows_logged(dir_path, rows)
+    # One background compaction handles every shard.
+    if any(compact.compact_in_background(path) for path in touched):
+        print("🗜️ Journal past threshold; compacting into Excel in the background")
+    return len(appended)
 
 # =========================
 # MAIN
 # =========================
-def main():
-    """Generate PDFs and append applyDetail data into the global Excel file."""
+def main(all_dirs: bool = False, since: str = None, until: str = None, workers: int = None,
+         force: bool = False, watch: bool = False, debounce: float = None, fit_pages: int = None):
+    """Generate PDFs and append applyDetail data into the global Excel file.
+
+    By default only current_apply_dir is processed. With all_dirs (or a
+    since/until date range) every matching apply directory under applies_dir
+    is rendered in a process pool and the Excel file is written once.
+    JSONs whose content is unchanged since the last run are not re-rendered
+    (unless force is set) and rows already logged are never appended twice.
+    Archived directories have nothing pending, so they are only restored
+    from the archive when they have to be rendered anyway: force in batch
+    mode, or a current_apply_dir that was archived.
+    With watch, stay resident and re-render JSONs as they change (utils/watch.py).
+    With fit_pages, every CV is fitted into that many pages (core/fit.py);
+    the manifest does not record it, so use force to re-fit unchanged JSONs.
+    """
+    if fit_pages is not None and fit_pages < 1:
+        print("❌ --fit-pages must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    batch = all_dirs or since or until
     # --- Load config paths ---
     try:
-        in_dir = get_current_apply_dir()
         excel_path = get_store_file()
+        in_dir = get_applies_dir() if batch else get_current_apply_dir()
+        theme_file = get_theme_file()
+        cache_dir = get_cache_dir()
+        since_date = parse_apply_date(since) if since else None
+        until_date = parse_apply_date(until) if until else None
     except Exception as e:
         print(f"❌ Config error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    # --- Bring back archived directories that have to be rendered ---
+    try:
+        if batch and force:
+            restore_archived(in_dir, since_date, until_date)
+        elif not batch and not in_dir.exists():
+            restore_archived(get_applies_dir(), only=in_dir)
+    except Exception as e:
+        print(f"❌ Cannot restore from the archive: {e}", file=sys.stderr)
+        sys.exit(1)
+
     # --- Validate input directory ---
     if not in_dir.exists() or not in_dir.is_dir():
         print(f"❌ Invalid apply directory: {in_dir}", file=sys.stderr)
         sys.exit(1)
 
-    # --- Find JSON files ---
-    json_files = sorted(glob.glob(str(in_dir / "*.json")))
-    if not json_files:
-        print(f"⚠️ No JSON files found in '{in_dir}'. Nothing to process.")
-        sys.exit(0)
-
-    # --- Open or create Excel file ---
-    wb, ws = open_or_create_excel(str(excel_path))
-
-    # --- Generate PDFs ---
-    pdf_count = 0
-    for path in json_files:
-        try:
-            data = load_json(path)
-            pdf_name = f"{safe_name_from_json(data, path)}.pdf"
-            out_pdf = in_dir / pdf_name
-            create_cv_pdf(data, str(out_pdf))
-            pdf_count += 1
-        except Exception as e:
-            print(f"⚠️ Skipping PDF for '{os.path.basename(path)}': {e}", file=sys.stderr)
-
-    # --- Append Excel rows ---
-    added = append_applydetail_rows(str(in_dir), ws)
-    autosize_columns(ws)
-    wb.save(str(excel_path))
+    if watch:
+        from utils import watch as watcher
+        list_dirs = (lambda: discover_apply_dirs(in_dir, since_date, until_date)) if batch else (lambda: [in_dir])
+        watcher.run(list_dirs, excel_path, theme_file, cache_dir,
+                    watcher.DEFAULT_DEBOUNCE if debounce is None else debounce, fit_pages)
+        return
+
+    started = time.perf_counter()
+    if batch:
+        # --- Find apply directories ---
+        dirs = discover_apply_dirs(in_dir, since_date, until_date)
+        if not dirs:
+            print(f"⚠️ No apply directories found in '{in_dir}'. Nothing to process.")
+            sys.exit(0)
+        rejected = validate_inputs(dirs, force, workers)
+        print(f"🚀 Rendering {len(dirs)} apply directories with {workers or os.cpu_count()} workers")
+        results = run_batch(dirs, workers, force, theme_file, cache_dir, rejected, fit_pages)
+    else:
+        # --- Find JSON files ---
+        if not glob.glob(str(in_dir / "*.json")):
+            print(f"⚠️ No JSON files found in '{in_dir}'. Nothing to process.")
+            sys.exit(0)
+        dirs = [in_dir]
+        rejected = validate_inputs(dirs, force, workers)
+        results = [process_apply_dir(str(in_dir), force, theme_file, cache_dir, rejected, fit_pages)]
+    elapsed = time.perf_counter() - started
+
+    pdf_count = sum(r["rendered"] for r in results)
+    skipped = sum(r["skipped"] for r in results)
+    cache_counts = [sum(counts) for counts in zip(*(r["cache"] for r in results))]
+    added = log_results(excel_path, results)
 
     # --- Print summary ---
     if added:
-        print(f"✅ Added {added} rows → {excel_path}")
+        print(f"✅ Logged {added} rows → {excel_path} (journal; run `jobuine compact` to fold into Excel)")
     else:
-        print(f"⚠️ No applyDetail found; Excel ensured at {excel_path}")
-
-    print(f"✅ PDFs created: {pdf_count}")
-    print(f"📂 Processed directory: {in_dir}")
+        print(f"⚠️ No new applyDetail rows; Excel unchanged at {excel_path}")
+
+    print(f"✅ PDFs created: {pdf_count} (unchanged: {skipped})")
+    if rejected:
+        print(f"❌ Rejected {len(rejected)} invalid JSON file(s); fix them or run `jobuine validate`")
+    if pdf_count:
+        print(format_ratio(*cache_counts))
+    if batch:
+        rate = pdf_count / elapsed if elapsed else 0.0
+        print(f"⏱️ Rendered {pdf_count} PDFs from {len(dirs)} directories in {elapsed:.2f}s ({rate:.1f} PDFs/s)")
+    else:
+        print(f"📂 Processed directory: {in_dir}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# src/utils/listing.py
+# Description:
+#   `jobuine list`: query the catalog of apply directories (core/catalog.py)
+#   by company, role, status and date. The catalog is refreshed first, which
+#   only re-reads directories that changed since the last call. Archived
+#   directories (jobuine archive) are listed too, marked "(archived)".
+
+import json
+import os
+from core import catalog
+from core.applies import parse_apply_date
+from core.config import get_applies_dir
+
+
+def print_rows(rows: list, applies_dir) -> None:
+    """Print catalog rows as an aligned table (paths relative to applies_dir)."""
+    headers = ["date", "company", "role", "status", "pdfs", "dir"]
+    table = [[r["day"], r["company"], r["role"], r["status"], str(len(r["pdfs"])),
+              os.path.relpath(r["path"], applies_dir) + (" (archived)" if r["archived"] else "")] for r in rows]
+    widths = [max(len(r[i]) for r in [headers] + table) for i in range(len(headers))]
+    for line in [headers] + table:
+        print("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip())
+
+
+def main(company: str = None, role: str = None, status: str = None, since: str = None,
+         until: str = None, limit: int = 50, fmt: str = "table"):
+    try:
+        applies_dir = get_applies_dir()
+        since_date = parse_apply_date(since) if since else None
+        until_date = parse_apply_date(until) if until else None
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+    if not applies_dir.is_dir():
+        print(f"❌ applies_dir not found: {applies_dir}")
+        return
+
+    conn = catalog.connect(applies_dir)
+    try:
+        catalog.refresh(conn, applies_dir)
+        total, rows = catalog.query(conn, company=company, role=role, status=status,
+                                    since=since_date, until=until_date, limit=limit)
+    finally:
+        conn.close()
+
+    if fmt == "json":
+        print(json.dumps({"total": total, "rows": rows}, indent=2, ensure_ascii=False))
+        return
+    if not rows:
+        print("❌ No apply directories match.")
+        return
+    print(f"📂 {total} apply director{'y' if total == 1 else 'ies'} match"
+          + (f", showing the newest {len(rows)}:" if len(rows) < total else ":"))
+    print_rows(rows, applies_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# src/utils/serve.py
+# Description:
+#   Local HTTP API (`jobuine serve`) for editor integrations and scripts.
+#   Keeps reportlab, pandas, the render context and the store sidecar warm and
+#   dispatches PDF renders to a bounded process pool, so a render costs a
+#   round trip instead of a CLI cold start plus a workbook load.
+#
+#   POST /render    {"data": {...cv json...}, "output": "/path/cv.pdf"?}  → PDF bytes or {"pdf": path},
+#                   422 with the schema errors when data is not a valid CV
+#   POST /generate  {"dir": "/path/apl_x"?, "force": false}               → counts, rows logged
+#   GET  /check?search=term&limit=20&min_score=0.75                       → ranked rows
+#   GET  /stats                                                           → today's counts
+#   GET  /health
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from core.config import get_store_file, get_current_apply_dir, get_theme_file, get_cache_dir
+from core import shards
+from core.render import get_render_context
+from core.schema import validate_data
+from core.section_cache import get_section_cache
+from utils import check, generate, statistics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Set in each pool worker by _warm_worker.
+_worker_theme_file = None
+_worker_cache_dir = None
+
+
+# =========================
+# POOL WORKERS
+# =========================
+def _warm_worker(theme_file: str, cache_dir: str) -> None:
+    """Pool initializer: build the render context and section cache once per worker."""
+    global _worker_theme_file, _worker_cache_dir
+    _worker_theme_file, _worker_cache_dir = theme_file, cache_dir
+    get_render_context(theme_file)
+    get_section_cache(cache_dir)
+
+
+def _render_job(data: dict, output_pdf_path: str) -> float:
+    started = time.perf_counter()
+    generate.create_cv_pdf(data, output_pdf_path, get_render_context(_worker_theme_file),
+                           get_section_cache(_worker_cache_dir))
+    return time.perf_counter() - started
+
+
+def _generate_job(dir_path: str, force: bool) -> dict:
+    return generate.process_apply_dir(dir_path, force, _worker_theme_file, _worker_cache_dir)
+
+
+# =========================
+# APP
+# =========================
+class RenderQueue:
+    """Bounded front of the process pool: at most `workers + max_queue` jobs in flight."""
+
+    def __init__(self, workers: int, max_queue: int, theme_file: str, cache_dir: str):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                                        initargs=(theme_file, cache_dir))
+        self.capacity = workers + max_queue
+        self.in_flight = 0
+
+    async def submit(self, fn, *args):
+        from fastapi import HTTPException
+
+        if self.in_flight >= self.capacity:
+            raise HTTPException(status_code=503, detail="Render queue is full, retry later")
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+
+def create_app(workers: int = None, max_queue: int = 32):
+    from fastapi import FastAPI, HTTPException
+    from fastapi.responses import Response
+    from pydantic import BaseModel
+
+    class RenderRequest(BaseModel):
+        data: dict
+        output: Optional[str] = None
+
+    class GenerateRequest(BaseModel):
+        dir: Optional[str] = None
+        force: bool = False
+
+    workers = workers or os.cpu_count() or 1
+    excel_path = get_store_file()
+    queue = RenderQueue(workers, max_queue, get_theme_file(), get_cache_dir())
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        yield
+        queue.pool.shutdown(cancel_futures=True)
+
+    app = FastAPI(title="Jobuine", description="Local Jobuine render and query API", lifespan=lifespan)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "workers": workers, "in_flight": queue.in_flight, "capacity": queue.capacity}
+
+    @app.post("/render")
+    async def render(req: RenderRequest):
+        # Validated here, so pool workers never see a payload the builders cannot handle.
+        errors = validate_data(req.data)
+        if errors:
+            raise HTTPException(status_code=422, detail={"error": "Invalid CV data", "errors": errors})
+        if req.output:
+            seconds = await queue.submit(_render_job, req.data, str(Path(req.output).expanduser()))
+            return {"pdf": req.output, "ms": round(seconds * 1000, 1)}
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "cv.pdf")
+            await queue.submit(_render_job, req.data, out)
+            with open(out, "rb") as f:
+                return Response(content=f.read(), media_type="application/pdf")
+
+    @app.post("/generate")
+    async def generate_dir(req: GenerateRequest):
+        dir_path = Path(req.dir).expanduser() if req.dir else get_current_apply_dir()
+        if not dir_path.is_dir():
+            raise HTTPException(status_code=404, detail=f"Invalid apply directory: {dir_path}")
+        result = await queue.submit(_generate_job, str(dir_path), req.force)
+        # Rows are logged here, in the single server process.
+        added = generate.log_results(excel_path, [result])
+        return {"dir": str(dir_path), "rendered": result["rendered"],
+                "skipped": result["skipped"], "added": added}
+
+    @app.get("/check")
+    def check_search(search: str, limit: int = 20, min_score: float = 0.75):
+        if not shards.any_exists(shards.store_files(excel_path)):
+            raise HTTPException(status_code=404, detail=f"Excel file not found: {excel_path}")
+        return {"hits": check.search_store(excel_path, search, limit=limit, min_score=min_score)}
+
+    @app.get("/stats")
+    def stats():
+        today = datetime.now().date()
+        every, paths = statistics.store_paths(excel_path, today, today)
+        if not every:
+            raise HTTPException(status_code=404, detail=f"Excel file not found: {excel_path}")
+        return statistics.summarize_day(statistics.load_rollups(paths, ["total", "location"], today, today), today)
+
+    return app
+
+
+def main(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = None, max_queue: int = 32):
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ `jobuine serve` needs uvicorn: pip install uvicorn", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        app = create_app(workers, max_queue)
+    except Exception as e:
+        print(f"❌ Config error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"🐧 Jobuine API on http://{host}:{port} (docs at /docs)")
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
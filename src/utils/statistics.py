@@ -6,14 +6,168 @@
 #   Specifically:
 #     - Count of today's applications (overall)
 #     - Count of today's applications grouped by location
-
+#   With --since/--until/--by/--group, a windowed report is computed in one
+#   vectorized groupby pass and printed as a table, JSON or CSV.
+#   Both read the daily rollups of the sidecar cache (core/store.py), counts
+#   per day × location/company/status/jobType kept current as rows are
+#   appended, so the work grows with days, not rows. --rebuild re-reads the
+#   workbook into the sidecar first. A sharded store (store_shards) is read
+#   shard by shard in parallel, only the shards overlapping the window.
+
+import json
+import sys
 import pandas as pd
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 from core.config import get_store_file, get_current_apply_dir
+from core import profile, shards, store
+
+
+def summarize_day(rollups: pd.DataFrame, day) -> dict:
+    """Count the applications of one day, overall and per location, from its rollups."""
+    day_df = rollups[rollups["day"].dt.date == day]
+    total = int(day_df.loc[day_df["dim"] == "total", "count"].sum())
+
+    # --- Group by location (rows without a location are left out) ---
+    locations = day_df[(day_df["dim"] == "location") & (day_df["key"] != "")]
+    grouped = (
+        locations.groupby("key")
+        .agg(location=("label", "first"), count=("count", "sum"))
+        .sort_values(by="count", ascending=False)
+    )
+    return {
+        "date": str(day),
+        "total": total,
+        "by_location": [
+            {"location": row["location"], "count": int(row["count"])}
+            for _, row in grouped.iterrows()
+        ],
+    }
+
+
+PERIODS = {"day": "D", "week": "W", "month": "M"}
+GROUP_COLUMNS = ["location", "company", "status", "jobType"]
+
+
+def period_report(rollups: pd.DataFrame, by: str = "day", group: str = None) -> pd.DataFrame:
+    """
+    Sum daily rollups per period (and per group) in a single groupby pass.
+    Returns columns period, [group,] count, sorted by period then count.
+    """
+    df = rollups[rollups["dim"] == (group or "total")]
+    periods = df["day"].dt.to_period(PERIODS[by])
+    if by == "month":
+        labels = periods.dt.strftime("%Y-%m")
+    else:
+        # Days and weeks are labelled by their first day.
+        labels = periods.dt.start_time.dt.strftime("%Y-%m-%d")
+    keys = [labels.rename("period")]
+    if group:
+        # Rollups are keyed by the normalized value; show the first spelling seen.
+        display = df["label"].fillna("").groupby(df["key"]).first()
+        keys.append(df["key"].rename("_key"))
+    report = df.groupby(keys)["count"].sum().reset_index(name="count")
+    if group:
+        report[group] = report["_key"].map(display).replace("", "(empty)")
+        report = report[["period", group, "count"]]
+    return report.sort_values(["period", "count"], ascending=[True, False], ignore_index=True)
+
+
+def check_columns(paths: list, required: list, rebuild: bool = False) -> list:
+    """Return the required headers missing from the store files (rebuilding their sidecars first if asked)."""
+    def headers_of(path):
+        conn = store.open_cache(path, rebuild_now=rebuild)
+        try:
+            return store.sheet_headers(conn)
+        finally:
+            conn.close()
+
+    missing = []
+    for headers in shards.fan_out(headers_of, paths):
+        missing.extend(c for c in required if c not in headers and c not in missing)
+    return missing
+
+
+def load_rollups(paths: list, dims: list, since=None, until=None) -> pd.DataFrame:
+    """Daily rollups of every store file (shard) in paths, read in parallel and concatenated."""
+    frames = shards.fan_out(lambda path: store.load_rollups(path, dims, since=since, until=until), paths)
+    if not frames:
+        return pd.DataFrame({"day": pd.Series(dtype="datetime64[ns]"), "dim": [], "key": [], "label": [],
+                             "count": pd.Series(dtype="int64")})
+    return pd.concat(frames, ignore_index=True)
+
+
+def store_paths(excel_path: Path, since=None, until=None) -> tuple:
+    """(every existing store file, those overlapping [since, until]) of the configured store."""
+    every = [p for p in shards.store_files(excel_path) if store.exists(p)]
+    window = [p for p in shards.store_files(excel_path, since, until) if p in every]
+    return every, window
+
+
+def print_report(report: pd.DataFrame, group: str = None, fmt: str = "table") -> None:
+    """Print a period report as an aligned table, JSON or CSV."""
+    if fmt == "json":
+        print(json.dumps({"rows": report.to_dict(orient="records"), "total": int(report["count"].sum())},
+                         indent=2, ensure_ascii=False))
+        return
+    if fmt == "csv":
+        report.to_csv(sys.stdout, index=False)
+        return
+
+    if report.empty:
+        print("No applications found in this window.")
+        return
+    totals = report.groupby("period", sort=True)["count"].sum()
+    for period, total in totals.items():
+        print(f"📅 {period}: {total}")
+        if group:
+            for _, row in report[report["period"] == period].iterrows():
+                print(f"    - {row[group]}: {row['count']}")
+    print(f"🧾 Total: {int(report['count'].sum())}")
+
+
+def main(since: str = None, until: str = None, by: str = None, group: str = None,
+         fmt: str = "table", rebuild: bool = False):
+    """
+    Without options, print today's statistics. With any of since/until/by/group
+    (or a json/csv format), print a windowed report instead. rebuild re-reads
+    the workbook (and so the rollups) before answering.
+    """
+    if since or until or by or group or fmt != "table":
+        return report_main(since, until, by or "day", group, fmt, rebuild)
+    today_main(rebuild)
+
+
+def report_main(since: str, until: str, by: str, group: str, fmt: str, rebuild: bool = False):
+    # Keep stdout clean for machine-readable formats.
+    out = sys.stdout if fmt == "table" else sys.stderr
+    try:
+        excel_path: Path = get_store_file()
+        since_date = date.fromisoformat(since) if since else None
+        until_date = date.fromisoformat(until) if until else None
+    except (FileNotFoundError, KeyError, ValueError) as e:
+        print(f"❌ {e}", file=out)
+        return
 
+    every, paths = store_paths(excel_path, since_date, until_date)
+    if not every:
+        print(f"❌ Excel file not found at {excel_path}", file=out)
+        return
+
+    missing = check_columns(paths, ["applyDateTime"] + ([group] if group else []), rebuild)
+    if missing:
+        print(f"⚠️ Missing required columns: {', '.join(missing)}", file=out)
+        return
+    rollups = load_rollups(paths, [group or "total"], since=since_date, until=until_date)
 
-def main():
+    window = f"{since_date or 'start'} → {until_date or 'now'}"
+    print(f"📘 {excel_path} | {window} | by {by}" + (f" × {group}" if group else ""), file=out)
+    with profile.stage("groupby"):
+        report = period_report(rollups, by, group)
+    print_report(report, group, fmt)
+
+
+def today_main(rebuild: bool = False):
     # --- Load Excel path from config ---
     try:
         excel_path: Path = get_store_file()
@@ -21,57 +175,44 @@ def main():
         print(f"❌ {e}")
         return
 
-    if not excel_path.exists():
+    today = datetime.now().date()
+    every, paths = store_paths(excel_path, today, today)
+    if not every:
         print(f"❌ Excel file not found at {excel_path}")
         return
 
     print(f"📘 Using Excel file: {excel_path}")
 
-    # --- Read Excel file ---
+    # --- Read today's rollups (through the sidecar cache) ---
     try:
-        df = pd.read_excel(excel_path)
+        missing = check_columns(paths, ["applyDateTime", "location"], rebuild)
+        rollups = load_rollups(paths, ["total", "location"], since=today, until=today)
     except Exception as e:
         print(f"❌ Failed to read Excel file: {e}")
         return
 
     # --- Validate expected columns ---
-    required_cols = {"applyDateTime", "location"}
-    missing = required_cols - set(df.columns)
     if missing:
         print(f"⚠️ Missing required columns: {', '.join(missing)}")
-        print(f"Available columns: {list(df.columns)}")
         return
 
-    # --- Convert and normalize date ---
-    df["applyDateTime"] = pd.to_datetime(df["applyDateTime"], errors="coerce")
-    df = df.dropna(subset=["applyDateTime"])
-
-    today = datetime.now().date()
-    today_df = df[df["applyDateTime"].dt.date == today]
+    with profile.stage("groupby"):
+        summary = summarize_day(rollups, today)
 
     # --- Count applications ---
-    total_count = len(today_df)
-    print(f"\n📅 Date: {today}")
+    total_count = summary["total"]
+    print(f"\n📅 Date: {summary['date']}")
     print(f"🧾 Total applications today: {total_count}")
 
     if total_count == 0:
         print("No applications found for today.")
         return
 
-    # --- Group by location ---
-    grouped = (
-        today_df.groupby("location")
-        .size()
-        .reset_index(name="count")
-        .sort_values(by="count", ascending=False)
-    )
-
     print("\n🌍 Applications by location:")
-    for _, row in grouped.iterrows():
+    for row in summary["by_location"]:
         print(f"  - {row['location']}: {row['count']}")
 
     print("\n✅ Statistics generated successfully.")
 
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# src/utils/tailor.py
+# Description:
+#   `jobuine tailor`: send the prompt.txt of apply directories to an LLM
+#   backend (core/llm.py) and write the validated reply to their cv_data.json,
+#   replacing the copy/paste step. Requests run concurrently (asyncio, bounded
+#   by `concurrency`, spaced by `rate_limit`), are retried with backoff on
+#   transient errors and on replies that are not valid CV JSON, and share one
+#   pooled HTTP session. Directories whose cv_data.json is already filled are
+#   skipped unless --force; a reply that never validates is kept in
+#   tailor_response.txt next to the prompt.
+#
+#   Backend settings come from the `tailor:` section of config.yaml
+#   (see DEFAULTS in core/llm.py); CLI options override them.
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from core import llm, profile
+from core.config import get_applies_dir, get_current_apply_dir, get_tailor_config
+from core.schema import validate_data
+
+CV_FILE = "cv_data.json"
+RESPONSE_FILE = "tailor_response.txt"
+
+
+def needs_tailoring(dir_path: Path, force: bool = False) -> bool:
+    """True if dir_path has a prompt.txt and (unless force) an empty or missing cv_data.json."""
+    if not (dir_path / "prompt.txt").exists():
+        return False
+    if force:
+        return True
+    try:
+        with open(dir_path / CV_FILE, "r", encoding="utf-8") as f:
+            return not json.load(f)
+    except FileNotFoundError:
+        return True
+    except ValueError:
+        return False  # Hand-edited and broken: leave it to the user.
+
+
+def write_cv(dir_path: Path, data: dict) -> None:
+    """Atomically replace cv_data.json."""
+    path = dir_path / CV_FILE
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def parse_reply(reply: str) -> dict:
+    """Return the CV of a reply, or raise ValueError with the schema errors."""
+    data = llm.extract_json(reply)
+    if not isinstance(data, dict) or not data:
+        raise ValueError("reply is not a non-empty JSON object")
+    errors = validate_data(data)
+    if errors:
+        raise ValueError("; ".join(errors[:3]) + (f" (+{len(errors) - 3} more)" if len(errors) > 3 else ""))
+    return data
+
+
+async def tailor_dir(dir_path: Path, backend: llm.Backend, limiter: llm.RateLimiter,
+                     semaphore: asyncio.Semaphore, retries: int) -> dict:
+    """Tailor one directory; returns {"dir", "ok", "attempts", "seconds", "error"}."""
+    prompt = (dir_path / "prompt.txt").read_text(encoding="utf-8")
+    started = time.perf_counter()
+    reply, error = None, None
+    async with semaphore:
+        for attempt in range(1, retries + 2):
+            await limiter.acquire()
+            retry_after = None
+            try:
+                reply = await asyncio.to_thread(backend.complete, prompt)
+                data = parse_reply(reply)
+            except llm.BackendError as e:
+                error, retry_after = str(e), e.retry_after
+                if not e.retryable:
+                    break
+            except ValueError as e:
+                error = f"invalid reply: {e}"
+            else:
+                write_cv(dir_path, data)
+                (dir_path / RESPONSE_FILE).unlink(missing_ok=True)
+                return {"dir": dir_path, "ok": True, "attempts": attempt,
+                        "seconds": time.perf_counter() - started, "error": None}
+            if attempt <= retries:
+                # Exponential backoff with jitter, or what the server asked for.
+                await asyncio.sleep(retry_after or (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+    if reply is not None:
+        (dir_path / RESPONSE_FILE).write_text(reply, encoding="utf-8")
+    return {"dir": dir_path, "ok": False, "attempts": attempt,
+            "seconds": time.perf_counter() - started, "error": error}
+
+
+async def tailor_dirs(dirs: list, backend: llm.Backend, settings: dict) -> list:
+    concurrency = max(1, int(settings["concurrency"]))
+    # asyncio.to_thread uses the default executor, which is too small for I/O-bound fan-out.
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = llm.RateLimiter(float(settings["rate_limit"] or 0))
+    tasks = [asyncio.create_task(tailor_dir(d, backend, limiter, semaphore, int(settings["retries"])))
+             for d in dirs]
+    results = []
+    for done in asyncio.as_completed(tasks):
+        result = await done
+        results.append(result)
+        name = f"{result['dir'].parent.name}/{result['dir'].name}"
+        tries = f", {result['attempts']} attempts" if result["attempts"] > 1 else ""
+        if result["ok"]:
+            print(f"✅ {name} ({result['seconds']:.1f} s{tries})")
+        else:
+            print(f"❌ {name}: {result['error']}{tries}", file=sys.stderr)
+    return results
+
+
+def target_dirs(paths: list, all_dirs: bool, since: str, until: str) -> list:
+    if paths:
+        return [Path(p).expanduser().resolve() for p in paths]
+    if all_dirs or since or until:
+        from core.applies import discover_apply_dirs, parse_apply_date
+        return discover_apply_dirs(get_applies_dir(), parse_apply_date(since) if since else None,
+                                   parse_apply_date(until) if until else None)
+    return [get_current_apply_dir()]
+
+
+def main(paths: list = None, all_dirs: bool = False, since: str = None, until: str = None,
+         force: bool = False, **overrides):
+    """overrides: backend, model, base_url, command, concurrency, rate_limit, retries (None = config)."""
+    try:
+        settings = {**llm.DEFAULTS, **get_tailor_config(),
+                    **{k: v for k, v in overrides.items() if v is not None}}
+        dirs = [d for d in target_dirs(paths, all_dirs, since, until) if needs_tailoring(d, force)]
+        backend = llm.get_backend(settings) if dirs else None
+    except Exception as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not dirs:
+        print("⚠️ No apply directories waiting for a cv_data.json (use --force to redo filled ones).")
+        return
+
+    print(f"🤖 Tailoring {len(dirs)} apply director{'y' if len(dirs) == 1 else 'ies'} with {backend.name}"
+          f" (concurrency {settings['concurrency']}, {settings['rate_limit'] or 'no'} req/min limit)")
+    started = time.perf_counter()
+    try:
+        with profile.stage("tailor"):
+            results = asyncio.run(tailor_dirs(dirs, backend, settings))
+    finally:
+        backend.close()
+    elapsed = time.perf_counter() - started
+
+    ok = sum(1 for r in results if r["ok"])
+    print(f"🧾 {ok}/{len(results)} cv_data.json written in {elapsed:.1f} s"
+          + (f", {len(results) - ok} failed (last invalid reply kept in {RESPONSE_FILE})" if ok < len(results) else ""))
+    if ok:
+        print("➡️ Next: jobuine generate" + (" --all" if len(dirs) > 1 else ""))
+    if ok < len(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# src/utils/validate.py
+# Description:
+#   Validate cv_data.json files against src/data/schema.json without rendering.
+#   By default the JSONs of current_apply_dir are checked; pass files or
+#   directories to check those instead, or --all for every apply directory.
+#   A directory stands for the CV inputs generate would render from the apply
+#   directories at or under it (an apply, date or applies directory), so
+#   manifests and store files next to them are never taken for CVs.
+#   Exits with status 1 when any file is invalid.
+
+import sys
+import time
+from pathlib import Path
+
+from core.applies import apply_dirs_in, discover_apply_dirs, input_jsons
+from core.config import get_applies_dir, get_current_apply_dir
+from core.schema import validate_files
+
+
+def collect_paths(paths: list) -> list:
+    """Expand directories to the CV inputs of their apply directories (see apply_dirs_in); files are taken as-is."""
+    found = []
+    for p in paths:
+        p = Path(p).expanduser()
+        if p.is_dir():
+            for dir_path in apply_dirs_in(p):
+                found.extend(input_jsons(dir_path))
+        else:
+            found.append(str(p))
+    return found
+
+
+def main(paths: list = None, all_dirs: bool = False, workers: int = None):
+    try:
+        if paths:
+            targets = paths
+        elif all_dirs:
+            targets = discover_apply_dirs(get_applies_dir())
+        else:
+            targets = [get_current_apply_dir()]
+    except Exception as e:
+        print(f"❌ Config error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    files = collect_paths(targets)
+    if not files:
+        print("⚠️ No JSON files found. Nothing to validate.")
+        return
+
+    started = time.perf_counter()
+    invalid = validate_files(files, workers)
+    elapsed = time.perf_counter() - started
+
+    for path, errors in invalid.items():
+        print(f"❌ {path}")
+        for error in errors:
+            print(f"    {error}")
+    print(f"✅ {len(files) - len(invalid)}/{len(files)} file(s) valid ({elapsed * 1000:.0f} ms)")
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
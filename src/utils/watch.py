@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# src/utils/watch.py
+# Description:
+#   `jobuine generate --watch`: stay resident, poll the apply directories for
+#   changed *.json files and re-render them as soon as saves settle down.
+#   The render context and section cache stay warm between edits, so a save
+#   turns into a PDF in a fraction of a second. New applyDetail rows are
+#   logged to the store only on flush (Enter) or when the watch exits.
+
+import os
+import sys
+import time
+
+from core.render import get_render_context
+from core.section_cache import get_section_cache
+from utils.generate import collect_new_rows, log_results, render_apply_dir
+
+DEFAULT_DEBOUNCE = 0.3
+POLL_INTERVAL = 0.2
+# How often the list of apply directories is refreshed in --all mode.
+RESCAN_INTERVAL = 2.0
+
+
+def snapshot(dirs: list) -> dict:
+    """Return {json path: (mtime_ns, size)} for the input JSONs of dirs."""
+    found = {}
+    for dir_path in dirs:
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                # Dotfiles (the render manifest) are not inputs.
+                if entry.name.endswith(".json") and not entry.name.startswith("."):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    found[entry.path] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+def _read_command(timeout: float, stdin_open: bool):
+    """Wait up to timeout for a line on stdin; returns it, or None (and sleeps) without stdin."""
+    if stdin_open and os.name != "nt":
+        import select
+
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if ready:
+            return sys.stdin.readline()
+        return None
+    time.sleep(timeout)
+    return None
+
+
+def flush(excel_path, touched: set) -> int:
+    """Log the new applyDetail rows of the re-rendered directories."""
+    if not touched:
+        return 0
+    added = log_results(excel_path, [{"dir": d, "rows": collect_new_rows(d)} for d in sorted(touched)])
+    touched.clear()
+    print(f"✅ Logged {added} new rows → {excel_path}" if added else "⚠️ No new applyDetail rows to log")
+    return added
+
+
+def run(list_dirs, excel_path, theme_file: str = None, cache_dir: str = None,
+        debounce: float = DEFAULT_DEBOUNCE, fit_pages: int = None) -> None:
+    """
+    Watch the directories returned by list_dirs() until Ctrl+C or `q`.
+    A JSON is re-rendered once it has not changed for `debounce` seconds,
+    fitted into fit_pages pages if set.
+    """
+    # Pay for reportlab, styles and the cache index once, before the first edit.
+    get_render_context(theme_file)
+    get_section_cache(cache_dir)
+
+    dirs = list_dirs()
+    seen = snapshot(dirs)
+    pending = {}
+    touched = set()
+    last_scan = time.monotonic()
+    stdin_open = sys.stdin is not None and not sys.stdin.closed
+
+    print(f"👀 Watching {len(seen)} JSON file(s) in {len(dirs)} director{'y' if len(dirs) == 1 else 'ies'}"
+          f" (debounce {debounce * 1000:.0f} ms)")
+    print("   Enter = log new rows to Excel, q + Enter or Ctrl+C = log and exit")
+    try:
+        while True:
+            line = _read_command(POLL_INTERVAL, stdin_open)
+            if line is not None:
+                if line == "":
+                    stdin_open = False  # EOF: keep watching, just stop reading commands
+                elif line.strip().lower() in ("q", "quit", "exit"):
+                    break
+                else:
+                    flush(excel_path, touched)
+
+            now = time.monotonic()
+            if now - last_scan >= RESCAN_INTERVAL:
+                dirs, last_scan = list_dirs(), now
+            current = snapshot(dirs)
+            for path, signature in current.items():
+                if seen.get(path) != signature:
+                    pending[path] = now
+            seen = current
+
+            ready = [path for path, changed in pending.items() if now - changed >= debounce]
+            for path in ready:
+                del pending[path]
+            for dir_path in sorted({os.path.dirname(path) for path in ready}):
+                started = time.perf_counter()
+                # Unchanged content (a save without edits) is skipped by the manifest.
+                rendered, _ = render_apply_dir(dir_path, False, theme_file, cache_dir, fit_pages=fit_pages)
+                if rendered:
+                    touched.add(dir_path)
+                    print(f"🔁 {os.path.basename(dir_path)}: {rendered} PDF(s) in "
+                          f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        flush(excel_path, touched)
+        print("👋 Watch stopped")
@@ -0,0 +1,42 @@
+"""Shared fixtures and store helpers; puts src/ on sys.path so tests import core and utils like the CLI does."""
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Write a config.yaml under tmp_path (extra keys from the call) and point JOBUINE_CONFIG at it."""
+    def write(**values) -> Path:
+        values = {"applies_dir": tmp_path / "applies", "store_file": tmp_path / "store.xlsx", **values}
+        path = tmp_path / "config.yaml"
+        path.write_text("".join(f"{key}: {value}\n" for key, value in values.items()))
+        monkeypatch.setenv("JOBUINE_CONFIG", str(path))
+        return path
+    return write
+
+
+def application(company, role, location="Berlin", status="Applied", when="Mon Oct 06 2025 10:00", dir_name=None):
+    """One store row in EXCEL_HEADERS order."""
+    return [dir_name or f"apl_{company.replace(' ', '_')}", role, company, location, "Full-time", "",
+            "", "", status, when]
+
+
+def write_workbook(path: Path, rows: list) -> Path:
+    """Write a store workbook: header row plus rows, on a sheet named Applications."""
+    from openpyxl import Workbook
+    from core.store import EXCEL_HEADERS
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Applications"
+    ws.append(EXCEL_HEADERS)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
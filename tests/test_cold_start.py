@@ -0,0 +1,84 @@
+"""
+Cold-start budget of the CLI: `jobuine --help` and `jobuine apply` (with and
+without its duplicate check) run in a
+fresh interpreter, must not import pandas, openpyxl or reportlab (the lazy
+COMMAND_MODULES dispatch of cli/__main__.py), and must start well within a
+generous time budget.
+
+    python -m pytest tests
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+HEAVY_PACKAGES = {"pandas", "openpyxl", "reportlab"}
+# Generous: a cold start takes well under 100 ms on a laptop; CI machines are slower.
+COLD_START_BUDGET_S = 2.0
+
+# Runs the CLI like `python -m cli`, then reports the heavy packages it imported.
+PROBE = """
+import runpy, sys
+sys.argv = ["jobuine"] + sys.argv[1:]
+try:
+    runpy.run_module("cli", run_name="__main__", alter_sys=True)
+except SystemExit:
+    pass
+finally:
+    loaded = {name.split(".")[0] for name in sys.modules}
+    print("HEAVY:" + ",".join(sorted(loaded & {heavy})), file=sys.stderr)
+""".replace("{heavy}", repr(HEAVY_PACKAGES))
+
+
+def run_cli(args: list, tmp_path: Path, stdin: str = "") -> tuple:
+    """Run the CLI in a fresh interpreter; return (seconds, output, heavy packages imported)."""
+    config = tmp_path / "config.yaml"
+    config.write_text(f"applies_dir: {tmp_path / 'applies'}\nstore_file: {tmp_path / 'store.xlsx'}\n")
+    env = dict(os.environ, PYTHONPATH=str(SRC), JOBUINE_CONFIG=str(config))
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", PROBE, *args], cwd=SRC, env=env, input=stdin,
+                          capture_output=True, text=True, timeout=60)
+    elapsed = time.perf_counter() - started
+    marker = [line for line in proc.stderr.splitlines() if line.startswith("HEAVY:")]
+    assert marker, proc.stderr
+    heavy = {name for name in marker[-1][len("HEAVY:"):].split(",") if name}
+    return elapsed, proc.stdout + proc.stderr, heavy
+
+
+def test_help_cold_start(tmp_path):
+    elapsed, output, heavy = run_cli(["--help"], tmp_path)
+    assert "usage: jobuine" in output
+    assert not heavy, f"--help imported {sorted(heavy)}"
+    assert elapsed < COLD_START_BUDGET_S, f"--help took {elapsed:.2f}s"
+
+
+def test_apply_cold_start(tmp_path):
+    stdin = "Acme Corp\nBackend Developer\nBuild APIs in Python.\n"
+    elapsed, output, heavy = run_cli(["apply", "--allow-duplicates"], tmp_path, stdin)
+    if (SRC / "data" / "career.json").exists():
+        assert "Apply directory successfully created" in output, output
+        assert (tmp_path / "config.yaml").read_text().count("current_apply_dir") == 1
+    else:  # A fresh checkout has only career.json.example; apply stops before writing anything.
+        assert "Missing data file" in output, output
+    assert not heavy, f"apply imported {sorted(heavy)}"
+    assert elapsed < COLD_START_BUDGET_S, f"apply took {elapsed:.2f}s"
+
+
+def test_apply_duplicate_check_cold_start(tmp_path):
+    # An earlier application, plus an apl_* folder outside any date folder that must not count.
+    detail = {"applyDetail": {"company": "Acme Corp", "role": "Backend Developer"}}
+    for parent in ("2026_01_05", "cache"):
+        apply_dir = tmp_path / "applies" / parent / "apl_Acme_Corp"
+        apply_dir.mkdir(parents=True)
+        (apply_dir / "cv_data.json").write_text(json.dumps(detail))
+    stdin = "Acme Corp\nBackend Developer\nn\n"
+    elapsed, output, heavy = run_cli(["apply"], tmp_path, stdin)
+    assert "Already applied to Acme Corp / Backend Developer" in output, output
+    assert "2026_01_05/apl_Acme_Corp" in output and "cache/apl_Acme_Corp" not in output, output
+    assert "Cancelled" in output, output
+    assert not heavy, f"apply imported {sorted(heavy)}"
+    assert elapsed < COLD_START_BUDGET_S, f"apply took {elapsed:.2f}s"
@@ -0,0 +1,110 @@
+"""
+core/fit.py (`generate --fit-pages`): count_pages must agree with the page
+count of the PDF doc.build actually writes, and bullet trimming must never
+take an experience below MIN_BULLETS.
+"""
+import re
+
+import pytest
+
+from core import fit
+from core.render import RenderContext, load_theme, write_pdf
+from core.section_cache import SectionCache
+from utils.generate import build_cv_flowables
+
+PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![s\w])")
+BULLET = "- Designed and scaled {n} services and pipelines, mentoring the team and reducing latency and cost"
+
+
+def make_cv(experiences: int, bullets: int, skills: int = 4) -> dict:
+    return {
+        "name": "Jane Doe",
+        "role": "Backend Developer",
+        "contact": {"email": "jane@example.com", "github": "github.com/jane"},
+        "summary": "Backend developer building reliable, observable platforms. " * 4,
+        "experiences": [{
+            "role": f"Engineer {i}",
+            "company": f"Company {i}",
+            "location": "Berlin",
+            "start": {"year": str(2020 - 2 * i), "month": "01"},
+            "end": {"year": str(2022 - 2 * i), "month": "01"},
+            "detail": "\n".join(["Platform team."] + [BULLET.format(n=n) for n in range(bullets)]),
+        } for i in range(experiences)],
+        "coreSkills": [{"category": f"Group {g}", "skills": [f"Skill {g}.{s}" for s in range(8)]}
+                       for g in range(skills)],
+        "education": {"university": "TU Berlin", "grade": "MSc",
+                      "start": {"year": "2010", "month": "10"}, "end": {"year": "2012", "month": "09"}},
+        "languages": [{"language": "English", "level": "C2"}, {"language": "German", "level": "B2"}],
+    }
+
+
+def build(data, ctx):
+    return build_cv_flowables(data, ctx, SectionCache())
+
+
+def built_pages(data, ctx, tmp_path) -> int:
+    """Pages of the PDF write_pdf really builds."""
+    out = tmp_path / "cv.pdf"
+    write_pdf(str(out), build(data, ctx), ctx, title=data["name"])
+    return len(PAGE_OBJECT.findall(out.read_bytes()))
+
+
+def bullets_per_experience(data) -> list:
+    return [sum(1 for line in exp["detail"].splitlines() if line.startswith("- ")) for exp in data["experiences"]]
+
+
+@pytest.fixture(scope="module")
+def ctx():
+    return RenderContext(load_theme())
+
+
+@pytest.mark.parametrize("experiences, bullets", [(1, 2), (3, 4), (6, 6), (12, 8)])
+@pytest.mark.parametrize("spacing, font_scale", [(1.0, 1.0), (0.6, 0.85)])
+def test_count_pages_matches_doc_build(ctx, tmp_path, experiences, bullets, spacing, font_scale):
+    data = make_cv(experiences, bullets)
+    fitted = fit.fitted_context(ctx, spacing, font_scale)
+    assert fit.count_pages(build(data, fitted), fitted) == built_pages(data, fitted, tmp_path)
+
+
+def test_sizes_cover_one_and_several_pages(ctx, tmp_path):
+    assert built_pages(make_cv(1, 2), ctx, tmp_path) == 1
+    assert built_pages(make_cv(12, 8), ctx, tmp_path) >= 3
+
+
+def test_count_pages_stops_past_limit(ctx, tmp_path):
+    data = make_cv(12, 8)
+    assert fit.count_pages(build(data, ctx), ctx, limit=1) == 2
+    assert fit.count_pages(build(data, ctx), ctx) == built_pages(data, ctx, tmp_path)
+
+
+def test_fitted_layout_fits_when_built(ctx, tmp_path):
+    data = make_cv(5, 6)
+    assert built_pages(data, ctx, tmp_path) > 1
+    fitted, fitted_data, report = fit.fit(data, ctx, 1, build)
+    assert report["fits"] and report["pages"] == 1
+    assert built_pages(fitted_data, fitted, tmp_path) == 1
+
+
+def test_trim_bullets_keeps_min_bullets():
+    data = make_cv(3, 5)
+    data["experiences"].append(dict(data["experiences"][0], detail="- Only one bullet"))
+    assert fit.trimmable_bullets(data) == 3 * (5 - fit.MIN_BULLETS)
+
+    one = fit.trim_bullets(data, 1)
+    assert bullets_per_experience(one) == [5, 5, 4, 1]  # oldest (last listed) first
+    assert bullets_per_experience(data) == [5, 5, 5, 1]  # the input is not modified
+    assert fit.trim_bullets(data, 0) is data
+
+    trimmed = fit.trim_bullets(data, 100)
+    assert bullets_per_experience(trimmed) == [fit.MIN_BULLETS] * 3 + [1]
+    assert all(exp["detail"].startswith("Platform team.") for exp in trimmed["experiences"][:3])
+    assert fit.trimmable_bullets(trimmed) == 0
+
+
+def test_fit_trims_no_further_than_min_bullets(ctx):
+    data = make_cv(30, 8)
+    _, fitted_data, report = fit.fit(data, ctx, 1, build)
+    assert not report["fits"]
+    assert report["trimmed"] == fit.trimmable_bullets(data)
+    assert bullets_per_experience(fitted_data) == [fit.MIN_BULLETS] * 30
+    assert (report["spacing"], report["font_scale"]) == (fit.SPACINGS[-1], fit.FONT_SCALES[-1])
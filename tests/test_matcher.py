@@ -0,0 +1,87 @@
+"""
+core/matcher.py (Aho-Corasick) and the many-terms lookup of `check`
+(store.search_terms / check.search_many_in_store): overlapping and nested
+terms, case folding, and the fuzzy fallback marking.
+"""
+import pytest
+
+from conftest import application, write_workbook
+from core import store
+from core.matcher import AhoCorasick
+from utils import check
+
+
+def found(patterns, text):
+    return {patterns[i] for i in AhoCorasick(patterns).find(text)}
+
+
+def test_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers"]
+    assert found(patterns, "ushers") == {"he", "she", "hers"}
+    assert found(["nova", "technova", "tech", "ova"], "technova gmbh") == {"nova", "technova", "tech", "ova"}
+    assert found(["aa", "aaa"], "aaaa") == {"aa", "aaa"}
+    assert found(["abcd", "bc"], "abce") == {"bc"}  # "bc" reached through a failure link
+
+
+def test_no_match_and_edge_patterns():
+    assert found(["berlin", "munich"], "hamburg") == set()
+    assert AhoCorasick([]).find("anything") == set()
+    assert AhoCorasick(["", "a"]).find("a") == {1}  # empty patterns never match
+    assert AhoCorasick(["x", "x"]).find("x") == {0, 1}
+    assert found(["ß", "straße"], "große straße") == {"ß", "straße"}
+
+
+def test_matcher_is_case_sensitive():
+    # Folding is the caller's job: search_terms normalizes terms and cells (below).
+    assert AhoCorasick(["nova"]).find("TechNova") == set()
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = write_workbook(tmp_path / "store.xlsx", [
+        application("TechNova GmbH", "Backend Developer"),
+        application("Nova Labs", "Data Engineer", location="Munich"),
+        application("Acme Corp", "Frontend Developer", status="Rejected"),
+    ])
+    conn = store.open_cache(path)
+    yield conn
+    conn.close()
+
+
+def test_search_terms_overlapping_terms(conn):
+    results = store.search_terms(conn, ["nova", "TechNova", "developer", "Munich"])
+    assert results["nova"] == {"rows": [(0, 2), (0, 3)], "fuzzy": False}
+    assert results["TechNova"] == {"rows": [(0, 2)], "fuzzy": False}
+    assert results["developer"]["rows"] == [(0, 2), (0, 4)]
+    assert results["Munich"]["rows"] == [(0, 3)]
+
+
+def test_search_terms_case_folding(conn):
+    results = store.search_terms(conn, ["ACME  corp", "technova gmbh", "REJECTED"])
+    assert results["ACME  corp"] == {"rows": [(0, 4)], "fuzzy": False}  # whitespace collapsed too
+    assert results["technova gmbh"]["rows"] == [(0, 2)]
+    assert results["REJECTED"]["rows"] == [(0, 4)]
+
+
+def test_search_terms_fuzzy_fallback(conn):
+    results = store.search_terms(conn, ["Tehcnova", "Frontend Develper", "Zebra Industries", "Acme"])
+    assert results["Tehcnova"] == {"rows": [(0, 2)], "fuzzy": True}
+    assert results["Frontend Develper"] == {"rows": [(0, 4)], "fuzzy": True}
+    assert results["Zebra Industries"] == {"rows": [], "fuzzy": False}
+    assert results["Acme"]["fuzzy"] is False
+    # An exact-only lookup never falls back.
+    assert store.search_terms(conn, ["Tehcnova"], min_score=1.0)["Tehcnova"] == {"rows": [], "fuzzy": False}
+
+
+def test_search_many_in_store_and_table(tmp_path, config, capsys):
+    path = write_workbook(tmp_path / "store.xlsx", [application("TechNova GmbH", "Backend Developer")])
+    config()
+    results = check.search_many_in_store(path, ["technova", "Tehcnova", "Nowhere Inc"])
+    assert results["technova"] == {"rows": [("", 0, 2)], "fuzzy": False}
+    assert results["Tehcnova"] == {"rows": [("", 0, 2)], "fuzzy": True}
+    assert results["Nowhere Inc"] == {"rows": [], "fuzzy": False}
+    check.print_term_table(results, limit=5)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].split()[:3] == ["technova", "✅", "yes"]
+    assert lines[2].split()[:3] == ["Tehcnova", "✅", "fuzzy"]
+    assert lines[3].split()[:4] == ["Nowhere", "Inc", "❌", "no"]
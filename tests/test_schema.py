@@ -0,0 +1,135 @@
+"""
+core/schema.py: the compiled validator against src/data/schema.json and a
+small custom schema, its path-level error strings, and `jobuine validate`
+path expansion.
+"""
+import copy
+import json
+
+import pytest
+
+from core import schema
+from utils import validate
+
+VALID_CV = {
+    "applyDetail": {"company": "Acme Corp", "role": "Backend Developer", "status": "Applied"},
+    "name": "Jane Doe",
+    "contact": {"email": "jane@example.com"},
+    "experiences": [
+        {"role": "Engineer", "company": "Example", "start": {"year": "2021", "month": "3"}, "end": "Present"},
+        {"role": "Intern", "company": "Example", "start": {"year": "2019", "month": "06"},
+         "end": {"year": "2020", "month": "12"}},
+    ],
+    "coreSkills": [{"category": "Languages", "skills": ["Python", "SQL"]}],
+    "priority": ["experiences", "coreSkills"],
+}
+
+
+def with_changes(**changes) -> dict:
+    data = copy.deepcopy(VALID_CV)
+    data.update(changes)
+    return data
+
+
+def test_valid_cv():
+    assert schema.validate_data(VALID_CV) == []
+    assert schema.validate_data({}) == []
+
+
+@pytest.mark.parametrize("data, expected", [
+    (with_changes(name=42), ["$.name: expected string, got integer"]),
+    (with_changes(experiences={"role": "x"}), ["$.experiences: expected array, got object"]),
+    (with_changes(experiences=[{"role": "Engineer"}]), ["$.experiences[0].start: is required"]),
+    (with_changes(experiences=[{"start": {"year": "2021"}}]), ["$.experiences[0].start.month: is required"]),
+    (with_changes(experiences=[{"start": {"year": "21", "month": "3"}}]),
+     ["$.experiences[0].start.year: '21' does not match ^[0-9]{4}$"]),
+    (with_changes(experiences=[{"start": {"year": "2021", "month": "13"}}]),
+     ["$.experiences[0].start.month: '13' does not match ^(0?[1-9]|1[0-2])$"]),
+    (with_changes(coreSkills=[{"skills": ["Python", 3]}]), ["$.coreSkills[0].skills[1]: expected string, got integer"]),
+    (with_changes(contact={"email": True}), ["$.contact.email: expected string, got boolean"]),
+])
+def test_invalid_cv(data, expected):
+    assert schema.validate_data(data) == expected
+
+
+def test_end_is_string_or_year_month():
+    def end_errors(end):
+        return schema.validate_data(with_changes(experiences=[{"start": {"year": "2021", "month": "1"}, "end": end}]))
+
+    assert end_errors("Present") == []
+    assert end_errors({"year": "2022", "month": "07"}) == []
+    for end in ({"year": "2022"}, {"year": "2022", "month": "00"}, 2022):
+        errors = end_errors(end)
+        assert len(errors) == 1 and errors[0].startswith("$.experiences[0].end: matches none of oneOf ("), errors
+    assert "$.experiences[0].end.month: is required" in end_errors({"year": "2022"})[0]
+
+
+def test_custom_keywords(tmp_path):
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps({
+        "type": "object",
+        "additionalProperties": False,
+        "properties": {
+            "status": {"enum": ["Applied", "Rejected"]},
+            "tags": {"type": "array", "minItems": 1, "items": {"type": "string", "minLength": 2}},
+            "score": {"type": "number"},
+            "either": {"oneOf": [{"type": "string"}, {"type": ["string", "null"]}]},
+        },
+    }))
+
+    def errors(data):
+        return schema.validate_data(data, schema_file)
+
+    assert errors({"status": "Applied", "tags": ["ok"], "score": 3, "either": None}) == []
+    assert errors({"status": "Pending"}) == ["$.status: must be one of ['Applied', 'Rejected'], got 'Pending'"]
+    assert errors({"tags": []}) == ["$.tags: needs at least 1 item(s)"]
+    assert errors({"tags": ["x"]}) == ["$.tags[0]: shorter than 2 characters"]
+    assert errors({"score": 2.5}) == [] and errors({"score": True}) == ["$.score: expected number, got boolean"]
+    assert errors({"extra": 1}) == ["$.extra: unexpected property"]
+    assert errors({"either": "both"}) == ["$.either: matches more than one of oneOf"]
+    assert errors([]) == ["$: expected object, got array"]
+
+
+def test_validator_recompiles_when_schema_changes(tmp_path):
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_text(json.dumps({"properties": {"name": {"type": "string"}}}))
+    first = schema.get_validator(schema_file)
+    assert schema.get_validator(schema_file) is first
+    assert schema.validate_data({"name": 1}, schema_file) == ["$.name: expected string, got integer"]
+    schema_file.write_text(json.dumps({"properties": {"name": {"type": ["string", "integer"]}}}))
+    assert schema.get_validator(schema_file) is not first
+    assert schema.validate_data({"name": 1}, schema_file) == []
+
+
+def test_validate_files_reports_invalid_json(tmp_path):
+    good, broken, bad = tmp_path / "good.json", tmp_path / "broken.json", tmp_path / "bad.json"
+    good.write_text(json.dumps(VALID_CV))
+    broken.write_text("{not json")
+    bad.write_text(json.dumps({"name": 1}))
+    invalid = schema.validate_files([good, broken, bad])
+    assert set(invalid) == {str(broken), str(bad)}
+    assert invalid[str(broken)][0].startswith("$: invalid JSON: ")
+    assert invalid[str(bad)] == ["$.name: expected string, got integer"]
+
+
+def test_collect_paths_only_takes_cv_inputs(tmp_path):
+    applies = tmp_path / "applies"
+    apply_dir = applies / "2026_10_01" / "apl_Acme"
+    apply_dir.mkdir(parents=True)
+    for name in ("cv_data.json", "cv_variant.json", ".jobuine_manifest.json"):
+        (apply_dir / name).write_text("{}")
+    (applies / "2026_10_01" / "notes.json").write_text("{}")
+    (applies / "cache").mkdir()
+    (applies / "cache" / "entry.json").write_text("{}")
+    store_dir = tmp_path / "store"
+    store_dir.mkdir()
+    (store_dir / "job_applications.shards.json").write_text("{}")
+    single = tmp_path / "single.json"
+    single.write_text("{}")
+
+    inputs = [str(apply_dir / "cv_data.json"), str(apply_dir / "cv_variant.json")]
+    assert validate.collect_paths([apply_dir]) == inputs
+    assert validate.collect_paths([applies / "2026_10_01"]) == inputs
+    assert validate.collect_paths([applies]) == inputs
+    assert validate.collect_paths([store_dir]) == []
+    assert validate.collect_paths([single]) == [str(single)]
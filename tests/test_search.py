@@ -0,0 +1,112 @@
+"""
+Typo-tolerant search of `check` (store.trigrams / similarity / search):
+exact substrings, typos, the --min-score threshold, and the sidecar being
+rebuilt when the workbook changes.
+"""
+import os
+
+import pytest
+
+from conftest import application, write_workbook
+from core import store
+from utils import check
+
+ROWS = [
+    application("TechNova GmbH", "Backend Developer", when="Mon Oct 06 2025 10:00"),
+    application("Nova Labs", "Data Engineer", location="Munich", when="Tue Oct 07 2025 09:00"),
+    application("Acme Corp", "Frontend Developer", status="Rejected", when="Wed Oct 08 2025 11:30"),
+]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return write_workbook(tmp_path / "store.xlsx", ROWS)
+
+
+def search(path, term, **kwargs):
+    conn = store.open_cache(path)
+    try:
+        return store.search(conn, term, **kwargs)
+    finally:
+        conn.close()
+
+
+def test_trigrams():
+    assert store.trigrams("Nova") == {" no", "nov", "ova", "va "}
+    assert store.trigrams("Nova", pad=False) == {"nov", "ova"}
+    assert store.trigrams("  NOVA\t") == store.trigrams("nova")
+    assert store.trigrams("ab", pad=False) == {" ab", "ab "}
+
+
+def test_similarity():
+    assert store.similarity("nova", "technova gmbh") == 1.0
+    assert 0.75 <= store.similarity("tehcnova", "technova gmbh") < 1.0
+    assert store.similarity("backend develper", "senior backend developer") > 0.9
+    assert store.similarity("zebra", "technova gmbh") < 0.5
+
+
+def test_exact_substring(workbook):
+    hits = search(workbook, "technova")
+    assert [(h["company"], h["row_no"], h["score"]) for h in hits] == [("TechNova GmbH", 2, 1.0)]
+    assert hits[0]["role"] == "Backend Developer" and hits[0]["sheet"] == 0
+
+
+def test_exact_hits_newest_first(workbook):
+    hits = search(workbook, "developer")
+    assert [h["company"] for h in hits] == ["Acme Corp", "TechNova GmbH"]
+    assert all(h["score"] == 1.0 for h in hits)
+
+
+def test_typo(workbook):
+    hits = search(workbook, "Tehcnova")
+    assert [h["company"] for h in hits] == ["TechNova GmbH"]
+    assert 0.75 <= hits[0]["score"] < 1.0
+
+
+def test_below_threshold(workbook):
+    typo_score = search(workbook, "Tehcnova")[0]["score"]
+    assert search(workbook, "Tehcnova", min_score=typo_score + 0.01) == []
+    assert search(workbook, "Tehcnova", min_score=1.0) == []
+    assert search(workbook, "Zebra Industries") == []
+    assert search(workbook, "   ") == []
+
+
+def test_limit(workbook):
+    assert len(search(workbook, "developer", limit=1)) == 1
+
+
+def test_sidecar_rebuilt_when_workbook_changes(workbook):
+    assert search(workbook, "Globex") == []
+    signature = store.workbook_signature(workbook)
+    write_workbook(workbook, ROWS + [application("Globex", "SRE", when="Thu Oct 09 2025 08:00")])
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # coarse mtime filesystems
+    assert store.workbook_signature(workbook) != signature
+
+    # A stale sidecar is only used as-is when asked to.
+    conn = store.open_cache(workbook, stale_ok=True)
+    try:
+        assert store.search(conn, "Globex") == []
+    finally:
+        conn.close()
+    assert [h["row_no"] for h in search(workbook, "Globex")] == [5]
+
+
+def test_sidecar_follows_journal_appends(workbook):
+    assert search(workbook, "Initech") == []
+    store.append_rows(workbook, [application("Initech", "Analyst")])
+    # The sidecar was updated in place, so it is current without a rebuild.
+    conn = store.connect(workbook)
+    try:
+        assert store._get_meta(conn, "signature") == store.store_signature(workbook)
+    finally:
+        conn.close()
+    assert [h["company"] for h in search(workbook, "Initech")] == ["Initech"]
+
+
+def test_check_min_score(workbook, config, capsys):
+    config(store_file=workbook)
+    check.main("Tehcnova")
+    assert "Found 1 matching row(s)" in capsys.readouterr().out
+    check.main("Tehcnova", min_score=1.0)
+    assert "Not found." in capsys.readouterr().out
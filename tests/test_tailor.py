@@ -0,0 +1,151 @@
+"""
+`jobuine tailor` against local backends: the mock backend end to end, and
+the retry paths (HTTP 429 from a local OpenAI-compatible server, replies
+that are not valid CV JSON) of tailor_dir.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from conftest import SRC
+from core import llm
+from utils import tailor
+
+PROMPT = "COMPANY_NAME: Acme Corp\nrole: Backend Developer\n"
+
+
+def make_apply_dir(root, day="2026_10_01", name="apl_Acme_Corp"):
+    dir_path = root / "applies" / day / name
+    dir_path.mkdir(parents=True)
+    (dir_path / "prompt.txt").write_text(PROMPT, encoding="utf-8")
+    (dir_path / "cv_data.json").write_text("{}", encoding="utf-8")
+    return dir_path
+
+
+def run_tailor_dir(dir_path, backend, retries=2):
+    return asyncio.run(tailor.tailor_dir(dir_path, backend, llm.RateLimiter(0), asyncio.Semaphore(1), retries))
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Retry immediately: the backoff is 2**n × uniform(0.5, 1.5) seconds."""
+    monkeypatch.setattr(tailor.random, "uniform", lambda a, b: 0.0)
+
+
+class ScriptedBackend(llm.Backend):
+    """Replies (or raises) the given items in order."""
+
+    name = "scripted"
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        item = self.script.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        llm.Backend()
+
+
+def test_tailor_mock_backend(tmp_path, config):
+    dirs = [make_apply_dir(tmp_path, name=f"apl_Acme_{i}") for i in range(3)]
+    env = dict(os.environ, PYTHONPATH=str(SRC), JOBUINE_CONFIG=str(config()))
+    proc = subprocess.run([sys.executable, "-m", "cli", "tailor", "--all", "--backend", "mock", "--rate-limit", "0"],
+                          cwd=SRC, env=env, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert "3/3 cv_data.json written" in proc.stdout
+    for dir_path in dirs:
+        data = json.loads((dir_path / "cv_data.json").read_text(encoding="utf-8"))
+        assert data["applyDetail"] == {"company": "Acme Corp", "role": "Backend Developer", "status": "Applied"}
+        assert not (dir_path / tailor.RESPONSE_FILE).exists()
+
+
+def test_retry_on_http_429(tmp_path):
+    dir_path = make_apply_dir(tmp_path)
+    reply = llm.MockBackend().complete(PROMPT)
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests_seen.append(body)
+            if len(requests_seen) == 1:
+                self.send_response(429)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            payload = json.dumps({"choices": [{"message": {"content": reply}}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    backend = llm.OpenAIBackend(f"http://127.0.0.1:{server.server_port}/v1", "test-model", timeout=10)
+    try:
+        result = run_tailor_dir(dir_path, backend)
+    finally:
+        backend.close()
+        server.shutdown()
+    assert result["ok"] and result["attempts"] == 2, result
+    assert len(requests_seen) == 2 and requests_seen[0]["model"] == "test-model"
+    assert json.loads((dir_path / "cv_data.json").read_text(encoding="utf-8"))["name"] == "Mock Candidate"
+
+
+def test_retry_on_invalid_reply(tmp_path):
+    dir_path = make_apply_dir(tmp_path)
+    backend = ScriptedBackend("Sorry, I cannot help with that.", '{"name": 42}', llm.MockBackend().complete(PROMPT))
+    result = run_tailor_dir(dir_path, backend)
+    assert result["ok"] and result["attempts"] == 3, result
+    assert not (dir_path / tailor.RESPONSE_FILE).exists()
+
+
+def test_invalid_reply_kept_after_last_retry(tmp_path):
+    dir_path = make_apply_dir(tmp_path)
+    backend = ScriptedBackend("no json here", "still none", "nope")
+    result = run_tailor_dir(dir_path, backend)
+    assert not result["ok"] and result["attempts"] == 3
+    assert result["error"].startswith("invalid reply")
+    assert (dir_path / tailor.RESPONSE_FILE).read_text(encoding="utf-8") == "nope"
+    assert (dir_path / "cv_data.json").read_text(encoding="utf-8") == "{}"
+
+
+def test_no_retry_on_permanent_error(tmp_path):
+    dir_path = make_apply_dir(tmp_path)
+    backend = ScriptedBackend(llm.BackendError("HTTP 401: bad key"))
+    result = run_tailor_dir(dir_path, backend)
+    assert not result["ok"] and result["attempts"] == 1 and backend.calls == 1
+    assert result["error"] == "HTTP 401: bad key"
+
+
+def test_rate_limiter_spaces_requests():
+    async def starts(n):
+        limiter = llm.RateLimiter(600)  # one every 0.1 s
+        stamps = []
+        for _ in range(n):
+            await limiter.acquire()
+            stamps.append(time.monotonic())
+        return stamps
+
+    stamps = asyncio.run(starts(4))
+    assert stamps[-1] - stamps[0] >= 0.3 - 0.02
+    assert asyncio.run(asyncio.wait_for(llm.RateLimiter(0).acquire(), 0.1)) is None